@@ -4,6 +4,7 @@
 """Atomic Simulation Environment."""
 
 import sys
+from typing import TYPE_CHECKING
 
 
 if sys.version_info[0] == 2:
@@ -14,10 +15,23 @@ __all__ = ['Atoms', 'Atom']
 __version__ = '3.23.0b1'
 
 
-from ase.atom import Atom
-from ase.atoms import Atoms
-
 # import ase.parallel early to avoid circular import problems when
 # ase.parallel does "from gpaw.mpi import world":
 import ase.parallel  # noqa
 ase.parallel  # silence pyflakes
+
+if TYPE_CHECKING:
+    from ase.atom import Atom
+    from ase.atoms import Atoms
+
+
+def __getattr__(name):
+    # Atoms and Atom are imported on first use, such that scripts and
+    # command line tools which do not need them start faster
+    if name == 'Atoms':
+        from ase.atoms import Atoms
+        return Atoms
+    if name == 'Atom':
+        from ase.atom import Atom
+        return Atom
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
@@ -150,7 +150,11 @@ class Atom:
 
         plural = names[name][0]
         if plural in self.atoms.arrays:
-            return self.atoms.arrays[plural][self.index]
+            array = self.atoms.arrays[plural]
+            if array.ndim > 1:
+                # A view which can be modified in place
+                self.atoms._expose(plural)
+            return array[self.index]
         else:
             return None
 
@@ -180,6 +184,7 @@ class Atom:
                 if name == 'magmom' and array.ndim == 2:
                     assert len(value) == 3
                 array[self.index] = value
+                self.atoms._changed(plural)
             else:
                 if name == 'magmom' and np.asarray(value).ndim == 1:
                     array = np.zeros((len(self.atoms), 3))
@@ -126,6 +126,13 @@ class Atoms:
 
     ase_objtype = 'atoms'  # For JSONability
 
+    # Change counters, see the versioned property
+    _versions = None
+    _exposed = None
+    _token = None
+    # (token, versions, arrays) of the object this was copied from
+    _origin = None
+
     def __init__(self, symbols=None,
                  positions=None, numbers=None,
                  tags=None, momenta=None, masses=None,
@@ -384,6 +391,7 @@ class Atoms:
             self.positions[:] = np.dot(self.positions, M)
 
         self.cell[:] = cell
+        self._changed('cell')
 
     def set_celldisp(self, celldisp):
         """Set the unit cell displacement vectors."""
@@ -436,6 +444,7 @@ class Atoms:
     @pbc.setter
     def pbc(self, pbc):
         self._pbc[:] = pbc
+        self._changed('pbc')
 
     def set_pbc(self, pbc):
         """Set periodic boundary condition flags."""
@@ -445,6 +454,64 @@ class Atoms:
         """Get periodic boundary condition flags."""
         return self.pbc.copy()
 
+    @property
+    def versioned(self):
+        """Whether changes are counted, allowing cheap change detection.
+
+        In versioned mode every change through the public API, e.g.
+        set_positions(), set_cell(), set_array() or assignment to
+        atoms.positions, increases a counter for that field, see
+        get_version().  Calculators use the counters to skip the
+        element-wise comparison of arrays which have not changed since
+        the last calculation.
+
+        Arrays whose references are handed out for in-place manipulation,
+        e.g. through atoms.positions, atoms[i].position or
+        get_array(name, copy=False), are always compared element-wise until
+        they are set again through the public API.  In versioned mode
+        set_array() replaces the stored array instead of writing into it, so
+        earlier references no longer follow the Atoms object.  Changes
+        written directly into atoms.arrays are not detected."""
+        return self._versions is not None
+
+    @versioned.setter
+    def versioned(self, versioned):
+        if not versioned:
+            self._versions = None
+        elif self._versions is None:
+            self._versions = {}
+            self._exposed = set()
+            self._token = object()
+
+    def get_version(self, name):
+        """Get the change counter of an array, 'cell' or 'pbc'.
+
+        Only available in versioned mode."""
+        if self._versions is None:
+            raise RuntimeError('Atoms object is not versioned')
+        return self._versions.get(name, 0)
+
+    def _changed(self, name):
+        if self._versions is not None:
+            self._versions[name] = self._versions.get(name, 0) + 1
+
+    def _expose(self, name):
+        if self._versions is not None:
+            self._exposed.add(name)
+
+    def _get_unchanged_arrays(self, atoms):
+        """Return names of the arrays which are known not to have changed
+        since atoms was copied from this versioned Atoms object."""
+        origin = getattr(atoms, '_origin', None)
+        if (self._versions is None or origin is None or
+                origin[0] is not self._token):
+            return set()
+        _, versions, arrays = origin
+        return {name for name, a in arrays.items()
+                if self.arrays.get(name) is a and
+                name not in self._exposed and
+                self._versions.get(name, 0) == versions.get(name, 0)}
+
     def new_array(self, name, a, dtype=None, shape=None):
         """Add new array.
 
@@ -474,6 +541,7 @@ class Atoms:
                              (name, a.shape, (a.shape[0:1] + shape)))
 
         self.arrays[name] = a
+        self._changed(name)
 
     def get_array(self, name, copy=True):
         """Get an array.
@@ -483,6 +551,7 @@ class Atoms:
         if copy:
             return self.arrays[name].copy()
         else:
+            self._expose(name)
             return self.arrays[name]
 
     def set_array(self, name, a, dtype=None, shape=None):
@@ -503,7 +572,13 @@ class Atoms:
                 if a.shape != b.shape:
                     raise ValueError('Array "%s" has wrong shape %s != %s.' %
                                      (name, a.shape, b.shape))
-                b[:] = a
+                if self._versions is None:
+                    b[:] = a
+                else:
+                    # A new array detaches references handed out earlier
+                    self.arrays[name] = np.array(a, b.dtype)
+                    self._exposed.discard(name)
+            self._changed(name)
 
     def has(self, name):
         """Check for existence of array.
@@ -910,6 +985,9 @@ class Atoms:
         for name, a in self.arrays.items():
             atoms.arrays[name] = a.copy()
         atoms.constraints = copy.deepcopy(self.constraints)
+        if self._versions is not None:
+            atoms._origin = (self._token, self._versions.copy(),
+                             self.arrays.copy())
         return atoms
 
     def todict(self):
@@ -1216,6 +1294,7 @@ class Atoms:
         nx3 array (where n is the number of atoms)."""
 
         self.arrays['positions'] += np.array(displacement)
+        self._changed('positions')
 
     def center(self, vacuum=None, axis=(0, 1, 2), about=None):
         """Center atoms in unit cell.
@@ -1445,6 +1524,7 @@ class Atoms:
                                        np.cross(p, s * v) +
                                        np.outer(np.dot(p, v), (1.0 - c) * v) +
                                        center)
+        self._changed('positions')
         if rotate_cell:
             rotcell = self.get_cell()
             rotcell[:] = (c * rotcell -
@@ -1764,12 +1844,18 @@ class Atoms:
             D_len.shape = (-1,)
             return D_len
 
-    def get_all_distances(self, mic=False, vector=False):
+    def get_all_distances(self, mic=False, vector=False, cutoff=None):
         """Return distances of all of the atoms with all of the atoms.
 
         Use mic=True to use the Minimum Image Convention.
+
+        If a cutoff is given, only distances shorter than the cutoff are
+        found with a neighbor list, and returned as a
+        :class:`scipy.sparse.csr_matrix`.  This avoids the dense N x N
+        matrix for large systems.  Use
+        :func:`ase.geometry.get_pair_distances` for the distance vectors.
         """
-        from ase.geometry import get_distances
+        from ase.geometry import get_distances, get_pair_distances
 
         R = self.arrays['positions']
 
@@ -1780,6 +1866,14 @@ class Atoms:
             cell = self.cell
             pbc = self.pbc
 
+        if cutoff is not None:
+            from scipy.sparse import csr_matrix
+            if vector:
+                raise ValueError('Distance vectors within a cutoff are '
+                                 'available from get_pair_distances()')
+            i, j, _, d = get_pair_distances(R, cutoff, cell=cell, pbc=pbc)
+            return csr_matrix((d, (i, j)), shape=(len(self), len(self)))
+
         D, D_len = get_distances(R, cell=cell, pbc=pbc)
 
         if vector:
@@ -1841,6 +1935,7 @@ class Atoms:
                 R[a0] += (x * fix) * D[0]
             else:
                 R[i] -= (x * (1.0 - fix)) * D[0]
+        self._changed('positions')
 
     def get_scaled_positions(self, wrap=True):
         """Get positions relative to unit cell.
@@ -1934,11 +2029,19 @@ class Atoms:
 
     def _get_positions(self):
         """Return reference to positions-array for in-place manipulations."""
+        self._expose('positions')
         return self.arrays['positions']
 
     def _set_positions(self, pos):
         """Set positions directly, bypassing constraints."""
-        self.arrays['positions'][:] = pos
+        if self._versions is None:
+            self.arrays['positions'][:] = pos
+        else:
+            positions = self.arrays['positions'].copy()
+            positions[:] = pos
+            self.arrays['positions'] = positions
+            self._exposed.discard('positions')
+        self._changed('positions')
 
     positions = property(_get_positions, _set_positions,
                          doc='Attribute for direct ' +
@@ -1947,6 +2050,7 @@ class Atoms:
     def _get_atomic_numbers(self):
         """Return reference to atomic numbers for in-place
         manipulations."""
+        self._expose('numbers')
         return self.arrays['numbers']
 
     numbers = property(_get_atomic_numbers, set_atomic_numbers,
@@ -1962,6 +2066,7 @@ class Atoms:
     def cell(self, cell):
         cell = Cell.ascell(cell)
         self._cellobj[:] = cell
+        self._changed('cell')
 
     def write(self, filename, format=None, **kwargs):
         """Write atoms object to a file.
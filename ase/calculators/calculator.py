@@ -96,8 +96,11 @@ def compare_atoms(atoms1, atoms2, tol=1e-15, excluded_properties=None):
         for prop in ['cell', 'pbc']:
             if prop in properties_to_check:
                 properties_to_check.remove(prop)
-                if not equal(getattr(atoms1, prop), getattr(atoms2, prop),
-                             atol=tol):
+                value1 = getattr(atoms1, prop)
+                value2 = getattr(atoms2, prop)
+                # Exact equality is much cheaper to check than equal()
+                if (not np.array_equal(value1, value2) and
+                        not equal(value1, value2, atol=tol)):
                     system_changes.append(prop)
 
         arrays1 = set(atoms1.arrays)
@@ -111,9 +114,15 @@ def compare_atoms(atoms1, atoms2, tol=1e-15, excluded_properties=None):
         system_changes += properties_to_check & (arrays1 ^ arrays2)
 
         # Finally, check all of the non-excluded properties shared by the atoms
-        # arrays.
+        # arrays.  Arrays of a versioned Atoms object which have not changed
+        # since atoms1 was copied from it need no element-wise comparison.
+        if getattr(atoms2, 'versioned', False):
+            properties_to_check -= atoms2._get_unchanged_arrays(atoms1)
         for prop in properties_to_check & arrays1 & arrays2:
-            if not equal(atoms1.arrays[prop], atoms2.arrays[prop], atol=tol):
+            array1 = atoms1.arrays[prop]
+            array2 = atoms2.arrays[prop]
+            if (not np.array_equal(array1, array2) and
+                    not equal(array1, array2, atol=tol)):
                 system_changes.append(prop)
 
     return system_changes
@@ -38,7 +38,8 @@ commands = {
          '--output-format', '-f', '--force', '-n',
          '--image-number', '-e', '--exec-code', '-E',
          '--exec-file', '-a', '--arrays', '-I', '--info', '-s',
-         '--split-output', '--read-args', '--write-args'],
+         '--split-output', '-j', '--jobs', '--chunk-size',
+         '--read-args', '--write-args'],
     'db':
         ['-v', '--verbose', '-q', '--quiet', '-n', '--count', '-l',
          '--long', '-i', '--insert-into', '-a',
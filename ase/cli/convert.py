@@ -48,6 +48,13 @@ class CLICommand:
             help='Write output frames to individual files. '
             'Output file name should be a format string with '
             'a single integer field, e.g. out-{:0>5}.xyz')
+        add('-j', '--jobs', type=int, default=1, metavar='N',
+            help='Read frames in N processes.  Used for uncompressed '
+            'traj and extxyz input files, which can be read in chunks; '
+            'other files are read by one process.')
+        add('--chunk-size', type=int, default=100, metavar='N',
+            help='Number of frames read by a process at a time '
+            '(default: 100).')
         add('--read-args', nargs='+', action='store',
             default={}, metavar="KEY=VALUE",
             help='Additional keyword arguments to pass to '
@@ -60,7 +67,8 @@ class CLICommand:
     @staticmethod
     def run(args, parser):
         import os
-        from ase.io import read, write
+        from ase.io import write
+        from ase.io.formats import filetype
 
         if args.verbose:
             print(', '.join(args.input), '->', args.output)
@@ -79,38 +87,140 @@ class CLICommand:
             args.write_args = eval("dict({0})"
                                    .format(', '.join(args.write_args)))
 
-        configs = []
-        for filename in args.input:
-            atoms = read(filename, args.image_number,
-                         format=args.input_format, **args.read_args)
-            if isinstance(atoms, list):
-                configs.extend(atoms)
-            else:
-                configs.append(atoms)
-
-        new_configs = []
-        for atoms in configs:
-            if args.arrays:
-                atoms.arrays = dict((k, atoms.arrays[k]) for k in args.arrays)
-            if args.info:
-                atoms.info = dict((k, atoms.info[k]) for k in args.info)
-            if args.exec_code:
-                # avoid exec() for Py 2+3 compat.
-                eval(compile(args.exec_code, '<string>', 'exec'))
-            if args.exec_file:
-                eval(compile(open(args.exec_file).read(), args.exec_file,
-                             'exec'))
-            if "_output" not in atoms.info or atoms.info["_output"]:
-                new_configs.append(atoms)
-        configs = new_configs
-
         if not args.force and os.path.isfile(args.output):
             parser.error('File already exists: {}'.format(args.output))
 
+        def read_frames():
+            for filename in args.input:
+                yield from iread_chunks(filename, args.image_number,
+                                        args.input_format, args.jobs,
+                                        args.chunk_size, args.read_args)
+
+        def process_frames(configs):
+            nframes = 0
+            for atoms in configs:
+                if args.arrays:
+                    atoms.arrays = dict((k, atoms.arrays[k])
+                                        for k in args.arrays)
+                if args.info:
+                    atoms.info = dict((k, atoms.info[k]) for k in args.info)
+                if args.exec_code:
+                    # avoid exec() for Py 2+3 compat.
+                    eval(compile(args.exec_code, '<string>', 'exec'))
+                if args.exec_file:
+                    eval(compile(open(args.exec_file).read(), args.exec_file,
+                                 'exec'))
+                if "_output" not in atoms.info or atoms.info["_output"]:
+                    yield atoms
+                nframes += 1
+                if args.verbose and nframes % 1000 == 0:
+                    print('{} frames converted'.format(nframes), flush=True)
+            if args.verbose:
+                print('{} frames converted'.format(nframes))
+
+        configs = process_frames(read_frames())
+
         if args.split_output:
             for i, atoms in enumerate(configs):
                 write(args.output.format(i), atoms,
                       format=args.output_format, **args.write_args)
         else:
+            # Frames are written as they are read if the writer
+            # accepts an iterator
+            format = args.output_format
+            if format is None and args.output != '-':
+                format = filetype(args.output, read=False)
+            # Read everything first if writing would truncate an input
+            if (format not in streaming_formats or
+                    any(os.path.isfile(filename) and
+                        os.path.isfile(args.output) and
+                        os.path.samefile(filename, args.output)
+                        for filename in args.input)):
+                configs = list(configs)
             write(args.output, configs, format=args.output_format,
                   **args.write_args)
+
+
+# Formats whose writers accept an iterator of frames
+streaming_formats = {'extxyz', 'xyz', 'traj', 'db', 'ragged'}
+
+
+def random_access_chunks(filename, index, format, chunksize):
+    """Split reading a file into chunks of frames.
+
+    Returns a list of (index, kwargs) pairs for ase.io.read(), or None
+    if the format does not support random access or index is a single
+    frame or a reversed range."""
+    from ase.io.formats import filetype, get_compression, string2index
+
+    if isinstance(index, str):
+        index = string2index(index)
+    if not isinstance(index, slice):
+        return None
+    if get_compression(filename)[1] is not None:
+        return None
+
+    format = format or filetype(filename)
+    if format == 'traj':
+        from ase.io.trajectory import Trajectory
+        with Trajectory(filename) as traj:
+            frames = range(len(traj))
+    elif format == 'extxyz':
+        from ase.io.extxyz import index_xyz
+        with open(filename) as fd:
+            frames = index_xyz(fd)
+    else:
+        return None
+
+    indices = range(len(frames))[index]
+    if indices.step < 0:
+        return None
+
+    chunks = []
+    for start in range(0, len(indices), chunksize):
+        chunk = indices[start:start + chunksize]
+        if format == 'traj':
+            chunks.append((slice(chunk.start, chunk.stop, chunk.step), {}))
+        else:
+            # The worker gets the positions of its frames in the file
+            chunks.append((slice(None), {
+                'frames': frames[chunk.start:chunk.stop:chunk.step]}))
+    return chunks
+
+
+def iread_chunks(filename, index, format=None, jobs=1, chunksize=100,
+                 read_args=None):
+    """Read frames in chunks with a pool of jobs processes.
+
+    The frames are yielded in order while the following chunks are read.
+    Falls back to ase.io.iread() for one job, or if the file cannot be
+    read in chunks."""
+    from collections import deque
+    from concurrent.futures import ProcessPoolExecutor
+    from ase.io import iread, read
+
+    read_args = read_args or {}
+    chunks = None
+    if jobs > 1:
+        chunks = random_access_chunks(filename, index, format, chunksize)
+    if chunks is None:
+        yield from iread(filename, index, format=format, **read_args)
+        return
+
+    pending = deque()
+    chunks = iter(chunks)
+    with ProcessPoolExecutor(jobs) as executor:
+        try:
+            while True:
+                for chunk_index, kwargs in chunks:
+                    pending.append(executor.submit(read, filename,
+                                                   chunk_index, format,
+                                                   **kwargs, **read_args))
+                    if len(pending) >= 2 * jobs:
+                        break
+                if not pending:
+                    break
+                yield from pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
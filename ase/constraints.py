@@ -249,13 +249,39 @@ class FixBondLengths(FixConstraint):
                  bondlengths=None, iterations=None):
         """iterations:
                 Ignored"""
-        self.pairs = np.asarray(pairs)
+        self.pairs = np.asarray(pairs, int).reshape(-1, 2)
         self.tolerance = tolerance
+        if bondlengths is not None:
+            bondlengths = np.asarray(bondlengths, float)
         self.bondlengths = bondlengths
 
     def get_removed_dof(self, atoms):
         return len(self.pairs)
 
+    def get_pair_groups(self):
+        """Split the pairs into groups where no atom appears twice.
+
+        The constraints within a group are independent and are solved for
+        all pairs at once, while the groups are solved one after the other
+        as in the usual sequential SHAKE/RATTLE sweep.  Returns a list of
+        index arrays into self.pairs."""
+        if getattr(self, '_groups_pairs', None) is not self.pairs:
+            groups = []
+            left = np.arange(len(self.pairs))
+            while len(left):
+                # A pair is taken if it is the first remaining pair of both
+                # of its atoms.  This always includes the first pair.
+                atoms = self.pairs[left].ravel()
+                _, first = np.unique(atoms, return_index=True)
+                isfirst = np.zeros(len(atoms), bool)
+                isfirst[first] = True
+                take = isfirst.reshape(-1, 2).all(axis=1)
+                groups.append(left[take])
+                left = left[~take]
+            self._groups = groups
+            self._groups_pairs = self.pairs
+        return self._groups
+
     def adjust_positions(self, atoms, new):
         old = atoms.positions
         masses = atoms.get_masses()
@@ -263,20 +289,27 @@ class FixBondLengths(FixConstraint):
         if self.bondlengths is None:
             self.bondlengths = self.initialize_bond_lengths(atoms)
 
+        a = self.pairs[:, 0]
+        b = self.pairs[:, 1]
+        r0 = old[a] - old[b]
+        d0, _ = find_mic(r0, atoms.cell, atoms.pbc)
+        m = 1 / (1 / masses[a] + 1 / masses[b])
+        groups = [(a[g], b[g], self.bondlengths[g]**2, r0[g] - d0[g], d0[g],
+                   (m[g] / masses[a[g]])[:, None],
+                   (m[g] / masses[b[g]])[:, None])
+                  for g in self.get_pair_groups()]
+
         for i in range(self.maxiter):
             converged = True
-            for j, ab in enumerate(self.pairs):
-                a = ab[0]
-                b = ab[1]
-                cd = self.bondlengths[j]
-                r0 = old[a] - old[b]
-                d0, _ = find_mic(r0, atoms.cell, atoms.pbc)
-                d1 = new[a] - new[b] - r0 + d0
-                m = 1 / (1 / masses[a] + 1 / masses[b])
-                x = 0.5 * (cd**2 - np.dot(d1, d1)) / np.dot(d0, d1)
-                if abs(x) > self.tolerance:
-                    new[a] += x * m / masses[a] * d0
-                    new[b] -= x * m / masses[b] * d0
+            for a, b, cd2, shift, d0, ma, mb in groups:
+                d1 = new[a] - new[b] - shift
+                x = (0.5 * (cd2 - np.einsum('ij,ij->i', d1, d1)) /
+                     np.einsum('ij,ij->i', d0, d1))
+                mask = abs(x) > self.tolerance
+                if mask.any():
+                    xd0 = x[mask, None] * d0[mask]
+                    new[a[mask]] += ma[mask] * xd0
+                    new[b[mask]] -= mb[mask] * xd0
                     converged = False
             if converged:
                 break
@@ -290,20 +323,24 @@ class FixBondLengths(FixConstraint):
         if self.bondlengths is None:
             self.bondlengths = self.initialize_bond_lengths(atoms)
 
+        a = self.pairs[:, 0]
+        b = self.pairs[:, 1]
+        d, _ = find_mic(old[a] - old[b], atoms.cell, atoms.pbc)
+        m = 1 / (1 / masses[a] + 1 / masses[b])
+        groups = [(a[g], b[g], self.bondlengths[g]**2, d[g], m[g, None],
+                   1 / masses[a[g], None], 1 / masses[b[g], None])
+                  for g in self.get_pair_groups()]
+
         for i in range(self.maxiter):
             converged = True
-            for j, ab in enumerate(self.pairs):
-                a = ab[0]
-                b = ab[1]
-                cd = self.bondlengths[j]
-                d = old[a] - old[b]
-                d, _ = find_mic(d, atoms.cell, atoms.pbc)
-                dv = p[a] / masses[a] - p[b] / masses[b]
-                m = 1 / (1 / masses[a] + 1 / masses[b])
-                x = -np.dot(dv, d) / cd**2
-                if abs(x) > self.tolerance:
-                    p[a] += x * m * d
-                    p[b] -= x * m * d
+            for a, b, cd2, d, m, inva, invb in groups:
+                dv = p[a] * inva - p[b] * invb
+                x = -np.einsum('ij,ij->i', dv, d) / cd2
+                mask = abs(x) > self.tolerance
+                if mask.any():
+                    dp = x[mask, None] * m[mask] * d[mask]
+                    p[a[mask]] += dp
+                    p[b[mask]] -= dp
                     converged = False
             if converged:
                 break
@@ -316,11 +353,9 @@ class FixBondLengths(FixConstraint):
         self.constraint_forces += forces
 
     def initialize_bond_lengths(self, atoms):
-        bondlengths = np.zeros(len(self.pairs))
-
-        for i, ab in enumerate(self.pairs):
-            bondlengths[i] = atoms.get_distance(ab[0], ab[1], mic=True)
-
+        R = atoms.positions
+        _, bondlengths = find_mic(R[self.pairs[:, 1]] - R[self.pairs[:, 0]],
+                                  atoms.cell, atoms.pbc)
         return bondlengths
 
     def get_indices(self):
@@ -572,15 +607,11 @@ class FixLinearTriatomic(FixConstraint):
         a[self.o_ind] = a_o
 
     def initialize_bond_lengths(self, atoms):
-        bondlengths = np.zeros((len(self.triples), 2))
-
-        for i in range(len(self.triples)):
-            bondlengths[i, 0] = atoms.get_distance(self.n_ind[i],
-                                                   self.o_ind[i], mic=True)
-            bondlengths[i, 1] = atoms.get_distance(self.o_ind[i],
-                                                   self.m_ind[i], mic=True)
-
-        return bondlengths
+        R = atoms.positions
+        D = np.concatenate((R[self.o_ind] - R[self.n_ind],
+                            R[self.m_ind] - R[self.o_ind]))
+        _, bondlengths = find_mic(D, atoms.cell, atoms.pbc)
+        return bondlengths.reshape(2, -1).T.copy()
 
     def get_indices(self):
         return np.unique(self.triples.ravel())
@@ -944,8 +975,93 @@ class FixInternals(FixConstraint):
                                                         self.mic)
                 constr = ConstrClass(targetvalue, datum[1], masses, cell, pbc)
                 self.constraints.append(constr)
+        self.setup_batches(len(atoms))
+        self.inv_masses = 1 / masses
         self.initialized = True
 
+    def setup_batches(self, natoms):
+        """Collect the atom indices of all bonds (including the bonds of
+        bondcombos), angles and dihedrals in arrays, such that the values and
+        the Jacobian of all constraints can be calculated at once."""
+        terms = {2: [], 3: [], 4: []}
+        for row, constr in enumerate(self.constraints):
+            for indices, coef in zip(constr.indices, constr.coefs):
+                terms[len(indices)].append((row, coef, indices))
+        self.batches = []
+        for natoms_per_term, data in terms.items():
+            if data:
+                rows, coefs, indices = zip(*data)
+                self.batches.append((np.array(rows), np.array(coefs),
+                                     np.array(indices, dtype=int)))
+        self.is_dihedral = np.array([isinstance(constr, self.FixDihedral)
+                                     for constr in self.constraints], bool)
+        self.natoms = natoms
+
+    def get_batch_vectors(self, pos, indices):
+        """Return the vectors defining the bonds, angles or dihedrals."""
+        if indices.shape[1] == 2:
+            return [pos[indices[:, 1]] - pos[indices[:, 0]]]
+        if indices.shape[1] == 3:
+            return [pos[indices[:, 0]] - pos[indices[:, 1]],
+                    pos[indices[:, 2]] - pos[indices[:, 1]]]
+        return [pos[indices[:, 1]] - pos[indices[:, 0]],
+                pos[indices[:, 2]] - pos[indices[:, 1]],
+                pos[indices[:, 3]] - pos[indices[:, 2]]]
+
+    def get_sigmas(self, pos):
+        """Return the differences between the current and the target values
+        of all constraints."""
+        if not self.constraints:
+            return np.zeros(0)
+        cell, pbc = self.constraints[0].cell, self.constraints[0].pbc
+        values = np.zeros(len(self.constraints))
+        for rows, coefs, indices in self.batches:
+            vectors = self.get_batch_vectors(pos, indices)
+            if len(vectors) == 1:
+                (_, ), (terms, ) = conditional_find_mic(vectors, cell=cell,
+                                                        pbc=pbc)
+            elif len(vectors) == 2:
+                terms = get_angles(*vectors, cell=cell, pbc=pbc)
+            else:
+                terms = get_dihedrals(*vectors, cell=cell, pbc=pbc)
+            values += np.bincount(rows, coefs * terms,
+                                  minlength=len(values))
+        targets = np.array([constr.targetvalue
+                            for constr in self.constraints])
+        sigmas = values - targets
+        # apply minimum dihedral difference 'convention': (diff <= 180)
+        sigmas[self.is_dihedral] = (sigmas[self.is_dihedral] + 180) % 360 - 180
+        return sigmas
+
+    def get_jacobian(self, pos):
+        """Return the Jacobian of all constraints as a sparse matrix of
+        shape (number of constraints, 3 * number of atoms)."""
+        from scipy.sparse import csr_matrix
+        if not self.constraints:
+            return csr_matrix((0, 3 * self.natoms))
+        cell, pbc = self.constraints[0].cell, self.constraints[0].pbc
+        rows_list = []
+        cols_list = []
+        data_list = []
+        for rows, coefs, indices in self.batches:
+            vectors = self.get_batch_vectors(pos, indices)
+            if len(vectors) == 1:
+                derivs = get_distances_derivatives(*vectors, cell=cell,
+                                                   pbc=pbc)
+            elif len(vectors) == 2:
+                derivs = get_angles_derivatives(*vectors, cell=cell, pbc=pbc)
+            else:
+                derivs = get_dihedrals_derivatives(*vectors, cell=cell,
+                                                   pbc=pbc)
+            shape = derivs.shape
+            rows_list.append(np.broadcast_to(rows[:, None, None], shape))
+            cols_list.append(3 * indices[:, :, None] + np.arange(3))
+            data_list.append(coefs[:, None, None] * derivs)
+        rows, cols, data = (np.concatenate([x.ravel() for x in arrays])
+                            for arrays in [rows_list, cols_list, data_list])
+        return csr_matrix((data, (rows, cols)),
+                          shape=(len(self.constraints), 3 * self.natoms))
+
     @staticmethod
     def get_bondcombo(atoms, indices, mic=False):
         """Convenience function to return the value of the bondcombo coordinate
@@ -1038,15 +1154,23 @@ class FixInternals(FixConstraint):
 
     def adjust_positions(self, atoms, newpos):
         self.initialize(atoms)
-        for constraint in self.constraints:
-            constraint.setup_jacobian(atoms.positions)
+        # The atoms move along the mass-weighted constraint gradients at the
+        # old positions.  All step lengths are solved for at once from the
+        # linearized constraints, as in the matrix form of SHAKE.
+        directions = (self.get_jacobian(atoms.positions)
+                      .multiply(self.inv_masses).T.tocsr())
         for j in range(50):
-            maxerr = 0.0
-            for constraint in self.constraints:
-                constraint.adjust_positions(atoms.positions, newpos)
-                maxerr = max(abs(constraint.sigma), maxerr)
-            if maxerr < self.epsilon:
+            sigmas = self.get_sigmas(newpos)
+            for constraint, sigma in zip(self.constraints, sigmas):
+                constraint.sigma = sigma
+            if (abs(sigmas) < self.epsilon).all():
                 return
+            A = (self.get_jacobian(newpos) @ directions).toarray()
+            try:
+                lamda = np.linalg.solve(A, -sigmas)
+            except np.linalg.LinAlgError:  # redundant constraints
+                lamda = np.linalg.lstsq(A, -sigmas, rcond=None)[0]
+            newpos += (directions @ lamda).reshape(newpos.shape)
         msg = 'FixInternals.adjust_positions did not converge.'
         if any([constr.targetvalue > 175. or constr.targetvalue < 5. for constr
                 in self.constraints if isinstance(constr, self.FixAngle)]):
@@ -1058,14 +1182,13 @@ class FixInternals(FixConstraint):
 
     def adjust_forces(self, atoms, forces):
         """Project out translations and rotations and all other constraints"""
+        from scipy.sparse import diags, hstack
         self.initialize(atoms)
         positions = atoms.positions
         N = len(forces)
         list2_constraints = list(np.zeros((6, N, 3)))
         tx, ty, tz, rx, ry, rz = list2_constraints
 
-        list_constraints = [r.ravel() for r in list2_constraints]
-
         tx[:, 0] = 1.0
         ty[:, 1] = 1.0
         tz[:, 2] = 1.0
@@ -1086,31 +1209,26 @@ class FixInternals(FixConstraint):
             r /= np.linalg.norm(r.ravel())
 
         # Add all angle, etc. constraint vectors
-        for constraint in self.constraints:
-            constraint.setup_jacobian(positions)
-            constraint.adjust_forces(positions, forces)
-            list_constraints.insert(0, constraint.jacobian)
-        # QR DECOMPOSITION - GRAM SCHMIDT
-
-        list_constraints = [r.ravel() for r in list_constraints]
-        aa = np.column_stack(list_constraints)
-        (aa, bb) = np.linalg.qr(aa)
-        # Projection
-        hh = []
+        jacobian = self.get_jacobian(positions)
+        jf = jacobian @ ff
         for i, constraint in enumerate(self.constraints):
-            hh.append(aa[:, i] * np.row_stack(aa[:, i]))
-
-        txx = aa[:, self.n] * np.row_stack(aa[:, self.n])
-        tyy = aa[:, self.n + 1] * np.row_stack(aa[:, self.n + 1])
-        tzz = aa[:, self.n + 2] * np.row_stack(aa[:, self.n + 2])
-        rxx = aa[:, self.n + 3] * np.row_stack(aa[:, self.n + 3])
-        ryy = aa[:, self.n + 4] * np.row_stack(aa[:, self.n + 4])
-        rzz = aa[:, self.n + 5] * np.row_stack(aa[:, self.n + 5])
-        T = txx + tyy + tzz + rxx + ryy + rzz
-        for vec in hh:
-            T += vec
-        ff = np.dot(T, np.row_stack(ff))
-        forces[:, :] -= np.dot(T, np.row_stack(ff)).reshape(-1, 3)
+            constraint.set_batched_jacobian(jacobian, i, jf[i])
+        norms = np.sqrt(np.asarray(jacobian.multiply(jacobian).sum(axis=1)))
+        jacobian = diags(1 / norms.ravel()) @ jacobian
+
+        # Projection onto the space spanned by all constraint vectors and
+        # translations and rotations, using the small Gram matrix instead of
+        # the QR decomposition of the full 3N x (n + 6) matrix
+        basis = hstack([jacobian.T,
+                        np.column_stack([r.ravel()
+                                         for r in list2_constraints])]).tocsr()
+        gram = (basis.T @ basis).toarray()
+        bf = basis.T @ ff
+        try:
+            coefs = np.linalg.solve(gram, bf)
+        except np.linalg.LinAlgError:
+            coefs = np.linalg.lstsq(gram, bf, rcond=None)[0]
+        forces[:, :] -= (basis @ coefs).reshape(-1, 3)
 
     def __repr__(self):
         constraints = [repr(constr) for constr in self.constraints]
@@ -1127,10 +1245,46 @@ class FixInternals(FixConstraint):
             self.masses = masses
             self.jacobian = []  # geometric Jacobian matrix, Wilson B-matrix
             self.sigma = 1.  # difference between current and target value
-            self.projected_force = None  # helps optimizers scan along constr.
+            self.projected_forces = None  # helps optimizers scan along constr.
             self.cell = cell
             self.pbc = pbc
 
+        # FixInternals calculates the Jacobian of all constraints at once.
+        # The dense vectors of the individual constraints, which are only
+        # needed by e.g. ClimbFixInternals, are extracted when used.
+        _batched = None
+
+        def set_batched_jacobian(self, jacobian, row, jf):
+            """Use row of the sparse Jacobian of all constraints.  jf is the
+            force along the unnormalized row."""
+            self._batched = (jacobian, row, jf)
+            self._jacobian = None
+            self._projected_forces = None
+
+        @property
+        def jacobian(self):
+            if self._jacobian is None and self._batched is not None:
+                jacobian, row, _ = self._batched
+                jac = jacobian[row].toarray().ravel()
+                self._jacobian = jac / np.linalg.norm(jac)
+            return self._jacobian
+
+        @jacobian.setter
+        def jacobian(self, jacobian):
+            self._jacobian = jacobian
+            self._batched = None
+
+        @property
+        def projected_forces(self):
+            if self._projected_forces is None and self._batched is not None:
+                jacobian, row, jf = self._batched
+                self._projected_forces = jf * jacobian[row].toarray().ravel()
+            return self._projected_forces
+
+        @projected_forces.setter
+        def projected_forces(self, projected_forces):
+            self._projected_forces = projected_forces
+
         def finalize_jacobian(self, pos, n_internals, n, derivs):
             """Populate jacobian with derivatives for `n_internals` defined
             internals. n = 2 (bonds), 3 (angles), 4 (dihedrals)."""
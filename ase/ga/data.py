@@ -204,6 +204,16 @@ class DataConnection:
                 a.info['confid'] = relax_id
                 a.info['relax_id'] = relax_id
 
+    def add_data_to_relaxed_candidates(self, a_list, *keys):
+        """Store the entries given by keys in a.info['data'] in the
+        database rows of already relaxed candidates, without adding new
+        rows. Used for storing data derived from the relaxed structure,
+        e.g. comparator fingerprints, so it can be reused later."""
+        with self.c as con:
+            for a in a_list:
+                data = dict((k, a.info['data'][k]) for k in keys)
+                con.update(a.info['relax_id'], data=data)
+
     def get_next_id(self):
         """Get the id of the next candidate to be added to the database.
         This is a hacky way of obtaining the id and it only works on a
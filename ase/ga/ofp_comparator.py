@@ -1,6 +1,7 @@
 import numpy as np
 from itertools import combinations_with_replacement
 from math import erf
+from multiprocessing import Pool
 from scipy.spatial.distance import cdist
 from ase.neighborlist import NeighborList
 from ase.utils import pbc2pbc
@@ -201,6 +202,106 @@ class OFPComparator:
         cos_dist = self._cosine_distance(fp1, fp2, typedic1)
         return cos_dist
 
+    def _get_fingerprints(self, images, processes=1, chunksize=1):
+        """ Returns the [fingerprints, typedic] lists of all the images,
+            taking the missing fingerprints in a pool of processes
+            and storing them in atoms.info. """
+        fps = [None] * len(images)
+        todo = []
+        for i, a in enumerate(images):
+            if 'fingerprints' in a.info and not self.recalculate:
+                fps[i] = self._json_decode(*a.info['fingerprints'])
+            else:
+                todo.append(i)
+
+        tops = [images[i][-self.n_top:] for i in todo]
+        if processes == 1 or len(tops) < 2:
+            results = [self._take_fingerprints(a) for a in tops]
+        else:
+            # Fix the maxdims of non-periodic directions before they
+            # are set independently in each process
+            self._get_volume(tops[0])
+            with Pool(processes) as pool:
+                results = pool.map(self._take_fingerprints, tops,
+                                   chunksize=chunksize)
+
+        for i, (fp, typedic) in zip(todo, results):
+            images[i].info['fingerprints'] = self._json_encode(fp, typedic)
+            fps[i] = [fp, typedic]
+        return fps
+
+    def get_fingerprint_matrix(self, images, processes=1, chunksize=1):
+        """ Returns the fingerprints of all the images as the rows of
+        a dense matrix.
+
+        The fingerprints of the element-element combinations are
+        weighted and concatenated, and each row is normalized, such that
+        the cosine distance between images i and j is
+        0.5 * (1 - F[i] @ F[j]). All the images must have the same
+        stoichiometry and ordering.
+
+        processes: int
+            Number of processes used for taking the fingerprints
+            not already stored in atoms.info. (Default 1)
+
+        chunksize: int
+            Number of images sent to a process at a time. (Default 1)
+        """
+        fps = self._get_fingerprints(images, processes, chunksize)
+        if len(fps) == 0:
+            return np.zeros((0, 0))
+
+        fp1, typedic1 = fps[0]
+        keys = sorted(fp1)
+        weights = np.array([len(typedic1[key[0]]) * len(typedic1[key[1]])
+                            for key in keys], float)
+        weights = np.sqrt(weights / weights.sum())
+
+        F = np.empty((len(fps), sum(len(fp1[key]) for key in keys)))
+        for i, (fp, typedic) in enumerate(fps):
+            if sorted(fp) != keys:
+                raise AssertionError('The two structures have fingerprints '
+                                     'with different compounds.')
+            for key in typedic1:
+                if not np.array_equal(typedic1[key], typedic[key]):
+                    raise AssertionError('The two structures have a '
+                                         'different stoichiometry or '
+                                         'ordering!')
+            F[i] = np.concatenate([w * fp[key]
+                                   for w, key in zip(weights, keys)])
+        F /= np.linalg.norm(F, axis=1)[:, np.newaxis]
+        return F
+
+    def get_distance_matrix(self, images, processes=1, chunksize=1,
+                            condensed=False):
+        """ Returns the matrix of cosine distances between all pairs
+        of images, see get_fingerprint_matrix for the parameters.
+
+        condensed: boolean
+            If True, return the upper triangle as a condensed distance
+            vector as used by scipy.cluster.hierarchy and
+            scipy.spatial.distance.squareform. (Default False)
+        """
+        F = self.get_fingerprint_matrix(images, processes, chunksize)
+        D = 0.5 * (1 - F @ F.T)
+        np.fill_diagonal(D, 0.)
+        np.clip(D, 0., 1., out=D)
+        if condensed:
+            return D[np.triu_indices(len(D), k=1)]
+        return D
+
+    def get_similarity_groups(self, images, processes=1, chunksize=1):
+        """ Returns a list of lists of image indices, where the images
+        in each list are connected by a chain of cosine distances below
+        cos_dist_max. The energy criterion is not applied. """
+        from scipy.sparse.csgraph import connected_components
+
+        D = self.get_distance_matrix(images, processes, chunksize)
+        n, labels = connected_components(D < self.cos_dist_max,
+                                         directed=False)
+        return [np.flatnonzero(labels == label).tolist()
+                for label in range(n)]
+
     def _get_volume(self, a):
         ''' Calculates the normalizing value, and other parameters
         (pmin,pmax,qmin,qmax) that are used for surface area calculation
@@ -385,8 +486,7 @@ class OFPComparator:
                     0.5 * erf(c * (2 * i - 1))
                 values /= smearing_norm
 
-                for j, valid_bin in enumerate(valid_bins):
-                    rdf[valid_bin] += values[j]
+                np.add.at(rdf, valid_bins, values)
 
             rdf /= len(typedic[unique_type]) * 1. / volume
             return rdf
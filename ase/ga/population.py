@@ -1,5 +1,6 @@
 """ Implementation of a population for maintaining a GA population and
 proposing structures to pair. """
+from bisect import bisect_left, bisect_right
 from math import tanh, sqrt, exp
 from operator import itemgetter
 import numpy as np
@@ -10,6 +11,10 @@ from ase.ga import get_raw_score
 
 def count_looks_like(a, all_cand, comp):
     """Utility method for counting occurrences."""
+    if hasattr(comp, 'looks_like_many'):
+        others = [b for b in all_cand
+                  if a.info['confid'] != b.info['confid']]
+        return int(np.sum(comp.looks_like_many(a, others)))
     n = 0
     for b in all_cand:
         if a.info['confid'] == b.info['confid']:
@@ -67,6 +72,9 @@ class Population:
         self.pop = []
         self.pairs = None
         self.all_cand = None
+        self._energies = []
+        self._by_energy = []
+        self._indexed_cand = None
         self.__initialize_pop__()
 
     def __initialize_pop__(self):
@@ -79,6 +87,7 @@ class Population:
         all_cand.sort(key=lambda x: x.info['key_value_pairs']['raw_score'],
                       reverse=True)
         # all_cand.sort(key=lambda x: x.get_potential_energy())
+        self.__store_fingerprints__(all_cand)
 
         # Fill up the population with the self.pop_size most stable
         # unique candidates.
@@ -94,13 +103,57 @@ class Population:
             if not eq:
                 self.pop.append(c)
 
+        self.all_cand = all_cand
         for a in self.pop:
-            a.info['looks_like'] = count_looks_like(a, all_cand,
-                                                    self.comparator)
+            a.info['looks_like'] = count_looks_like(
+                a, self.__get_energy_window__(a), self.comparator)
 
-        self.all_cand = all_cand
         self.__calc_participation__()
 
+    def __store_fingerprints__(self, candidates):
+        """ Computes the comparator fingerprints of candidates not
+            having them yet and stores them in the database. Only
+            used if the comparator supports fingerprints. """
+        if not hasattr(self.comparator, 'get_fingerprint'):
+            return
+        key = self.comparator.fingerprint_key
+        new = []
+        for a in candidates:
+            if 'relax_id' not in a.info:
+                continue
+            a.info.setdefault('data', {})
+            stored = a.info['data'].get(key)
+            self.comparator.get_fingerprint(a)
+            if a.info['data'].get(key) is not stored:
+                new.append(a)
+        if new:
+            self.dc.add_data_to_relaxed_candidates(new, key)
+
+    def __get_energy_window__(self, a):
+        """ Returns the candidates that can look like the candidate a.
+            If the comparator has an energy criterion, dE, only the
+            candidates with an energy within dE of a are returned. """
+        dE = getattr(self.comparator, 'dE', None)
+        if dE is None or not hasattr(self.comparator, 'looks_like_many'):
+            return self.all_cand
+
+        # Keep a list of all candidates sorted by energy, only
+        # inserting the candidates added since the last call
+        if self._indexed_cand is not self.all_cand:
+            self._indexed_cand = self.all_cand
+            self._energies = []
+            self._by_energy = []
+        for b in self.all_cand[len(self._by_energy):]:
+            e = b.get_potential_energy()
+            i = bisect_right(self._energies, e)
+            self._energies.insert(i, e)
+            self._by_energy.insert(i, b)
+
+        e = a.get_potential_energy()
+        lo = bisect_left(self._energies, e - dE)
+        hi = bisect_right(self._energies, e + dE)
+        return self._by_energy[lo:hi]
+
     def __calc_participation__(self):
         """ Determines, from the database, how many times each
             candidate has been used to generate new candidates. """
@@ -126,6 +179,7 @@ class Population:
             new_cand = self.dc.get_all_relaxed_candidates(only_new=True,
                                                           use_extinct=ue)
 
+        self.__store_fingerprints__(new_cand)
         for a in new_cand:
             self.__add_candidate__(a)
             self.all_cand.append(a)
@@ -179,9 +233,8 @@ class Population:
             if self.comparator.looks_like(a, b):
                 if get_raw_score(b) < raw_score_a:
                     del self.pop[i]
-                    a.info['looks_like'] = count_looks_like(a,
-                                                            self.all_cand,
-                                                            self.comparator)
+                    a.info['looks_like'] = count_looks_like(
+                        a, self.__get_energy_window__(a), self.comparator)
                     self.pop.append(a)
                     self.pop.sort(key=lambda x: get_raw_score(x),
                                   reverse=True)
@@ -193,9 +246,8 @@ class Population:
             del self.pop[-1]
 
         # add the new candidate
-        a.info['looks_like'] = count_looks_like(a,
-                                                self.all_cand,
-                                                self.comparator)
+        a.info['looks_like'] = count_looks_like(
+            a, self.__get_energy_window__(a), self.comparator)
         self.pop.append(a)
         self.pop.sort(key=lambda x: get_raw_score(x), reverse=True)
 
@@ -6,16 +6,12 @@ def get_sorted_dist_list(atoms, mic=False):
     """ Utility method used to calculate the sorted distance list
         describing the cluster in atoms. """
     numbers = atoms.numbers
-    unique_types = set(numbers)
+    dists = atoms.get_all_distances(mic=mic)
     pair_cor = dict()
-    for n in unique_types:
-        i_un = [i for i in range(len(atoms)) if atoms[i].number == n]
-        d = []
-        for i, n1 in enumerate(i_un):
-            for n2 in i_un[i + 1:]:
-                d.append(atoms.get_distance(n1, n2, mic))
-        d.sort()
-        pair_cor[n] = np.array(d)
+    for n in set(numbers):
+        i_un = np.flatnonzero(numbers == n)
+        i, j = np.triu_indices(len(i_un), k=1)
+        pair_cor[n] = np.sort(dists[i_un[i], i_un[j]])
     return pair_cor
 
 
@@ -34,8 +30,17 @@ class InteratomicDistanceComparator:
         dE: The limit of eq. 1 of the letter
         mic: Determines if distances are calculated
         using the minimum image convention
+
+        The sorted distance lists (fingerprints) of relaxed candidates,
+        i.e. candidates with a relax_id, are cached so each candidate is
+        only fingerprinted once. If the candidate has a data dictionary
+        in atoms.info the fingerprint is also put there under the key
+        given by fingerprint_key, such that it can be stored in the GA
+        database together with the candidate and reused on later runs.
     """
 
+    fingerprint_key = 'sorted_dist_list'
+
     def __init__(self, n_top=None, pair_cor_cum_diff=0.015,
                  pair_cor_max=0.7, dE=0.02, mic=False):
         self.pair_cor_cum_diff = pair_cor_cum_diff
@@ -43,6 +48,7 @@ class InteratomicDistanceComparator:
         self.dE = dE
         self.n_top = n_top or 0
         self.mic = mic
+        self.fingerprints = {}
 
     def looks_like(self, a1, a2):
         """ Return if structure a1 or a2 are similar or not. """
@@ -55,18 +61,89 @@ class InteratomicDistanceComparator:
             return False
 
         # then we check the structure
-        a1top = a1[-self.n_top:]
-        a2top = a2[-self.n_top:]
-        cum_diff, max_diff = self.__compare_structure__(a1top, a2top)
+        cum_diff, max_diff = self.__compare_structure__(a1, a2)
 
         return (cum_diff < self.pair_cor_cum_diff
                 and max_diff < self.pair_cor_max)
 
+    def looks_like_many(self, a, candidates):
+        """ Return a boolean array telling which of the candidates
+            are similar to the structure a.
+
+            Equivalent to calling looks_like(a, c) for every c in
+            candidates, but the energy criterion is applied to all
+            candidates at once and the structural criteria are
+            evaluated with one array operation per atom type
+            against the fingerprints of the remaining candidates. """
+        similar = np.zeros(len(candidates), bool)
+        if len(candidates) == 0:
+            return similar
+        if any(len(c) != len(a) for c in candidates):
+            raise Exception('The two configurations are not the same size')
+
+        energies = np.array([c.get_potential_energy() for c in candidates])
+        dE = np.abs(a.get_potential_energy() - energies)
+        (within,) = np.nonzero(dE < self.dE)
+        if len(within) == 0:
+            return similar
+
+        p1 = self.get_fingerprint(a)
+        p2 = [self.get_fingerprint(candidates[i]) for i in within]
+        numbers = a.numbers[-self.n_top:]
+        total_cum_diff = np.zeros(len(within))
+        max_diff = np.zeros(len(within))
+        for n in p1.keys():
+            c1 = p1[n]
+            if len(c1) == 0:
+                continue
+            c2 = np.array([p[n] for p in p2])
+            assert c2.shape[1] == len(c1)
+            t_size = np.sum(c1)
+            d = np.abs(c2 - c1)
+            cum_diff = np.sum(d, axis=1)
+            max_diff = np.max(d, axis=1)
+            ntype = float(np.sum(numbers == n))
+            total_cum_diff += cum_diff / t_size * ntype / float(len(numbers))
+
+        similar[within] = ((total_cum_diff < self.pair_cor_cum_diff)
+                           & (max_diff < self.pair_cor_max))
+        return similar
+
+    def get_fingerprint(self, atoms):
+        """ Return the sorted distance list of the atoms being
+            optimized, reusing a cached or stored one if possible. """
+        key = atoms.info.get('relax_id')
+        if key is None:
+            return get_sorted_dist_list(atoms[-self.n_top:], mic=self.mic)
+        if key in self.fingerprints:
+            return self.fingerprints[key]
+
+        data = atoms.info.get('data')
+        stored = None
+        if data is not None:
+            stored = data.get(self.fingerprint_key)
+        if (stored is not None and stored['relax_id'] == key
+                and stored['n_top'] == self.n_top
+                and stored['mic'] == self.mic):
+            fp = dict(zip(stored['numbers'], stored['dists']))
+        else:
+            fp = get_sorted_dist_list(atoms[-self.n_top:], mic=self.mic)
+            if data is not None:
+                data[self.fingerprint_key] = {
+                    'relax_id': key,
+                    'n_top': self.n_top,
+                    'mic': self.mic,
+                    'numbers': [int(n) for n in fp],
+                    'dists': list(fp.values())}
+
+        self.fingerprints[key] = fp
+        return fp
+
     def __compare_structure__(self, a1, a2):
         """ Private method for calculating the structural difference. """
-        p1 = get_sorted_dist_list(a1, mic=self.mic)
-        p2 = get_sorted_dist_list(a2, mic=self.mic)
-        numbers = a1.numbers
+        p1 = self.get_fingerprint(a1)
+        p2 = self.get_fingerprint(a2)
+        numbers = a1.numbers[-self.n_top:]
         total_cum_diff = 0.
         max_diff = 0
         for n in p1.keys():
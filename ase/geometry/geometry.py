@@ -7,6 +7,7 @@ different orientations.
    - detection of duplicate atoms / atoms within cutoff radius
 """
 
+import functools
 import itertools
 import numpy as np
 from ase.geometry import complete_cell
@@ -195,36 +196,108 @@ def general_find_mic(v, cell, pbc=True):
     return vmin, vlen
 
 
-def find_mic(v, cell, pbc=True):
-    """Finds the minimum-image representation of vector(s) v using either one
-    of two find mic algorithms depending on the given cell, v and pbc."""
+class MinimumImage:
+    """Minimum-image convention for a fixed cell.
 
-    cell = Cell(cell)
-    pbc = cell.any(1) & pbc2pbc(pbc)
-    dim = np.sum(pbc)
-    v = np.asarray(v)
-    single = v.ndim == 1
-    v = np.atleast_2d(v)
-
-    if dim > 0:
-        naive_find_mic_is_safe = False
-        if dim == 3:
-            vmin, vlen = naive_find_mic(v, cell)
-            # naive find mic is safe only for the following condition
-            if (vlen < 0.5 * min(cell.lengths())).all():
-                naive_find_mic_is_safe = True  # hence skip Minkowski reduction
-
-        if not naive_find_mic_is_safe:
-            vmin, vlen = general_find_mic(v, cell, pbc=pbc)
-    else:
-        vmin = v.copy()
+    The inverse cell and, when needed, the Minkowski-reduced cell and its
+    Voronoi-relevant vectors are computed once, such that many batches of
+    vectors can be mapped to their minimum images cheaply.  Use this
+    instead of :func:`find_mic` when the same cell is used many times::
+
+        mic = MinimumImage(atoms.cell, atoms.pbc)
+        vmin, vlen = mic.find_mic(vectors)
+
+    :func:`find_mic` itself uses an LRU cache of these objects keyed on
+    the cell and pbc."""
+
+    def __init__(self, cell, pbc=True):
+        self.cell = Cell(cell)
+        self.pbc = self.cell.any(1) & pbc2pbc(pbc)
+        self.dim = np.sum(self.pbc)
+        self._general = None
+        if self.dim == 3:
+            self._icell = np.linalg.inv(self.cell.complete())
+            self._naive_max_length = 0.5 * min(self.cell.lengths())
+
+    def naive_find_mic(self, v):
+        """Minimum images with the naive algorithm, see naive_find_mic()."""
+        f = v @ self._icell
+        f -= np.floor(f + 0.5)
+        vmin = f @ self.cell.array
         vlen = np.linalg.norm(vmin, axis=1)
+        return vmin, vlen
 
-    if single:
-        return vmin[0], vlen[0]
-    else:
+    def general_find_mic(self, v):
+        """Minimum images for any cell, see general_find_mic()."""
+        if self._general is None:
+            rcell, _ = minkowski_reduce(complete_cell(self.cell),
+                                        pbc=self.pbc)
+            rcell = complete_cell(rcell)
+            # Voronoi-relevant vectors, see general_find_mic()
+            ranges = [np.arange(-1 * p, p + 1) for p in self.pbc]
+            hkls = np.array([(0, 0, 0)] + list(itertools.product(*ranges)))
+            self._general = (rcell, np.linalg.inv(rcell), hkls @ rcell)
+        rcell, ircell, vrvecs = self._general
+
+        # Wrap into the reduced cell as wrap_positions(..., eps=0)
+        f = v @ ircell
+        f[:, self.pbc] %= 1.0
+        positions = f @ rcell
+
+        x = positions + vrvecs[:, None]
+        lengths = np.linalg.norm(x, axis=2)
+        indices = np.argmin(lengths, axis=0)
+        vmin = x[indices, np.arange(len(positions)), :]
+        vlen = lengths[indices, np.arange(len(positions))]
         return vmin, vlen
 
+    def find_mic(self, v):
+        """Finds the minimum-image representation of vector(s) v.
+
+        Returns the vectors and their lengths like :func:`find_mic`."""
+        v = np.asarray(v)
+        single = v.ndim == 1
+        v = np.atleast_2d(v)
+
+        if self.dim > 0:
+            naive_find_mic_is_safe = False
+            if self.dim == 3:
+                vmin, vlen = self.naive_find_mic(v)
+                # naive find mic is safe only for the following condition
+                if (vlen < self._naive_max_length).all():
+                    naive_find_mic_is_safe = True  # hence skip Minkowski
+
+            if not naive_find_mic_is_safe:
+                vmin, vlen = self.general_find_mic(v)
+        else:
+            vmin = v.copy()
+            vlen = np.linalg.norm(vmin, axis=1)
+
+        if single:
+            return vmin[0], vlen[0]
+        else:
+            return vmin, vlen
+
+
+@functools.lru_cache(maxsize=32)
+def _cached_minimum_image(cell, pbc):
+    return MinimumImage(np.frombuffer(cell).reshape(3, 3), pbc)
+
+
+def get_minimum_image(cell, pbc=True):
+    """Return a, possibly cached, MinimumImage object for cell and pbc."""
+    cell = np.ascontiguousarray(cell, dtype=float)
+    if cell.shape != (3, 3):
+        return MinimumImage(cell, pbc)  # Let Cell complain
+    return _cached_minimum_image(cell.tobytes(),
+                                 tuple(bool(p) for p in pbc2pbc(pbc)))
+
+
+def find_mic(v, cell, pbc=True):
+    """Finds the minimum-image representation of vector(s) v using either one
+    of two find mic algorithms depending on the given cell, v and pbc."""
+    return get_minimum_image(cell, pbc).find_mic(v)
+
 
 def conditional_find_mic(vectors, cell, pbc):
     """Return list of vector arrays and corresponding list of vector lengths
@@ -394,6 +467,59 @@ def get_distances(p1, p2=None, cell=None, pbc=None):
     return D, D_len
 
 
+def get_pair_distances(p1, cutoff, p2=None, cell=None, pbc=None):
+    """Return distances shorter than cutoff as arrays of pairs.
+
+    This is a sparse alternative to :func:`get_distances` for large
+    systems, using :func:`ase.neighborlist.primitive_neighbor_list`.
+
+    If p2 is not set, pairs of different positions in p1 are returned in
+    both orders (i, j) and (j, i).  Otherwise i indexes p1 and j indexes p2.
+    With cell and pbc set, the minimum image convention is used, i.e. only
+    the shortest image of each pair is included.
+
+    Returns i, j, D and D_len, where D[k] = p2[j[k]] - p1[i[k]] (possibly
+    plus a lattice vector) and D_len[k] is its length.  The pairs are sorted
+    by i and then j.
+    """
+    from ase.neighborlist import primitive_neighbor_list
+
+    p1 = np.atleast_2d(np.asarray(p1, float))
+    n1 = len(p1)
+    if p2 is None:
+        positions = p1
+    else:
+        positions = np.concatenate((p1, np.atleast_2d(p2)))
+
+    if cell is None:
+        pbc = False
+    pbc = pbc2pbc(pbc)
+    if not pbc.any():
+        # Bin the positions in their bounding box
+        if len(positions):
+            positions = positions - positions.min(axis=0)
+        cell = np.diag(positions.max(axis=0, initial=0.0) + 1.0)
+
+    i, j, D, D_len = primitive_neighbor_list('ijDd', pbc, complete_cell(cell),
+                                             positions, cutoff)
+
+    if p2 is None:
+        # Images of the same position are not distances between positions
+        mask = i != j
+    else:
+        mask = (i < n1) & (j >= n1)
+    i, j, D, D_len = i[mask], j[mask], D[mask], D_len[mask]
+    if p2 is not None:
+        j -= n1
+
+    # Keep only the shortest image of each pair
+    order = np.lexsort((D_len, j, i))
+    i, j, D, D_len = i[order], j[order], D[order], D_len[order]
+    first = np.ones(len(i), bool)
+    first[1:] = (i[1:] != i[:-1]) | (j[1:] != j[:-1])
+    return i[first], j[first], D[first], D_len[first]
+
+
 def get_distances_derivatives(v0, cell=None, pbc=None):
     """Get derivatives of distances for all vectors in v0 w.r.t. Cartesian
     coordinates in Angstrom.
@@ -421,10 +547,10 @@ def get_duplicate_atoms(atoms, cutoff=0.1, delete=False):
     Identify all atoms which lie within the cutoff radius of each other.
     Delete one set of them if delete == True.
     """
-    from scipy.spatial.distance import pdist
-    dists = pdist(atoms.get_positions(), 'sqeuclidean')
-    dup = np.nonzero(dists < cutoff**2)
-    rem = np.array(_row_col_from_pdist(len(atoms), dup[0]))
+    # The neighbor list avoids the N^2 memory of all pair distances
+    i, j, _, _ = get_pair_distances(atoms.get_positions(), cutoff)
+    mask = i < j
+    rem = np.array([i[mask], j[mask]]).T.reshape(-1, 2)
     if delete:
         if rem.size != 0:
             del atoms[rem[:, 0]]
@@ -432,20 +558,6 @@ def get_duplicate_atoms(atoms, cutoff=0.1, delete=False):
         return rem
 
 
-def _row_col_from_pdist(dim, i):
-    """Calculate the i,j index in the square matrix for an index in a
-    condensed (triangular) matrix.
-    """
-    i = np.array(i)
-    b = 1 - 2 * dim
-    x = (np.floor((-b - np.sqrt(b**2 - 8 * i)) / 2)).astype(int)
-    y = (i + x * (b + x + 2) / 2 + 1).astype(int)
-    if i.shape:
-        return list(zip(x, y))
-    else:
-        return [(x, y)]
-
-
 def permute_axes(atoms, permutation):
     """Permute axes of unit cell and atom positions. Considers only cell and
     atomic positions. Other vector quantities such as momenta are not
@@ -2,8 +2,10 @@ import math
 from typing import List, Optional, Tuple, Union
 
 import numpy as np
+
 from ase import Atoms
 from ase.cell import Cell
+from ase.geometry.geometry import get_pair_distances
 
 
 class CellTooSmall(Exception):
@@ -38,10 +40,13 @@ def get_rdf(atoms: Atoms, rmax: float, nbins: int,
     nbins : int
         Number of bins to divide the rdf into.
 
-    distance_matrix : numpy.array
+    distance_matrix : numpy.array or scipy.sparse matrix
         An array of distances between atoms, typically
-        obtained by atoms.get_all_distances().
-        Default None meaning that it will be calculated.
+        obtained by atoms.get_all_distances().  A sparse matrix, e.g. from
+        atoms.get_all_distances(mic=True, cutoff=rmax), must contain
+        all distances up to rmax.
+        Default None meaning that the distances up to rmax will be
+        calculated with a neighbor list.
 
     elements : list or tuple
         List of two atomic numbers. If elements is not None the partial
@@ -63,34 +68,58 @@ def get_rdf(atoms: Atoms, rmax: float, nbins: int,
     check_cell_and_r_max(atoms, rmax)
 
     dm = distance_matrix
+    pairs = None
     if dm is None:
-        dm = atoms.get_all_distances(mic=True)
+        # Pairs with distances up to and including rmax
+        cutoff = np.nextafter(rmax, np.inf)
+        i, j, _, d = get_pair_distances(atoms.positions, cutoff,
+                                        cell=atoms.cell, pbc=atoms.pbc)
+        pairs = i, j, d
+    elif not isinstance(dm, np.ndarray):
+        from scipy.sparse import issparse
+        if issparse(dm):
+            dm = dm.tocoo()
+            pairs = dm.row, dm.col, dm.data
 
     rdf = np.zeros(nbins + 1)
     dr = float(rmax / nbins)
-
-    indices = np.asarray(np.ceil(dm / dr), dtype=int)
     natoms = len(atoms)
 
+    if pairs is not None:
+        i, j, d = pairs
+        if elements is None:
+            mask = i < j
+        else:
+            mask = ((atoms.numbers[i] == elements[0]) &
+                    (atoms.numbers[j] == elements[1]) & (i != j))
+        indices = np.asarray(np.ceil(d[mask] / dr), dtype=int)
+        rdf += np.bincount(indices[indices <= nbins], minlength=nbins + 1)
+    else:
+        # A dense distance matrix was given
+        assert dm is not None
+        indices = np.asarray(np.ceil(dm / dr), dtype=int)
+
     if elements is None:
         # Coefficients to use for normalization
         phi = natoms / vol
         norm = 2.0 * math.pi * dr * phi * len(atoms)
 
-        indices_triu = np.triu(indices)
-        for index in range(nbins + 1):
-            rdf[index] = np.count_nonzero(indices_triu == index)
+        if pairs is None:
+            indices_triu = np.triu(indices)
+            for index in range(nbins + 1):
+                rdf[index] = np.count_nonzero(indices_triu == index)
 
     else:
         i_indices = np.where(atoms.numbers == elements[0])[0]
         phi = len(i_indices) / vol
         norm = 4.0 * math.pi * dr * phi * natoms
 
-        for i in i_indices:
-            for j in np.where(atoms.numbers == elements[1])[0]:
-                index = indices[i, j]
-                if index <= nbins:
-                    rdf[index] += 1
+        if pairs is None:
+            for i in i_indices:
+                for j in np.where(atoms.numbers == elements[1])[0]:
+                    index = indices[i, j]
+                    if index <= nbins:
+                        rdf[index] += 1
 
     rr = np.arange(dr / 2, rmax, dr)
     rdf[1:] /= norm * (rr * rr + (dr * dr / 12))
@@ -1,7 +1,11 @@
-from ase.io.trajectory import Trajectory, PickleTrajectory
-from ase.io.bundletrajectory import BundleTrajectory
-from ase.io.netcdftrajectory import NetCDFTrajectory
-from ase.io.formats import read, iread, write, string2index
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ase.io.trajectory import Trajectory, PickleTrajectory
+    from ase.io.bundletrajectory import BundleTrajectory
+    from ase.io.netcdftrajectory import NetCDFTrajectory
+    from ase.io.formats import (read, iread, iread_many, write,
+                                string2index)
 
 
 class ParseError(Exception):
@@ -10,5 +14,33 @@ class ParseError(Exception):
 
 __all__ = [
     'Trajectory', 'PickleTrajectory', 'BundleTrajectory', 'NetCDFTrajectory',
-    'read', 'iread', 'write', 'string2index'
+    'read', 'iread', 'iread_many', 'write', 'string2index'
 ]
+
+# The modules are only imported when the names are first used, such that
+# importing a submodule, e.g. ase.io.jsonio, does not import all of them
+_lazy_imports = {
+    'Trajectory': 'ase.io.trajectory',
+    'PickleTrajectory': 'ase.io.trajectory',
+    'BundleTrajectory': 'ase.io.bundletrajectory',
+    'NetCDFTrajectory': 'ase.io.netcdftrajectory',
+    'read': 'ase.io.formats',
+    'iread': 'ase.io.formats',
+    'iread_many': 'ase.io.formats',
+    'write': 'ase.io.formats',
+    'string2index': 'ase.io.formats'}
+
+
+def __getattr__(name):
+    if name in _lazy_imports:
+        # __import__() instead of importlib.import_module() such that the
+        # import shows up in "python -X importtime"
+        module = __import__(_lazy_imports[name], fromlist=[name])
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
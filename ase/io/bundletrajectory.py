@@ -18,12 +18,31 @@ so this text needs updating::
         F1 (dir)
 
 There is a folder for each frame, and the data is in the ASE Ulm format.
+
+With the 'column' backend there are no frame folders.  Instead, each
+array is appended to a single file for all frames, in compressed chunks
+of several frames::
+
+    filename.bundle (dir)
+        metadata.json
+        frames
+        columns (dir)
+            smalldata.jsonl    Small data structures, one line per frame
+            positions.dat      Compressed chunks of positions
+            positions.idx      Index of the chunks (one line per chunk)
+            ...
+
+This keeps the number of files independent of the number of frames,
+and the time series of a property can be read without reading the
+frames one by one, see BundleTrajectory.read_time_series().
 """
 
+import lzma
 import os
 import sys
 import shutil
 import time
+import zlib
 from pathlib import Path
 
 import numpy as np
@@ -34,6 +53,7 @@ from ase import Atoms
 from ase.io import jsonio
 from ase.io.ulm import open as ulmopen
 from ase.parallel import paropen, world, barrier
+from ase.constraints import dict2constraint
 from ase.calculators.singlepoint import (SinglePointCalculator,
                                          PropertyNotImplementedError)
 
@@ -69,16 +89,25 @@ class BundleTrajectory:
         Use backup=False to disable renaming of an existing file.
 
     backend='ulm':
-        Request a backend.  Currently only 'ulm' is supported.
-        Only honored when writing.
+        Request a backend, 'ulm' (a folder per frame) or 'column'
+        (a compressed file per array).  Only honored when writing.
 
     singleprecision=False:
-        Store floating point data in single precision (ulm backend only).
+        Store floating point data in single precision.
+
+    compression='zlib':
+        Compression of the 'column' backend: 'zlib', 'lzma' or None.
+
+    chunksize=16:
+        Number of frames compressed together by the 'column' backend.
+        Frames are only written to disk when a chunk is complete or the
+        trajectory is closed.
     """
     slavelog = True  # Log from all nodes
 
     def __init__(self, filename, mode='r', atoms=None, backup=True,
-                 backend='ulm', singleprecision=False):
+                 backend='ulm', singleprecision=False, compression='zlib',
+                 chunksize=16):
         self.state = 'constructing'
         self.filename = filename
         self.pre_observers = []  # callback functions before write is performed
@@ -86,6 +115,8 @@ class BundleTrajectory:
         self.master = world.rank == 0
         self.extra_data = []
         self.singleprecision = singleprecision
+        self.compression = compression
+        self.chunksize = chunksize
         self._set_defaults()
         if mode == 'r':
             if atoms is not None:
@@ -120,6 +151,12 @@ class BundleTrajectory:
 
         if self.backend_name == 'ulm':
             self.backend = UlmBundleBackend(self.master, self.singleprecision)
+        elif self.backend_name == 'column':
+            self.backend = ColumnBundleBackend(self.master,
+                                               self.singleprecision,
+                                               self.filename,
+                                               self.compression,
+                                               self.chunksize)
         else:
             raise NotImplementedError(
                 'This version of ASE cannot use BundleTrajectory '
@@ -334,7 +371,9 @@ class BundleTrajectory:
         data = {}
         data['pbc'] = smalldata['pbc']
         data['cell'] = smalldata['cell']
-        data['constraint'] = smalldata['constraints']
+        # The constraints are stored as dictionaries
+        data['constraint'] = [dict2constraint(c) if isinstance(c, dict)
+                              else c for c in smalldata['constraints']]
         if self.subtype == 'split':
             self.backend.set_fragments(smalldata['fragments'])
             self.atom_id, dummy = self.backend.read_split(framedir, 'ID')
@@ -385,6 +424,40 @@ class BundleTrajectory:
         framezero = os.path.join(self.filename, 'F0')
         return self._read_data(framezero, framedir, name, self.atom_id)
 
+    def read_time_series(self, name, indices=slice(None)):
+        """Read an array of all frames at once.
+
+        name: str
+            Name of data written in every frame, e.g. 'positions',
+            'momenta' or 'forces'.
+        indices: int, list or slice
+            Atoms for which the data is read.  Default is all atoms.
+
+        Returns an array with the frames along the first axis.  With the
+        'column' backend only the compressed chunks of the array are read,
+        instead of every frame of the trajectory.
+        """
+        if self.state != 'read':
+            raise IOError('Cannot read in %s mode' % (self.state,))
+        if self.datatypes.get(name) is not True:
+            raise ValueError('%s is not stored in every frame' % (name,))
+        if self.subtype == 'normal' and hasattr(self.backend, 'read_series'):
+            return self.backend.read_series(name, indices)[:self.nframes]
+        series = []
+        for n in range(self.nframes):
+            framedir = os.path.join(self.filename, 'F' + str(n))
+            if name == 'forces':
+                data = self.backend.read(framedir, name)
+            else:
+                atom_id = None
+                if self.subtype == 'split':
+                    self.backend.set_fragments(
+                        self.backend.read_small(framedir)['fragments'])
+                    atom_id, dummy = self.backend.read_split(framedir, 'ID')
+                data = self._read_data(None, framedir, name, atom_id)
+            series.append(data[indices])
+        return np.array(series)
+
     def _read_data(self, f0, f, name, atom_id):
         "Read single data item."
 
@@ -484,10 +557,13 @@ class BundleTrajectory:
                 'This version of ASE cannot read BundleTrajectory subtype ' +
                 metadata['subtype'])
         self.subtype = metadata['subtype']
-        if metadata['backend'] == 'ulm':
-            self.singleprecision = metadata['ulm.singleprecision']
+        self._set_backend_parameters(metadata)
         self._set_backend(metadata['backend'])
         self.nframes = self._read_nframes()
+        if not self.backend.framedirs:
+            # The last frames may not be stored yet if the bundle is
+            # still being written
+            self.nframes = min(self.nframes, self.backend.count_frames())
         if self.nframes == 0:
             raise IOError('Empty BundleTrajectory')
         self.datatypes = metadata['datatypes']
@@ -521,8 +597,7 @@ class BundleTrajectory:
                 'This version of ASE cannot append to BundleTrajectory '
                 'subtype ' + metadata['subtype'])
         self.subtype = metadata['subtype']
-        if metadata['backend'] == 'ulm':
-            self.singleprecision = metadata['ulm.singleprecision']
+        self._set_backend_parameters(metadata)
         self._set_backend(metadata['backend'])
         self.nframes = self._read_nframes()
         self._open_log()
@@ -531,6 +606,15 @@ class BundleTrajectory:
         self.state = 'write'
         self.atoms = atoms
 
+    def _set_backend_parameters(self, metadata):
+        "Set the parameters of the backend from the metadata."
+        if metadata['backend'] == 'ulm':
+            self.singleprecision = metadata['ulm.singleprecision']
+        elif metadata['backend'] == 'column':
+            self.singleprecision = metadata['column.singleprecision']
+            self.compression = metadata['column.compression']
+            self.chunksize = metadata['column.chunksize']
+
     @property
     def path(self):
         return Path(self.filename)
@@ -562,6 +646,10 @@ class BundleTrajectory:
         metadata['backend'] = self.backend_name
         if self.backend_name == 'ulm':
             metadata['ulm.singleprecision'] = self.singleprecision
+        elif self.backend_name == 'column':
+            metadata['column.singleprecision'] = self.singleprecision
+            metadata['column.compression'] = self.compression
+            metadata['column.chunksize'] = self.chunksize
         metadata['python_ver'] = tuple(sys.version_info)
         encode = jsonio.MyEncoder(indent=4).encode
         fido = encode(metadata)
@@ -668,10 +756,11 @@ class BundleTrajectory:
         """Make subdirectory for the frame.
 
         As only the master writes to it, no synchronization between
-        MPI tasks is necessary.
+        MPI tasks is necessary.  Backends storing all frames together
+        get the name of the frame, but no directory is made.
         """
         framedir = os.path.join(self.filename, 'F' + str(frame))
-        if self.master:
+        if self.master and self.backend.framedirs:
             self.log('Making directory ' + framedir)
             os.mkdir(framedir)
         return framedir
@@ -712,6 +801,9 @@ class BundleTrajectory:
 class UlmBundleBackend:
     """Backend for BundleTrajectories stored as ASE Ulm files."""
 
+    # The data of each frame is stored in its own directory
+    framedirs = True
+
     def __init__(self, master, singleprecision):
         # Store if this backend will actually write anything
         self.writesmall = master
@@ -864,6 +956,261 @@ class UlmBundleBackend:
         pass
 
 
+class ColumnBundleBackend:
+    """Backend for BundleTrajectories with a compressed file per array.
+
+    The frames are collected in chunks of chunksize frames, which are
+    compressed and appended to the file of the array.  Before compressing,
+    the bytes of the numbers are reordered as in the shuffle filter of
+    HDF5.  A line with the
+    first frame, number of frames, position, size, data types and shape
+    of each chunk is appended to an index file.  The chunks of all
+    arrays end at the same frames, and the small data of a chunk is
+    written after its arrays, such that the number of lines of small
+    data is the number of frames which can be read.
+
+    As with the Ulm backend, the fragments of split data are written to
+    separate files by each MPI task."""
+
+    # All frames are stored together, no directory is made for each frame
+    framedirs = False
+
+    compressors = {'zlib': (zlib.compress, zlib.decompress),
+                   'lzma': (lzma.compress, lzma.decompress),
+                   None: (bytes, bytes)}
+
+    def __init__(self, master, singleprecision, bundledir,
+                 compression='zlib', chunksize=16):
+        if compression not in self.compressors:
+            raise ValueError('Unknown compression: %s' % (compression,))
+        # Store if this backend will actually write anything
+        self.writesmall = master
+        self.writelarge = master
+        self.singleprecision = singleprecision
+        self.compress, self.decompress = self.compressors[compression]
+        self.chunksize = chunksize
+        self.columndir = os.path.join(bundledir, 'columns')
+        self.pending = {}  # Frames of each array not written yet
+        self.pending_small = []
+        self.chunks = {}  # Index of the chunks of each array
+        self.cached_chunk = {}  # Last chunk read of each array
+        self.smalldata = []
+        self.smalldata_size = 0
+
+    @staticmethod
+    def _frame(framedir):
+        "Get the frame number from the name of the frame directory."
+        return int(os.path.basename(framedir)[1:])
+
+    def _path(self, name, suffix):
+        return os.path.join(self.columndir, name + suffix)
+
+    def write_small(self, framedir, smalldata):
+        "Write small data to be written jointly."
+        if self._frame(framedir) % self.chunksize == 0:
+            # The previous chunk is complete.  Arrays not written in all
+            # of its frames, e.g. the atomic numbers, are still pending.
+            for name in list(self.pending):
+                self._flush(name)
+            if self.writesmall:
+                self._flush_small()
+        if self.writesmall:
+            # The cell is stored as an array, as by the Ulm backend
+            smalldata = dict(smalldata, cell=np.asarray(smalldata['cell']))
+            self.pending_small.append(jsonio.encode(smalldata))
+
+    def _flush_small(self):
+        if self.pending_small:
+            os.makedirs(self.columndir, exist_ok=True)
+            with open(self._path('smalldata', '.jsonl'), 'a') as fd:
+                fd.write('\n'.join(self.pending_small) + '\n')
+            self.pending_small = []
+
+    def write(self, framedir, name, data):
+        "Write data to the column of the array."
+        if not self.writelarge:
+            return
+        frame = self._frame(framedir)
+        data = np.asarray(data)
+        pending = self.pending.get(name)
+        if pending is not None:
+            first, arrays = pending
+            if (first + len(arrays) != frame or
+                    arrays[0].shape != data.shape or
+                    arrays[0].dtype != data.dtype):
+                self._flush(name)
+                pending = None
+        if pending is None:
+            self.pending[name] = pending = (frame, [])
+        pending[1].append(data)
+        if (frame + 1) % self.chunksize == 0:
+            self._flush(name)
+
+    def _flush(self, name):
+        first, arrays = self.pending.pop(name)
+        data = np.array(arrays)
+        dtype = stored_as = str(data.dtype)
+        if data.dtype == np.float64 and self.singleprecision:
+            # Downconvert double to single precision
+            stored_as = 'float32'
+            data = data.astype(np.float32)
+        compressed = self.compress(self._shuffle(data))
+        os.makedirs(self.columndir, exist_ok=True)
+        # The chunk is written before its index line, such that the index
+        # only refers to complete chunks
+        with open(self._path(name, '.dat'), 'ab') as fd:
+            offset = fd.tell()
+            fd.write(compressed)
+        shape = ','.join(str(n) for n in data.shape[1:])
+        with open(self._path(name, '.idx'), 'a') as fd:
+            fd.write('%d %d %d %d %s %s %s\n'
+                     % (first, len(arrays), offset, len(compressed),
+                        dtype, stored_as, shape))
+
+    def _shuffle(self, data):
+        """Get the bytes of data with the first bytes of all numbers first,
+        then all the second bytes etc., which compresses much better."""
+        data = np.ascontiguousarray(data)
+        if self.compress is bytes:
+            return data.tobytes()
+        return data.view(np.uint8).reshape(-1, data.itemsize).T.tobytes()
+
+    def _unshuffle(self, buf, dtype):
+        data = np.frombuffer(buf, np.uint8)
+        if self.decompress is not bytes:
+            data = data.reshape(dtype.itemsize, -1).T.copy()
+        return data.view(dtype).ravel()
+
+    def _read_index(self, name):
+        "Read the index of the chunks of an array."
+        chunks = []
+        path = self._path(name, '.idx')
+        if os.path.exists(path):
+            with open(path) as fd:
+                for line in fd:
+                    words = line.split()
+                    first, nframes, offset, nbytes = map(int, words[:4])
+                    shape = ()
+                    if len(words) > 6:
+                        shape = tuple(int(n) for n in words[6].split(','))
+                    chunks.append((first, nframes, offset, nbytes,
+                                   words[4], words[5], shape))
+        self.chunks[name] = chunks
+        return chunks
+
+    def _find_chunk(self, name, frame):
+        chunks = self.chunks.get(name)
+        if chunks is None or frame >= chunks[-1][0] + chunks[-1][1]:
+            # The bundle may still be growing
+            chunks = self._read_index(name)
+        for chunk in chunks:
+            if chunk[0] <= frame < chunk[0] + chunk[1]:
+                return chunk
+        return None
+
+    def _read_chunk(self, name, chunk):
+        cached = self.cached_chunk.get(name)
+        if cached is not None and cached[0] == chunk:
+            return cached[1]
+        first, nframes, offset, nbytes, dtype, stored_as, shape = chunk
+        with open(self._path(name, '.dat'), 'rb') as fd:
+            fd.seek(offset)
+            data = self._unshuffle(self.decompress(fd.read(nbytes)),
+                                   np.dtype(stored_as))
+        data = data.reshape((nframes,) + shape).astype(dtype, copy=False)
+        self.cached_chunk[name] = (chunk, data)
+        return data
+
+    def count_frames(self):
+        "Number of frames of which all data has been written."
+        return len(self._read_smalldata())
+
+    def _read_smalldata(self):
+        "Read the lines of small data which have not been read yet."
+        path = self._path('smalldata', '.jsonl')
+        if os.path.exists(path):
+            with open(path, 'rb') as fd:
+                fd.seek(self.smalldata_size)
+                for line in fd:
+                    if not line.endswith(b'\n'):
+                        break
+                    self.smalldata.append(line)
+                    self.smalldata_size += len(line)
+        return self.smalldata
+
+    def read_small(self, framedir):
+        "Read small data."
+        frame = self._frame(framedir)
+        if frame >= len(self.smalldata):
+            self._read_smalldata()
+        return jsonio.decode(self.smalldata[frame].decode())
+
+    def exists(self, framedir, name):
+        return self._find_chunk(name, self._frame(framedir)) is not None
+
+    def read(self, framedir, name):
+        "Read data of one frame from the column of the array."
+        frame = self._frame(framedir)
+        chunk = self._find_chunk(name, frame)
+        if chunk is None:
+            raise IOError('No %s data in frame %d' % (name, frame))
+        return self._read_chunk(name, chunk)[frame - chunk[0]].copy()
+
+    def read_series(self, name, indices=slice(None)):
+        "Read data of all frames, optionally only for some atoms."
+        series = [self._read_chunk(name, chunk)[:, indices]
+                  for chunk in self._read_index(name)]
+        return np.concatenate(series)
+
+    def read_info(self, framedir, name, split=None):
+        """Read information about file contents without reading the data.
+
+        Information is a dictionary containing as aminimum the shape and
+        type.
+        """
+        frame = self._frame(framedir)
+        if split is None or self.exists(framedir, name):
+            names = [name]
+        else:
+            names = [name + '_' + str(i) for i in range(split)]
+        info = dict()
+        for name in names:
+            chunk = self._find_chunk(name, frame)
+            if not info:
+                info['shape'] = list(chunk[6])
+                info['type'] = chunk[4]
+                info['stored_as'] = chunk[5]
+            else:
+                info['shape'][0] += chunk[6][0]
+        info['shape'] = tuple(info['shape'])
+        return info
+
+    def set_fragments(self, nfrag):
+        self.nfrag = nfrag
+
+    def read_split(self, framedir, name):
+        """Read data from multiple columns.
+
+        Falls back to reading from a single column if that is how data is
+        stored.  Returns the data and False or the segment lengths, as
+        UlmBundleBackend.read_split().
+        """
+        if self.exists(framedir, name):
+            # Not stored in split form!
+            return (self.read(framedir, name), False)
+        data = [self.read(framedir, name + '_%d' % (i,))
+                for i in range(self.nfrag)]
+        seglengths = [len(d) for d in data]
+        return (np.concatenate(data), seglengths)
+
+    def close(self, log=None):
+        """Write the frames of the last, incomplete chunk."""
+        for name in list(self.pending):
+            self._flush(name)
+        if self.writesmall:
+            self._flush_small()
+
+
 def read_bundletrajectory(filename, index=-1):
     """Reads one or more atoms objects from a BundleTrajectory.
 
@@ -881,18 +1228,19 @@ def read_bundletrajectory(filename, index=-1):
         yield traj[i]
 
 
-def write_bundletrajectory(filename, images, append=False):
+def write_bundletrajectory(filename, images, append=False, **kwargs):
     """Write image(s) to a BundleTrajectory.
 
     Write also energy, forces, and stress if they are already
-    calculated.
+    calculated.  Remaining keyword arguments, e.g. backend='column', are
+    passed on to BundleTrajectory.
     """
 
     if append:
         mode = 'a'
     else:
         mode = 'w'
-    traj = BundleTrajectory(filename, mode=mode)
+    traj = BundleTrajectory(filename, mode=mode, **kwargs)
 
     if hasattr(images, 'get_positions'):
         images = [images]
@@ -940,6 +1288,9 @@ def print_bundletrajectory_info(filename):
     # Look at first frame
     if metadata['backend'] == 'ulm':
         backend = UlmBundleBackend(True, False)
+    elif metadata['backend'] == 'column':
+        backend = ColumnBundleBackend(True, False, filename,
+                                      metadata['column.compression'])
     else:
         raise NotImplementedError('Backend %s not supported.'
                                   % (metadata['backend'],))
@@ -9,7 +9,9 @@ Contributed by James Kermode <james.kermode@gmail.com>
 """
 
 
-from itertools import islice
+import functools
+from collections import deque
+from itertools import chain, islice
 import re
 import warnings
 from io import StringIO, UnsupportedOperation
@@ -603,7 +605,50 @@ iread_xyz = ImageIterator(ixyzchunks)
 
 
 @reader
-def read_xyz(fileobj, index=-1, properties_parser=key_val_str_to_dict):
+def index_xyz(fileobj, last_frame=None):
+    """Find where the frames of an (extended) XYZ file start.
+
+    Returns a list of (position, natoms, nvec) tuples, where position is
+    the ``fileobj.tell()`` position of the frame and nvec the number of
+    VEC lines after the atoms.  The file is read from its current position
+    until after last_frame if given.  The list can be passed to
+    :func:`read_xyz` for files opened in the same way, which then skips
+    the scan."""
+    frames = []
+    while True:
+        frame_pos = fileobj.tell()
+        line = fileobj.readline()
+        if line.strip() == '':
+            break
+        try:
+            natoms = int(line)
+        except ValueError as err:
+            raise XYZError('ase.io.extxyz: Expected xyz header but got: {}'
+                           .format(err))
+        fileobj.readline()  # read comment line
+        for i in range(natoms):
+            fileobj.readline()
+        # check for VEC
+        nvec = 0
+        while True:
+            lastPos = fileobj.tell()
+            line = fileobj.readline()
+            if line.lstrip().startswith('VEC'):
+                nvec += 1
+                if nvec > 3:
+                    raise XYZError('ase.io.extxyz: More than 3 VECX entries')
+            else:
+                fileobj.seek(lastPos)
+                break
+        frames.append((frame_pos, natoms, nvec))
+        if last_frame is not None and len(frames) > last_frame:
+            break
+    return frames
+
+
+@reader
+def read_xyz(fileobj, index=-1, properties_parser=key_val_str_to_dict,
+             frames=None):
     r"""
     Read from a file in Extended XYZ format
 
@@ -611,7 +656,8 @@ def read_xyz(fileobj, index=-1, properties_parser=key_val_str_to_dict):
     properties_parser is the parse to use when converting the properties line
     to a dictionary, ``extxyz.key_val_str_to_dict`` is the default and can
     deal with most use cases, ``extxyz.key_val_str_to_dict_regex`` is slightly
-    faster but has fewer features.
+    faster but has fewer features.  frames is the list of frame positions
+    returned by :func:`index_xyz` for the same file, if already known.
 
     Extended XYZ format is an enhanced version of the `basic XYZ format
     <http://en.wikipedia.org/wiki/XYZ_file_format>`_ that allows extra
@@ -728,41 +774,13 @@ def read_xyz(fileobj, index=-1, properties_parser=key_val_str_to_dict):
         if index.stop is not None and index.stop >= 0:
             last_frame = index.stop
 
-    # scan through file to find where the frames start
-    try:
-        fileobj.seek(0)
-    except UnsupportedOperation:
-        fileobj = StringIO(fileobj.read())
-        fileobj.seek(0)
-    frames = []
-    while True:
-        frame_pos = fileobj.tell()
-        line = fileobj.readline()
-        if line.strip() == '':
-            break
+    if frames is None:
+        # scan through file to find where the frames start
         try:
-            natoms = int(line)
-        except ValueError as err:
-            raise XYZError('ase.io.extxyz: Expected xyz header but got: {}'
-                           .format(err))
-        fileobj.readline()  # read comment line
-        for i in range(natoms):
-            fileobj.readline()
-        # check for VEC
-        nvec = 0
-        while True:
-            lastPos = fileobj.tell()
-            line = fileobj.readline()
-            if line.lstrip().startswith('VEC'):
-                nvec += 1
-                if nvec > 3:
-                    raise XYZError('ase.io.extxyz: More than 3 VECX entries')
-            else:
-                fileobj.seek(lastPos)
-                break
-        frames.append((frame_pos, natoms, nvec))
-        if last_frame is not None and len(frames) > last_frame:
-            break
+            fileobj.seek(0)
+        except UnsupportedOperation:
+            fileobj = StringIO(fileobj.read())
+        frames = index_xyz(fileobj, last_frame)
 
     trbl = index2range(index, len(frames))
 
@@ -774,11 +792,13 @@ def read_xyz(fileobj, index=-1, properties_parser=key_val_str_to_dict):
         yield _read_xyz_frame(fileobj, natoms, properties_parser, nvec)
 
 
-def output_column_format(atoms, columns, arrays,
-                         write_info=True, results=None):
-    """
-    Helper function to build extended XYZ comment line
-    """
+@functools.lru_cache(maxsize=64)
+def _column_format(schema):
+    """Properties string, column counts, dtype and row format for a schema.
+
+    The schema is a tuple of (column, dtype, shape) for each column,
+    where shape excludes the number of atoms.  It is the same for all
+    frames with the same arrays, so the formats are only worked out once."""
     fmt_map = {'d': ('R', '%16.8f'),
                'f': ('R', '%16.8f'),
                'i': ('I', '%8d'),
@@ -787,34 +807,23 @@ def output_column_format(atoms, columns, arrays,
                'U': ('S', '%-2s'),
                'b': ('L', ' %.1s')}
 
-    # NB: Lattice is stored as tranpose of ASE cell,
-    # with Fortran array ordering
-    lattice_str = ('Lattice="'
-                   + ' '.join([str(x) for x in np.reshape(atoms.cell.T,
-                                                          9, order='F')]) +
-                   '"')
-
     property_names = []
     property_types = []
     property_ncols = []
     dtypes = []
     formats = []
 
-    for column in columns:
-        array = arrays[column]
-        dtype = array.dtype
-
+    for column, dtype, shape in schema:
         property_name = PROPERTY_NAME_MAP.get(column, column)
         property_type, fmt = fmt_map[dtype.kind]
         property_names.append(property_name)
         property_types.append(property_type)
 
-        if (len(array.shape) == 1
-                or (len(array.shape) == 2 and array.shape[1] == 1)):
+        if len(shape) == 0 or (len(shape) == 1 and shape[0] == 1):
             ncol = 1
             dtypes.append((column, dtype))
         else:
-            ncol = array.shape[1]
+            ncol = shape[0]
             for c in range(ncol):
                 dtypes.append((column + str(c), dtype))
 
@@ -826,6 +835,28 @@ def output_column_format(atoms, columns, arrays,
                               property_types,
                               [str(nc) for nc in property_ncols])])
 
+    dtype = np.dtype(dtypes)
+    fmt = ' '.join(formats) + '\n'
+
+    return props_str, property_ncols, dtype, fmt
+
+
+def output_column_format(atoms, columns, arrays,
+                         write_info=True, results=None):
+    """
+    Helper function to build extended XYZ comment line
+    """
+    # NB: Lattice is stored as tranpose of ASE cell,
+    # with Fortran array ordering
+    lattice_str = ('Lattice="'
+                   + ' '.join([str(x) for x in np.reshape(atoms.cell.T,
+                                                          9, order='F')]) +
+                   '"')
+
+    schema = tuple((column, arrays[column].dtype, arrays[column].shape[1:])
+                   for column in columns)
+    props_str, property_ncols, dtype, fmt = _column_format(schema)
+
     comment_str = ''
     if atoms.cell.any():
         comment_str += lattice_str + ' '
@@ -839,16 +870,182 @@ def output_column_format(atoms, columns, arrays,
     info['pbc'] = atoms.get_pbc()  # always save periodic boundary conditions
     comment_str += ' ' + key_val_dict_to_str(info)
 
-    dtype = np.dtype(dtypes)
-    fmt = ' '.join(formats) + '\n'
+    return comment_str, list(property_ncols), dtype, fmt
+
+
+def _format_rows(fmt, columns, ncols, arrays, natoms):
+    """Format the per-atom lines of a frame.
 
-    return comment_str, property_ncols, dtype, fmt
+    The values are converted column by column to Python scalars and the
+    rows are formatted with a single template, which is much faster than
+    indexing a record array atom by atom."""
+    values = []
+    for column, ncol in zip(columns, ncols):
+        value = np.asarray(arrays[column])
+        if ncol == 1:
+            values.append(value.reshape(natoms).tolist())
+        else:
+            values.extend(value[:, c].tolist() for c in range(ncol))
+    return ''.join(map(fmt.__mod__, zip(*values)))
+
+
+def _format_xyz_frame(atoms, columns, comment, write_info, write_results,
+                      plain, vec_cell, constraints):
+    """Return one frame in extended XYZ format as a string.
+
+    constraints are those used for the move_mask column."""
+    natoms = len(atoms)
+
+    if columns is None:
+        fr_cols = None
+    else:
+        fr_cols = columns[:]
+
+    if fr_cols is None:
+        fr_cols = (['symbols', 'positions']
+                   + [key for key in atoms.arrays.keys() if
+                      key not in ['symbols', 'positions', 'numbers',
+                                  'species', 'pos']])
+
+    if plain:
+        fr_cols = ['symbols', 'positions']
+
+    per_frame_results = {}
+    per_atom_results = {}
+    if write_results:
+        calculator = atoms.calc
+        if (calculator is not None
+                and isinstance(calculator, BaseCalculator)):
+            for key in all_properties:
+                value = calculator.results.get(key, None)
+                if value is None:
+                    # skip missing calculator results
+                    continue
+                if (key in per_atom_properties and len(value.shape) >= 1
+                        and value.shape[0] == len(atoms)):
+                    # per-atom quantities (forces, energies, stresses)
+                    per_atom_results[key] = value
+                elif key in per_config_properties:
+                    # per-frame quantities (energy, stress)
+                    # special case for stress, which should be converted
+                    # to 3x3 matrices before writing
+                    if key == 'stress':
+                        xx, yy, zz, yz, xz, xy = value
+                        value = np.array(
+                            [(xx, xy, xz), (xy, yy, yz), (xz, yz, zz)])
+                    per_frame_results[key] = value
+
+    # Move symbols and positions to first two properties
+    if 'symbols' in fr_cols:
+        i = fr_cols.index('symbols')
+        fr_cols[0], fr_cols[i] = fr_cols[i], fr_cols[0]
+
+    if 'positions' in fr_cols:
+        i = fr_cols.index('positions')
+        fr_cols[1], fr_cols[i] = fr_cols[i], fr_cols[1]
+
+    # Check first column "looks like" atomic symbols
+    if fr_cols[0] in atoms.arrays:
+        symbols = atoms.arrays[fr_cols[0]]
+    else:
+        symbols = atoms.get_chemical_symbols()
+
+    if natoms > 0 and not isinstance(symbols[0], str):
+        raise ValueError('First column must be symbols-like')
+
+    # Check second column "looks like" atomic positions
+    pos = atoms.arrays[fr_cols[1]]
+    if pos.shape != (natoms, 3) or pos.dtype.kind != 'f':
+        raise ValueError('Second column must be position-like')
+
+    # if vec_cell add cell information as pseudo-atoms
+    if vec_cell:
+        pbc = list(atoms.get_pbc())
+        cell = atoms.get_cell()
+
+        if True in pbc:
+            nPBC = 0
+            for i, b in enumerate(pbc):
+                if b:
+                    nPBC += 1
+                    symbols.append('VEC' + str(nPBC))
+                    pos = np.vstack((pos, cell[i]))
+            # add to natoms
+            natoms += nPBC
+            if pos.shape != (natoms, 3) or pos.dtype.kind != 'f':
+                raise ValueError(
+                    'Pseudo Atoms containing cell have bad coords')
+
+    # Move mask
+    if 'move_mask' in fr_cols:
+        cnstr = constraints
+        if len(cnstr) > 0:
+            c0 = cnstr[0]
+            if isinstance(c0, FixAtoms):
+                cnstr = np.ones((natoms,), dtype=bool)
+                for idx in c0.index:
+                    cnstr[idx] = False
+            elif isinstance(c0, FixCartesian):
+                masks = np.ones((natoms, 3), dtype=bool)
+                for i in range(len(cnstr)):
+                    idx = cnstr[i].index
+                    masks[idx] = cnstr[i].mask
+                cnstr = masks
+        else:
+            fr_cols.remove('move_mask')
+
+    # Collect data to be written out
+    arrays = {}
+    for column in fr_cols:
+        if column == 'positions':
+            arrays[column] = pos
+        elif column in atoms.arrays:
+            arrays[column] = atoms.arrays[column]
+        elif column == 'symbols':
+            arrays[column] = np.array(symbols)
+        elif column == 'move_mask':
+            arrays[column] = cnstr
+        else:
+            raise ValueError('Missing array "%s"' % column)
+
+    if write_results:
+        for key in per_atom_results:
+            if key not in fr_cols:
+                fr_cols += [key]
+            else:
+                warnings.warn('write_xyz() overwriting array "{0}" present '
+                              'in atoms.arrays with stored results '
+                              'from calculator'.format(key))
+        arrays.update(per_atom_results)
+
+    comm, ncols, dtype, fmt = output_column_format(atoms,
+                                                   fr_cols,
+                                                   arrays,
+                                                   write_info,
+                                                   per_frame_results)
+
+    if plain or comment != '':
+        # override key/value pairs with user-speficied comment string
+        comm = comment.rstrip()
+        if '\n' in comm:
+            raise ValueError('Comment line should not have line breaks.')
+
+    nat = natoms
+    if vec_cell:
+        nat -= nPBC
+    return ('%d\n' % nat + '%s\n' % comm
+            + _format_rows(fmt, fr_cols, ncols, arrays, natoms))
+
+
+def _format_xyz_frames(images, kwargs):
+    """Format a batch of frames.  This runs in the executor."""
+    return ''.join([_format_xyz_frame(atoms, **kwargs) for atoms in images])
 
 
 def write_xyz(fileobj, images, comment='', columns=None,
               write_info=True,
               write_results=True, plain=False, vec_cell=False,
-              append=False):
+              append=False, executor=None, chunksize=64):
     """
     Write output in extended XYZ format
 
@@ -861,6 +1058,12 @@ def write_xyz(fileobj, images, comment='', columns=None,
     pseudo-atoms. If `append` is set to True, the file is for append (mode `a`),
     otherwise it is overwritten (mode `w`).
 
+    Large numbers of frames can be formatted in parallel by passing a
+    `concurrent.futures` `executor`, e.g. a ProcessPoolExecutor.  The
+    frames are sent to it in batches of `chunksize` and the formatted
+    batches are written in order by the calling process, so the output
+    is the same as without an executor.
+
     See documentation for :func:`read_xyz()` for further details of the extended
     XYZ file format.
     """
@@ -873,166 +1076,45 @@ def write_xyz(fileobj, images, comment='', columns=None,
     if hasattr(images, 'get_positions'):
         images = [images]
 
-    for atoms in images:
-        natoms = len(atoms)
+    if vec_cell:
+        plain = True
 
-        if columns is None:
-            fr_cols = None
-        else:
-            fr_cols = columns[:]
-
-        if fr_cols is None:
-            fr_cols = (['symbols', 'positions']
-                       + [key for key in atoms.arrays.keys() if
-                          key not in ['symbols', 'positions', 'numbers',
-                                      'species', 'pos']])
-
-        if vec_cell:
-            plain = True
-
-        if plain:
-            fr_cols = ['symbols', 'positions']
-            write_info = False
-            write_results = False
-
-        per_frame_results = {}
-        per_atom_results = {}
-        if write_results:
-            calculator = atoms.calc
-            if (calculator is not None
-                    and isinstance(calculator, BaseCalculator)):
-                for key in all_properties:
-                    value = calculator.results.get(key, None)
-                    if value is None:
-                        # skip missing calculator results
-                        continue
-                    if (key in per_atom_properties and len(value.shape) >= 1
-                            and value.shape[0] == len(atoms)):
-                        # per-atom quantities (forces, energies, stresses)
-                        per_atom_results[key] = value
-                    elif key in per_config_properties:
-                        # per-frame quantities (energy, stress)
-                        # special case for stress, which should be converted
-                        # to 3x3 matrices before writing
-                        if key == 'stress':
-                            xx, yy, zz, yz, xz, xy = value
-                            value = np.array(
-                                [(xx, xy, xz), (xy, yy, yz), (xz, yz, zz)])
-                        per_frame_results[key] = value
-
-        # Move symbols and positions to first two properties
-        if 'symbols' in fr_cols:
-            i = fr_cols.index('symbols')
-            fr_cols[0], fr_cols[i] = fr_cols[i], fr_cols[0]
-
-        if 'positions' in fr_cols:
-            i = fr_cols.index('positions')
-            fr_cols[1], fr_cols[i] = fr_cols[i], fr_cols[1]
-
-        # Check first column "looks like" atomic symbols
-        if fr_cols[0] in atoms.arrays:
-            symbols = atoms.arrays[fr_cols[0]]
-        else:
-            symbols = atoms.get_chemical_symbols()
-
-        if natoms > 0 and not isinstance(symbols[0], str):
-            raise ValueError('First column must be symbols-like')
-
-        # Check second column "looks like" atomic positions
-        pos = atoms.arrays[fr_cols[1]]
-        if pos.shape != (natoms, 3) or pos.dtype.kind != 'f':
-            raise ValueError('Second column must be position-like')
-
-        # if vec_cell add cell information as pseudo-atoms
-        if vec_cell:
-            pbc = list(atoms.get_pbc())
-            cell = atoms.get_cell()
-
-            if True in pbc:
-                nPBC = 0
-                for i, b in enumerate(pbc):
-                    if b:
-                        nPBC += 1
-                        symbols.append('VEC' + str(nPBC))
-                        pos = np.vstack((pos, cell[i]))
-                # add to natoms
-                natoms += nPBC
-                if pos.shape != (natoms, 3) or pos.dtype.kind != 'f':
-                    raise ValueError(
-                        'Pseudo Atoms containing cell have bad coords')
-
-        # Move mask
-        if 'move_mask' in fr_cols:
-            cnstr = images[0]._get_constraints()
-            if len(cnstr) > 0:
-                c0 = cnstr[0]
-                if isinstance(c0, FixAtoms):
-                    cnstr = np.ones((natoms,), dtype=bool)
-                    for idx in c0.index:
-                        cnstr[idx] = False
-                elif isinstance(c0, FixCartesian):
-                    masks = np.ones((natoms, 3), dtype=bool)
-                    for i in range(len(cnstr)):
-                        idx = cnstr[i].index
-                        masks[idx] = cnstr[i].mask
-                    cnstr = masks
-            else:
-                fr_cols.remove('move_mask')
-
-        # Collect data to be written out
-        arrays = {}
-        for column in fr_cols:
-            if column == 'positions':
-                arrays[column] = pos
-            elif column in atoms.arrays:
-                arrays[column] = atoms.arrays[column]
-            elif column == 'symbols':
-                arrays[column] = np.array(symbols)
-            elif column == 'move_mask':
-                arrays[column] = cnstr
-            else:
-                raise ValueError('Missing array "%s"' % column)
+    if plain:
+        write_info = False
+        write_results = False
 
-        if write_results:
-            for key in per_atom_results:
-                if key not in fr_cols:
-                    fr_cols += [key]
-                else:
-                    warnings.warn('write_xyz() overwriting array "{0}" present '
-                                  'in atoms.arrays with stored results '
-                                  'from calculator'.format(key))
-            arrays.update(per_atom_results)
-
-        comm, ncols, dtype, fmt = output_column_format(atoms,
-                                                       fr_cols,
-                                                       arrays,
-                                                       write_info,
-                                                       per_frame_results)
-
-        if plain or comment != '':
-            # override key/value pairs with user-speficied comment string
-            comm = comment.rstrip()
-            if '\n' in comm:
-                raise ValueError('Comment line should not have line breaks.')
-
-        # Pack fr_cols into record array
-        data = np.zeros(natoms, dtype)
-        for column, ncol in zip(fr_cols, ncols):
-            value = arrays[column]
-            if ncol == 1:
-                data[column] = np.squeeze(value)
-            else:
-                for c in range(ncol):
-                    data[column + str(c)] = value[:, c]
-
-        nat = natoms
-        if vec_cell:
-            nat -= nPBC
-        # Write the output
-        fileobj.write('%d\n' % nat)
-        fileobj.write('%s\n' % comm)
-        for i in range(natoms):
-            fileobj.write(fmt % tuple(data[i]))
+    images = iter(images)
+    first = next(images, None)
+    if first is None:
+        return
+    images = chain([first], images)
+
+    # The move_mask column is always taken from the first image
+    kwargs = dict(columns=columns, comment=comment, write_info=write_info,
+                  write_results=write_results, plain=plain,
+                  vec_cell=vec_cell, constraints=first._get_constraints())
+
+    if executor is None:
+        for atoms in images:
+            fileobj.write(_format_xyz_frame(atoms, **kwargs))
+        return
+
+    # Keep a bounded number of batches in flight and write them in order
+    max_pending = 2 * getattr(executor, '_max_workers', 1) + 1
+    pending = deque()
+    try:
+        while True:
+            batch = list(islice(images, chunksize))
+            if batch:
+                pending.append(executor.submit(_format_xyz_frames, batch,
+                                               kwargs))
+            if not pending:
+                break
+            if not batch or len(pending) >= max_pending:
+                fileobj.write(pending.popleft().result())
+    finally:
+        for future in pending:
+            future.cancel()
 
 
 # create aliases for read/write functions
@@ -1,6 +1,7 @@
 """File formats.
 
-This module implements the read(), iread() and write() functions in ase.io.
+This module implements the read(), iread(), iread_many() and write()
+functions in ase.io.
 For each file format there is an IOFormat object.
 
 There is a dict, ioformats, which stores the objects.
@@ -11,24 +12,28 @@ Example
 The xyz format is implemented in the ase/io/xyz.py file which has a
 read_xyz() generator and a write_xyz() function.  This and other
 information can be obtained from ioformats['xyz'].
+
+IO formats from other packages are registered through the
+``ase.ioformats`` entry point group.  If the environment variable
+ASE_IOFORMATS_CACHE is set to a directory, the entry points found are
+stored there and reused by later processes until packages are installed
+or removed.
 """
 
 import io
 import re
 import functools
+import hashlib
 import inspect
+import json
 import os
 import sys
 import numbers
 import warnings
 from pathlib import Path, PurePath
 from typing import (
-    IO, List, Any, Iterable, Tuple, Union, Sequence, Dict, Optional)
-
-if sys.version_info >= (3, 8):
-    from importlib.metadata import entry_points
-else:
-    from importlib_metadata import entry_points
+    IO, List, Any, Iterable, Tuple, Union, Sequence, Dict, Optional,
+    NamedTuple)
 
 from ase.atoms import Atoms
 from ase.utils.plugins import ExternalIOFormat
@@ -60,6 +65,7 @@ class IOFormat:
         self.globs: List[str] = []
         self.magic: List[str] = []
         self.magic_regex: Optional[bytes] = None
+        self.readfunc_name: Optional[str] = None
 
     def open(self, fname, mode: str = 'r') -> IO:
         # We might want append mode, too
@@ -152,7 +158,8 @@ class IOFormat:
         return self.name.replace('-', '_')
 
     def _readfunc(self):
-        return getattr(self.module, 'read_' + self._formatname, None)
+        name = self.readfunc_name or 'read_' + self._formatname
+        return getattr(self.module, name, None)
 
     def _writefunc(self):
         return getattr(self.module, 'write_' + self._formatname, None)
@@ -248,9 +255,77 @@ class IOFormat:
         return any(fnmatchcase(data, magic + b'*')  # type: ignore
                    for magic in self.magic)
 
+    def compile_magic(self):
+        """Return the magic as one compiled regular expression.
+
+        Its match() method agrees with match_magic(), or None if the
+        format has no magic."""
+        if self.magic_regex:
+            assert not self.magic, 'Define only one of magic and magic_regex'
+            return re.compile(self.magic_regex, re.M | re.S)
+        if not self.magic:
+            return None
+        from fnmatch import translate
+        # Same translation of bytes as in fnmatch.fnmatchcase()
+        patterns = [translate(str(magic + b'*', 'ISO-8859-1'))
+                    for magic in self.magic]
+        return re.compile(bytes('|'.join(patterns), 'ISO-8859-1'))
+
+
+class _FormatDict(dict):
+    """Dictionary of IO formats.
+
+    The external IO formats are registered on first lookup, since
+    scanning the installed packages for entry points is slow.
+    The version is increased by each change, such that compiled
+    patterns of the formats can be reused until then."""
+
+    version = 0
+
+    def __setitem__(self, key, value):
+        self.version += 1
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self.version += 1
+        super().__delitem__(key)
+
+    def __getitem__(self, key):
+        load_external_io_formats()
+        return super().__getitem__(key)
+
+    def __contains__(self, key):
+        load_external_io_formats()
+        return super().__contains__(key)
+
+    def __iter__(self):
+        load_external_io_formats()
+        return super().__iter__()
+
+    def __len__(self):
+        load_external_io_formats()
+        return super().__len__()
+
+    def get(self, key, default=None):
+        load_external_io_formats()
+        return super().get(key, default)
+
+    def keys(self):
+        load_external_io_formats()
+        return super().keys()
+
+    def values(self):
+        load_external_io_formats()
+        return super().values()
+
+    def items(self):
+        load_external_io_formats()
+        return super().items()
 
-ioformats: Dict[str, IOFormat] = {}  # These will be filled at run-time.
-extension2format = {}
+
+# These will be filled at run-time:
+ioformats: Dict[str, IOFormat] = _FormatDict()
+extension2format: Dict[str, IOFormat] = _FormatDict()
 
 
 all_formats = ioformats  # Aliased for compatibility only.  Please do not use.
@@ -259,7 +334,7 @@ format2modulename = {}  # Left for compatibility only.
 
 def define_io_format(name, desc, code, *, module=None, ext=None,
                      glob=None, magic=None, encoding=None,
-                     magic_regex=None, external=False):
+                     magic_regex=None, external=False, readfunc=None):
     if module is None:
         module = name.replace('-', '_')
         format2modulename[name] = module
@@ -285,6 +360,9 @@ def define_io_format(name, desc, code, *, module=None, ext=None,
     if magic_regex is not None:
         fmt.magic_regex = magic_regex
 
+    if readfunc is not None:
+        fmt.readfunc_name = readfunc
+
     for ext in fmt.extensions:
         if ext in extension2format:
             raise ValueError('extension "{}" already registered'.format(ext))
@@ -304,13 +382,162 @@ def get_ioformat(name: str) -> IOFormat:
     return ioformats[name]
 
 
-def register_external_io_formats(group):
+class _FormatMatcher:
+    """Compiled filename and magic patterns of all IO formats.
+
+    Equivalent to trying IOFormat.match_name() and IOFormat.match_magic()
+    for each format in order, but with the patterns compiled once."""
+
+    def __init__(self, formats: Dict[str, IOFormat]) -> None:
+        from fnmatch import translate
+
+        self.formats = formats
+        self.key = (getattr(formats, 'version', None), len(formats))
+
+        # One regular expression for all filename patterns, with a
+        # named group for each format
+        self.name_formats: List[IOFormat] = []
+        patterns = []
+        for fmt in formats.values():
+            if fmt.globs:
+                regex = '|'.join(translate(os.path.normcase(glob))
+                                 for glob in fmt.globs)
+                patterns.append(f'(?P<f{len(self.name_formats)}>{regex})')
+                self.name_formats.append(fmt)
+        self.name_regex = re.compile('|'.join(patterns)) if patterns else None
+
+        self.magic = []
+        for fmt in formats.values():
+            regex = fmt.compile_magic()
+            if regex is not None:
+                self.magic.append((fmt, regex))
+
+    def is_current(self, formats: Dict[str, IOFormat]) -> bool:
+        return (formats is self.formats and
+                (getattr(formats, 'version', None), len(formats)) == self.key)
+
+    def match_name(self, basename: str) -> Optional[IOFormat]:
+        if self.name_regex is None:
+            return None
+        match = self.name_regex.match(os.path.normcase(basename))
+        if match is None:
+            return None
+        assert match.lastgroup is not None
+        return self.name_formats[int(match.lastgroup[1:])]
+
+    def match_magic(self, data: bytes) -> Optional[IOFormat]:
+        for fmt, regex in self.magic:
+            if regex.match(data):
+                return fmt
+        return None
+
+
+_matcher: Optional[_FormatMatcher] = None
+
+
+def get_format_matcher() -> _FormatMatcher:
+    """Return the compiled patterns of the IO formats.
+
+    They are compiled again only after IO formats have been added."""
+    global _matcher
+    load_external_io_formats()
+    if _matcher is None or not _matcher.is_current(ioformats):
+        _matcher = _FormatMatcher(ioformats)
+    return _matcher
+
+
+class _CachedEntryPoint(NamedTuple):
+    """Entry point read from the ASE_IOFORMATS_CACHE directory."""
+    name: str
+    value: str
+
+    def load(self):
+        module, _, attrs = self.value.partition(':')
+        obj = import_module(module.strip())
+        attrs = attrs.split('[')[0].strip()
+        if attrs:
+            for attr in attrs.split('.'):
+                obj = getattr(obj, attr)
+        return obj
+
+
+def _entry_point_cache_key(group):
+    # Installing or removing a package adds or removes its metadata in a
+    # directory on sys.path, which changes the modification time
+    paths = []
+    for path in sys.path:
+        try:
+            paths.append([path, os.stat(path or '.').st_mtime_ns])
+        except OSError:
+            pass
+    return [group, sys.version, paths]
+
+
+def _get_entry_point_cache_path(group):
+    cachedir = os.environ.get('ASE_IOFORMATS_CACHE')
+    if not cachedir:
+        return None
+    digest = hashlib.sha1(group.encode()).hexdigest()[:16]
+    return os.path.join(cachedir, f'entrypoints-{digest}.json')
+
+
+def _find_entry_points(group):
+    """Return the entry points in group, cached if possible."""
+    path = _get_entry_point_cache_path(group)
+    if path is not None:
+        key = _entry_point_cache_key(group)
+        try:
+            with open(path) as fd:
+                cache = json.load(fd)
+        except (OSError, ValueError):
+            cache = None
+        if cache is not None and cache['key'] == key:
+            return [_CachedEntryPoint(*ep) for ep in cache['entry_points']]
+
+    if sys.version_info >= (3, 8):
+        from importlib.metadata import entry_points
+    else:
+        from importlib_metadata import entry_points
+
     if hasattr(entry_points(), 'select'):
         fmt_entry_points = entry_points().select(group=group)  # type: ignore
     else:
         fmt_entry_points = entry_points().get(group, ())
+    fmt_entry_points = list(fmt_entry_points)
+
+    if path is not None:
+        cache = {'key': key,
+                 'entry_points': [[ep.name, ep.value]
+                                  for ep in fmt_entry_points]}
+        # write to a temporary file first, such that other processes never
+        # read a partially written cache
+        tmp = '%s.%d' % (path, os.getpid())
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp, 'w') as fd:
+                json.dump(cache, fd)
+            os.replace(tmp, path)
+        except OSError:
+            # the cache is optional, e.g. the directory may not be writable
+            pass
+
+    return fmt_entry_points
+
+
+# Entry point groups which have not been registered yet
+_external_groups: List[str] = []
+
+
+def load_external_io_formats():
+    """Register the IO formats exposed through entry points.
+
+    This is done once, the first time the IO formats are looked up."""
+    while _external_groups:
+        register_external_io_formats(_external_groups.pop(0))
 
-    for entry_point in fmt_entry_points:
+
+def register_external_io_formats(group):
+    for entry_point in _find_entry_points(group):
         try:
             define_external_io_format(entry_point)
         except Exception as exc:
@@ -429,7 +656,8 @@ F('html', 'X3DOM HTML', '1F', module='x3d')
 F('json', 'ASE JSON database file', '+F', ext='json', module='db')
 F('jsv', 'JSV file format', '1F')
 F('lammps-dump-text', 'LAMMPS text dump file', '+F',
-  module='lammpsrun', magic_regex=b'.*?^ITEM: TIMESTEP$')
+  module='lammpsrun', magic_regex=b'.*?^ITEM: TIMESTEP$',
+  readfunc='iread_lammps_dump_text')
 F('lammps-dump-binary', 'LAMMPS binary dump file', '+B',
   module='lammpsrun')
 F('lammps-data', 'LAMMPS data file', '1F', module='lammpsdata',
@@ -462,6 +690,8 @@ F('pov', 'Persistance of Vision', '1S')
 # extension
 F('prismatic', 'prismatic and computem XYZ-file', '1F')
 F('py', 'Python file', '+F')
+F('ragged', 'ASE ragged-array frames', '+B',
+  magic=b'ASERAGGD')
 F('sys', 'qball sys file', '1F')
 F('qbox', 'QBOX output file', '+F',
   magic=b'*:simulation xmlns:')
@@ -501,7 +731,8 @@ F('xtd', 'Materials Studio file', '+F')
 F('xyz', 'XYZ-file', '+F')
 
 # Register IO formats exposed through the ase.ioformats entry point
-register_external_io_formats('ase.ioformats')
+# when the formats are first looked up
+_external_groups.append('ase.ioformats')
 
 
 def get_compression(filename: str) -> Tuple[str, Optional[str]]:
@@ -851,6 +1082,136 @@ def _iread(filename, index, format, io, parallel=None, full_output=False,
             fd.close()
 
 
+def iread_many(
+        filenames: Union[str, PurePath, Iterable[Union[str, PurePath]]],
+        index: Any = None,
+        format: Optional[str] = None,
+        ordered: bool = True,
+        errors: str = 'return',
+        max_workers: Optional[int] = None,
+        chunksize: int = 16,
+        executor=None,
+        **kwargs
+) -> Iterable[Tuple[str, Any]]:
+    """Read many files in parallel with a pool of processes.
+
+    filenames: str, Path or list of str or Path
+        File names or a glob pattern, e.g. ``'*/OUTCAR'``.  File objects
+        are not supported, as the files are opened by the workers.
+    index: int, slice or str
+        Configuration(s) read from each file, as for :func:`read`.
+    format: str
+        Format of all the files.  If not given, the format of each file
+        is guessed by the *filetype* function in the worker process.
+    ordered: bool
+        Yield the results in the order of the files (default).  Use
+        ordered=False to get them as soon as they are ready.
+    errors: str
+        If 'return' (default), the exception raised while reading a file
+        is yielded instead of the Atoms object(s).  Use 'raise' to
+        re-raise it in the calling process.
+    max_workers: int
+        Number of processes.  Default is the number of CPUs.
+    chunksize: int
+        Number of files read by a process in each task.
+    executor: concurrent.futures.Executor
+        Executor used instead of a new ProcessPoolExecutor.
+
+    Yields (filename, images) pairs, where images is what :func:`read`
+    returns for the file.  Remaining keyword arguments are passed on to
+    :func:`read`."""
+
+    from concurrent.futures import (FIRST_COMPLETED, ProcessPoolExecutor,
+                                    wait)
+
+    if errors not in ['return', 'raise']:
+        raise ValueError(f'errors must be "return" or "raise", '
+                         f'not {errors!r}')
+
+    if isinstance(filenames, (str, PurePath)):
+        from glob import glob
+        filenames = sorted(glob(str(filenames)))
+    filenames = list(filenames)
+    for name in filenames:
+        if not isinstance(name, (str, PurePath)):
+            raise TypeError(f'Expected a file name, got {name!r}')
+    filenames = [str(name) for name in filenames]
+    chunks = [filenames[i:i + chunksize]
+              for i in range(0, len(filenames), chunksize)]
+    if not chunks:
+        return
+
+    if executor is None:
+        executor = ProcessPoolExecutor(max_workers)
+        shutdown = executor.shutdown
+    else:
+        def shutdown(wait=True):
+            pass
+
+    # Submit a limited number of chunks at a time, such that the results
+    # do not pile up in memory when they are consumed slowly
+    max_pending = 2 * (max_workers or os.cpu_count() or 1)
+    tasks = iter(enumerate(chunks))
+    pending = {}
+    done_chunks = {}
+    next_chunk = 0
+    try:
+        while True:
+            for i, chunk in tasks:
+                future = executor.submit(_read_many, chunk, index, format,
+                                         kwargs)
+                pending[future] = i
+                if len(pending) >= max_pending:
+                    break
+
+            if not pending:
+                break
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                done_chunks[pending.pop(future)] = future.result()
+
+            if ordered:
+                ready = []
+                while next_chunk in done_chunks:
+                    ready.append(done_chunks.pop(next_chunk))
+                    next_chunk += 1
+            else:
+                ready = list(done_chunks.values())
+                done_chunks.clear()
+
+            for results in ready:
+                for filename, images in results:
+                    if errors == 'raise' and isinstance(images,
+                                                        BaseException):
+                        raise images
+                    yield filename, images
+    finally:
+        for future in pending:
+            future.cancel()
+        shutdown(wait=False)
+
+
+def _read_many(filenames, index, format, kwargs):
+    """Read a chunk of files.  This runs in the worker processes."""
+    import pickle
+
+    results = []
+    for filename in filenames:
+        try:
+            images = read(filename, index, format, parallel=False, **kwargs)
+        except Exception as ex:
+            # The exception is sent back to the calling process, which
+            # fails for exceptions that cannot be pickled
+            try:
+                pickle.dumps(ex)
+            except Exception:
+                ex = RuntimeError(f'{type(ex).__name__}: {ex}')
+            images = ex
+        results.append((filename, images))
+    return results
+
+
 def parse_filename(filename, index=None, do_not_split_by_at_sign=False):
     if not isinstance(filename, str):
         return filename, index
@@ -876,9 +1237,9 @@ def parse_filename(filename, index=None, do_not_split_by_at_sign=False):
 
 def match_magic(data: bytes) -> IOFormat:
     data = data[:PEEK_BYTES]
-    for ioformat in ioformats.values():
-        if ioformat.match_magic(data):
-            return ioformat
+    ioformat = get_format_matcher().match_magic(data)
+    if ioformat is not None:
+        return ioformat
     raise UnknownFileTypeError('Cannot guess file type from contents')
 
 
@@ -941,9 +1302,9 @@ def filetype(
         if '.' in basename:
             ext = os.path.splitext(basename)[1].strip('.').lower()
 
-        for fmt in ioformats.values():
-            if fmt.match_name(basename):
-                return fmt.name
+        fmt = get_format_matcher().match_name(basename)
+        if fmt is not None:
+            return fmt.name
 
         if not read:
             if ext is None:
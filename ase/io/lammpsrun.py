@@ -1,6 +1,5 @@
 import gzip
 import struct
-from collections import deque
 from os.path import splitext
 
 import numpy as np
@@ -8,6 +7,7 @@ import numpy as np
 from ase.atoms import Atoms
 from ase.calculators.lammps import convert
 from ase.calculators.singlepoint import SinglePointCalculator
+from ase.io.formats import string2index
 from ase.parallel import paropen
 from ase.quaternions import Quaternions
 
@@ -246,42 +246,73 @@ def get_max_index(index):
         return index.stop if (index.stop is not None) else float("inf")
 
 
-def read_lammps_dump_text(fileobj, index=-1, **kwargs):
-    """Process cleartext lammps dumpfiles
+def index_lammps_dump_text(fileobj):
+    """Find the frames of a cleartext lammps dumpfile
 
-    :param fileobj: filestream providing the trajectory data
-    :param index: integer or slice object (default: get the last timestep)
-    :returns: list of Atoms objects
+    Only the header lines are parsed, the per-atom lines are skipped.
+    An incomplete last frame, e.g. of a running simulation, is left out.
+
+    :param fileobj: seekable filestream providing the trajectory data
+    :returns: file positions of the frames, as returned by fileobj.tell()
     :rtype: list
     """
-    # Load all dumped timesteps into memory simultaneously
-    lines = deque(fileobj.readlines())
-    index_end = get_max_index(index)
-
+    offsets = []
+    n_atoms = 0
+    while True:
+        pos = fileobj.tell()
+        line = fileobj.readline()
+        if not line:
+            return offsets
+        if "ITEM: TIMESTEP" in line:
+            offsets.append(pos)
+        elif "ITEM: NUMBER OF ATOMS" in line:
+            n_atoms = int(fileobj.readline().split()[0])
+        elif "ITEM: ATOMS" in line:
+            for _ in range(n_atoms):
+                line = fileobj.readline()
+            if n_atoms and not line.endswith("\n"):
+                del offsets[-1]
+                return offsets
+
+
+def _parse_lammps_dump_text_data(datarows):
+    """Convert per-atom lines to a float array, or to a string array if
+    some columns are not numeric (e.g. element)."""
+    words = "".join(datarows).split()
+    try:
+        data = np.array(words, dtype=float)
+    except ValueError:
+        data = np.array(words)
+    return data.reshape(len(datarows), -1)
+
+
+def _read_lammps_dump_text_frame(fileobj, skip=False, **kwargs):
+    """Read the frame starting at the current position of fileobj
+
+    :param skip: only parse the header and skip the per-atom lines
+    :returns: Atoms object (True if skip), or None at the end of the file
+    """
     n_atoms = 0
-    images = []
 
     # avoid references before assignment in case of incorrect file structure
     cell, celldisp, pbc = None, None, False
 
-    while len(lines) > n_atoms:
-        line = lines.popleft()
-
-        if "ITEM: TIMESTEP" in line:
-            n_atoms = 0
-            line = lines.popleft()
-            # !TODO: pyflakes complains about this line -> do something
-            # ntimestep = int(line.split()[0])  # NOQA
+    while True:
+        line = fileobj.readline()
+        if not line:
+            return None
 
         if "ITEM: NUMBER OF ATOMS" in line:
-            line = lines.popleft()
+            line = fileobj.readline()
             n_atoms = int(line.split()[0])
 
-        if "ITEM: BOX BOUNDS" in line:
+        elif "ITEM: BOX BOUNDS" in line:
+            celldatarows = [fileobj.readline() for _ in range(3)]
+            if skip:
+                continue
             # save labels behind "ITEM: BOX BOUNDS" in triclinic case
             # (>=lammps-7Jul09)
             tilt_items = line.split()[3:]
-            celldatarows = [lines.popleft() for _ in range(3)]
             celldata = np.loadtxt(celldatarows)
             diagdisp = celldata[:, :2].reshape(6, 1).flatten()
 
@@ -310,11 +341,16 @@ def read_lammps_dump_text(fileobj, index=-1, **kwargs):
                 pbc_items = ["f", "f", "f"]
             pbc = ["p" in d.lower() for d in pbc_items]
 
-        if "ITEM: ATOMS" in line:
+        elif "ITEM: ATOMS" in line:
             colnames = line.split()[2:]
-            datarows = [lines.popleft() for _ in range(n_atoms)]
-            data = np.loadtxt(datarows, dtype=str)
-            out_atoms = lammps_data_to_ase_atoms(
+            datarows = [fileobj.readline() for _ in range(n_atoms)]
+            if n_atoms and not datarows[-1].endswith("\n"):
+                # incomplete last frame
+                return None
+            if skip:
+                return True
+            data = _parse_lammps_dump_text_data(datarows)
+            return lammps_data_to_ase_atoms(
                 data=data,
                 colnames=colnames,
                 cell=cell,
@@ -323,12 +359,67 @@ def read_lammps_dump_text(fileobj, index=-1, **kwargs):
                 pbc=pbc,
                 **kwargs
             )
-            images.append(out_atoms)
 
-        if len(images) > index_end >= 0:
-            break
 
-    return images[index]
+def iread_lammps_dump_text(fileobj, index=-1, **kwargs):
+    """Process cleartext lammps dumpfiles one frame at a time
+
+    Only the requested frames are parsed.  Non-negative indices are read
+    in a single pass through the file.  Negative indices and steps
+    require a seekable file, where the frames are first located with
+    index_lammps_dump_text().
+
+    :param fileobj: filestream providing the trajectory data
+    :param index: integer or slice object (default: get the last timestep)
+    :returns: generator of Atoms objects
+    """
+    if isinstance(index, str):
+        index = string2index(index)
+    if not isinstance(index, slice):
+        index = slice(index, (index + 1) or None)
+
+    start = 0 if index.start is None else index.start
+    step = 1 if index.step is None else index.step
+    stop = index.stop
+    if start >= 0 and step > 0 and (stop is None or stop >= 0):
+        i = 0
+        while stop is None or i < stop:
+            wanted = i >= start and (i - start) % step == 0
+            atoms = _read_lammps_dump_text_frame(fileobj, skip=not wanted,
+                                                 **kwargs)
+            if atoms is None:
+                return
+            if wanted:
+                yield atoms
+            i += 1
+        return
+
+    if not (hasattr(fileobj, "seekable") and fileobj.seekable()):
+        # Parse all frames as there is no way back to earlier frames
+        images = list(iread_lammps_dump_text(fileobj, slice(None), **kwargs))
+        yield from images[index]
+        return
+
+    offsets = index_lammps_dump_text(fileobj)
+    for i in range(len(offsets))[index]:
+        fileobj.seek(offsets[i])
+        yield _read_lammps_dump_text_frame(fileobj, **kwargs)
+
+
+def read_lammps_dump_text(fileobj, index=-1, **kwargs):
+    """Process cleartext lammps dumpfiles
+
+    The ase.io registry reads this format lazily through
+    iread_lammps_dump_text(); this wrapper collects the frames.
+
+    :param fileobj: filestream providing the trajectory data
+    :param index: integer or slice object (default: get the last timestep)
+    :returns: Atoms object for an integer index, else list of Atoms objects
+    """
+    images = list(iread_lammps_dump_text(fileobj, index, **kwargs))
+    if isinstance(index, (slice, str)):
+        return images
+    return images[0]
 
 
 def read_lammps_dump_binary(
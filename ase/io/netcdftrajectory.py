@@ -64,7 +64,8 @@ class NetCDFTrajectory:
 
     def __init__(self, filename, mode='r', atoms=None, types_to_numbers=None,
                  double=True, netcdf_format='NETCDF3_CLASSIC', keep_open=True,
-                 index_var='id', chunk_size=1000000):
+                 index_var='id', chunk_size=1000000, chunksizes=None,
+                 compression=None, complevel=4):
         """
         A NetCDFTrajectory can be created in read, write or append mode.
 
@@ -124,9 +125,32 @@ class NetCDFTrajectory:
             Maximum size of consecutive number of records (along the 'atom')
             dimension read when reading from a NetCDF file. This is used to
             reduce the memory footprint of a read operation on very large files.
+
+        chunksizes=None:
+            Chunk shape of the per-frame variables when writing a new
+            NETCDF4 or NETCDF4_CLASSIC file.  An int gives the number of
+            frames per chunk for all variables, with all atoms in each chunk.
+            A dict maps variable names to an int or a full chunk shape
+            tuple.  Default is the chunking of the netCDF library.
+
+        compression=None:
+            Compression of the per-frame variables when writing a new
+            NETCDF4 or NETCDF4_CLASSIC file, e.g. 'zlib'.  Other values
+            are passed to netCDF4-python and require version 1.6 or newer.
+
+        complevel=4:
+            Compression level from 1 to 9.
         """
         self.nc = None
+        if ((chunksizes is not None or compression is not None)
+                and not netcdf_format.startswith('NETCDF4')):
+            raise ValueError('Chunking and compression require the NETCDF4 '
+                             'or NETCDF4_CLASSIC format.')
+
         self.chunk_size = chunk_size
+        self.chunksizes = chunksizes
+        self.compression = compression
+        self.complevel = complevel
 
         self.numbers = None
         self.pre_observers = []   # Callback functions before write
@@ -364,38 +388,58 @@ class NetCDFTrajectory:
             self.nc.variables[self._cell_angular_var][2] = [x for x in 'gamma']
 
         if not self._has_variable(self._numbers_var):
-            self.nc.createVariable(self._numbers_var[0], 'i',
-                                   (self._frame_dim, self._atom_dim,))
+            self._create_variable(self._numbers_var[0], 'i',
+                                  (self._frame_dim, self._atom_dim,))
         if not self._has_variable(self._positions_var):
-            self.nc.createVariable(self._positions_var, 'f4',
-                                   (self._frame_dim, self._atom_dim,
-                                    self._spatial_dim))
+            self._create_variable(self._positions_var, 'f4',
+                                  (self._frame_dim, self._atom_dim,
+                                   self._spatial_dim))
             self.nc.variables[self._positions_var].units = 'Angstrom'
             self.nc.variables[self._positions_var].scale_factor = 1.
         if not self._has_variable(self._cell_lengths_var):
-            self.nc.createVariable(self._cell_lengths_var, 'd',
-                                   (self._frame_dim, self._cell_spatial_dim))
+            self._create_variable(self._cell_lengths_var, 'd',
+                                  (self._frame_dim, self._cell_spatial_dim))
             self.nc.variables[self._cell_lengths_var].units = 'Angstrom'
             self.nc.variables[self._cell_lengths_var].scale_factor = 1.
         if not self._has_variable(self._cell_angles_var):
-            self.nc.createVariable(self._cell_angles_var, 'd',
-                                   (self._frame_dim, self._cell_angular_dim))
+            self._create_variable(self._cell_angles_var, 'd',
+                                  (self._frame_dim, self._cell_angular_dim))
             self.nc.variables[self._cell_angles_var].units = 'degree'
         if not self._has_variable(self._cell_origin_var):
-            self.nc.createVariable(self._cell_origin_var, 'd',
-                                   (self._frame_dim, self._cell_spatial_dim))
+            self._create_variable(self._cell_origin_var, 'd',
+                                  (self._frame_dim, self._cell_spatial_dim))
             self.nc.variables[self._cell_origin_var].units = 'Angstrom'
             self.nc.variables[self._cell_origin_var].scale_factor = 1.
 
+    def _create_variable(self, name, dtype, dims):
+        """Create a per-frame variable with the chunking and compression
+        options of the trajectory."""
+        kwargs = {}
+        if self.compression == 'zlib':
+            kwargs.update(zlib=True, complevel=self.complevel)
+        elif self.compression is not None:
+            kwargs.update(compression=self.compression,
+                          complevel=self.complevel)
+        chunksizes = self.chunksizes
+        if isinstance(chunksizes, dict):
+            chunksizes = chunksizes.get(name)
+        if isinstance(chunksizes, int):
+            # Number of frames per chunk, all of each of the other dimensions
+            chunksizes = (chunksizes,) + tuple(
+                len(self.nc.dimensions[dim]) for dim in dims[1:])
+        if chunksizes is not None:
+            kwargs.update(chunksizes=tuple(chunksizes))
+        return self.nc.createVariable(name, dtype, dims, **kwargs)
+
     def _add_time(self):
         if not self._has_variable(self._time_var):
-            self.nc.createVariable(self._time_var, 'f8', (self._frame_dim,))
+            self._create_variable(self._time_var, 'f8', (self._frame_dim,))
 
     def _add_velocities(self):
         if not self._has_variable(self._velocities_var):
-            self.nc.createVariable(self._velocities_var, 'f4',
-                                   (self._frame_dim, self._atom_dim,
-                                    self._spatial_dim))
+            self._create_variable(self._velocities_var, 'f4',
+                                  (self._frame_dim, self._atom_dim,
+                                   self._spatial_dim))
             self.nc.variables[self._positions_var].units = \
                 'Angstrom/Femtosecond'
             self.nc.variables[self._positions_var].scale_factor = 1.
@@ -420,7 +464,7 @@ class NetCDFTrajectory:
                 t = self.dtype_conv.get(type.char, type)
             else:
                 t = type
-            self.nc.createVariable(array_name, t, dims)
+            self._create_variable(array_name, t, dims)
 
     def _get_variable(self, name, exc=True):
         if isinstance(name, list):
@@ -448,36 +492,6 @@ class NetCDFTrajectory:
         else:
             return name in self.nc.variables
 
-    def _get_data(self, name, frame, index, exc=True):
-        var = self._get_variable(name, exc=exc)
-        if var is None:
-            return None
-        if var.dimensions[0] == self._frame_dim:
-            data = np.zeros(var.shape[1:], dtype=var.dtype)
-            s = var.shape[1]
-            if s < self.chunk_size:
-                data[index] = var[frame]
-            else:
-                # If this is a large data set, only read chunks from it to
-                # reduce memory footprint of the NetCDFTrajectory reader.
-                for i in range((s - 1) // self.chunk_size + 1):
-                    sl = slice(i * self.chunk_size,
-                               min((i + 1) * self.chunk_size, s))
-                    data[index[sl]] = var[frame, sl]
-        else:
-            data = np.zeros(var.shape, dtype=var.dtype)
-            s = var.shape[0]
-            if s < self.chunk_size:
-                data[index] = var[...]
-            else:
-                # If this is a large data set, only read chunks from it to
-                # reduce memory footprint of the NetCDFTrajectory reader.
-                for i in range((s - 1) // self.chunk_size + 1):
-                    sl = slice(i * self.chunk_size,
-                               min((i + 1) * self.chunk_size, s))
-                    data[index[sl]] = var[sl]
-        return data
-
     def __enter__(self):
         return self
 
@@ -500,103 +514,191 @@ class NetCDFTrajectory:
         self.nc.sync()
 
     def __getitem__(self, i=-1):
-        self._open()
-
         if isinstance(i, slice):
-            return [self[j] for j in range(*i.indices(self._len()))]
-
-        N = self._len()
-        if 0 <= i < N:
-            # Non-periodic boundaries have cell_length == 0.0
-            cell_lengths = \
-                np.array(self.nc.variables[self._cell_lengths_var][i][:])
-            pbc = np.abs(cell_lengths > 1e-6)
-
-            # Do we have a cell origin?
-            if self._has_variable(self._cell_origin_var):
-                origin = np.array(
-                    self.nc.variables[self._cell_origin_var][i][:])
-            else:
-                origin = np.zeros([3], dtype=float)
-
-            # Do we have an index variable?
-            if (self.index_var is not None and
-                    self._has_variable(self.index_var)):
-                index = np.array(self.nc.variables[self.index_var][i][:])
-                # The index variable can be non-consecutive, we here construct
-                # a consecutive one.
-                consecutive_index = np.zeros_like(index)
-                consecutive_index[np.argsort(index)] = np.arange(self.n_atoms)
+            data = self.read_frames(i)
+            return [self._make_atoms(data, j)
+                    for j in range(len(data['positions']))]
+        return self._make_atoms(self.read_frames(i), 0)
+
+    def read_frames(self, index=slice(None), names=None):
+        """Read frames into stacked arrays without creating Atoms objects.
+
+        index: int or slice
+            Frame(s) to read.
+        names: list of str
+            Extra variables to read.  Default is all of them.
+
+        Returns a dict with arrays of the frames stacked along the first
+        axis: ``numbers``, ``masses``, ``positions``, ``cell``, ``celldisp``
+        and ``pbc``, ``momenta`` if the file has velocities, and the extra
+        per-frame and per-file variables.  Each variable is read for
+        many frames at a time with a single netCDF call, reading at most
+        *chunk_size* atom records at a time.
+        """
+        self._open()
+        try:
+            N = self._len()
+            if isinstance(index, slice):
+                frames = range(N)[index]
             else:
-                consecutive_index = np.arange(self.n_atoms)
-
-            # Read element numbers
-            self.numbers = self._get_data(self._numbers_var, i,
-                                          consecutive_index, exc=False)
-            if self.numbers is None:
-                self.numbers = np.ones(self.n_atoms, dtype=int)
-            if self.types_to_numbers is not None:
-                d = set(self.numbers).difference(self.types_to_numbers.keys())
-                if len(d) > 0:
-                    self.types_to_numbers.update({num: num for num in d})
-                func = np.vectorize(self.types_to_numbers.get)
-                self.numbers = func(self.numbers)
-            self.masses = atomic_masses[self.numbers]
-
-            # Read positions
-            positions = self._get_data(self._positions_var, i,
-                                       consecutive_index)
-
-            # Determine cell size for non-periodic directions from shrink
-            # wrapped cell.
-            for dim in np.arange(3)[np.logical_not(pbc)]:
-                origin[dim] = positions[:, dim].min()
-                cell_lengths[dim] = positions[:, dim].max() - origin[dim]
-
-            # Construct cell shape from cell lengths and angles
-            cell = cellpar_to_cell(
-                list(cell_lengths) +
-                list(self.nc.variables[self._cell_angles_var][i])
-            )
-
-            # Compute momenta from velocities (if present)
-            momenta = self._get_data(self._velocities_var, i,
-                                     consecutive_index, exc=False)
-            if momenta is not None:
-                momenta *= self.masses.reshape(-1, 1)
-
-            # Fill info dict with additional data found in the NetCDF file
-            info = {}
-            for name in self.extra_per_frame_atts:
-                info[name] = np.array(self.nc.variables[name][i])
-
-            # Create atoms object
-            atoms = ase.Atoms(
-                positions=positions,
-                numbers=self.numbers,
-                cell=cell,
-                celldisp=origin,
-                momenta=momenta,
-                masses=self.masses,
-                pbc=pbc,
-                info=info
-            )
-
-            # Attach additional arrays found in the NetCDF file
-            for name in self.extra_per_frame_vars:
-                atoms.set_array(name, self._get_data(name, i,
-                                                     consecutive_index))
-            for name in self.extra_per_file_vars:
-                atoms.set_array(name, self._get_data(name, i,
-                                                     consecutive_index))
+                if index < 0:
+                    index += N
+                if index < 0 or index >= N:
+                    raise IndexError('Trajectory index out of range.')
+                frames = range(index, index + 1)
+            if names is None:
+                names = (self.extra_per_frame_vars + self.extra_per_file_vars
+                         + self.extra_per_frame_atts)
+            if frames.step < 0:
+                # Read in file order and reverse
+                data = self._read_frames(frames[::-1], names)
+                return {name: value[::-1] for name, value in data.items()}
+            return self._read_frames(frames, names)
+        finally:
             self._close()
-            return atoms
 
-        i = N + i
-        if i < 0 or i >= N:
-            self._close()
-            raise IndexError('Trajectory index out of range.')
-        return self[i]
+    def _read_frames(self, frames, names):
+        nframes = len(frames)
+
+        # Do we have an index variable?
+        order = None
+        if (self.index_var is not None and
+                self._has_variable(self.index_var)):
+            # The index variable can be non-consecutive, we here construct
+            # the order of the atoms from it.
+            index = self._read_variable(self.index_var, frames, None)
+            order = np.argsort(index, axis=1)
+
+        def read(name, exc=True):
+            return self._read_variable(name, frames, order, exc=exc)
+
+        # Non-periodic boundaries have cell_length == 0.0
+        cell_lengths = np.array(read(self._cell_lengths_var), dtype=float)
+        pbc = np.abs(cell_lengths > 1e-6)
+
+        # Do we have a cell origin?
+        if self._has_variable(self._cell_origin_var):
+            origin = np.array(read(self._cell_origin_var), dtype=float)
+        else:
+            origin = np.zeros([nframes, 3], dtype=float)
+
+        # Read element numbers
+        numbers = read(self._numbers_var, exc=False)
+        if numbers is None:
+            numbers = np.ones((nframes, self.n_atoms), dtype=int)
+        if self.types_to_numbers is not None:
+            d = set(numbers.flat).difference(self.types_to_numbers.keys())
+            if len(d) > 0:
+                self.types_to_numbers.update({num: num for num in d})
+            func = np.vectorize(self.types_to_numbers.get)
+            numbers = func(numbers)
+        masses = atomic_masses[numbers]
+
+        # Read positions
+        positions = read(self._positions_var)
+
+        # Determine cell size for non-periodic directions from shrink
+        # wrapped cell.
+        if nframes and self.n_atoms:
+            lower = positions.min(axis=1)
+            upper = positions.max(axis=1)
+            origin = np.where(pbc, origin, lower)
+            cell_lengths = np.where(pbc, cell_lengths, upper - origin)
+
+        # Construct cell shape from cell lengths and angles
+        cell_angles = read(self._cell_angles_var)
+        cell = np.zeros((nframes, 3, 3))
+        for j in range(nframes):
+            cell[j] = cellpar_to_cell(list(cell_lengths[j]) +
+                                      list(cell_angles[j]))
+
+        data = {'numbers': numbers, 'masses': masses, 'positions': positions,
+                'cell': cell, 'celldisp': origin, 'pbc': pbc}
+
+        # Compute momenta from velocities (if present)
+        velocities = read(self._velocities_var, exc=False)
+        if velocities is not None:
+            data['momenta'] = velocities * masses[..., np.newaxis]
+
+        # Additional data found in the NetCDF file
+        for name in names:
+            data[name] = read(name)
+
+        if nframes:
+            self.numbers = numbers[-1]
+            self.masses = masses[-1]
+        return data
+
+    def _read_variable(self, name, frames, order, exc=True):
+        """Read a variable for a range of frames with a positive step.
+
+        Per-file variables are repeated for each frame.  Per-atom data is
+        put in the order given by order for each frame, if given."""
+        var = self._get_variable(name, exc=exc)
+        if var is None:
+            return None
+        if var.dimensions[0] == self._frame_dim:
+            per_atom = var.dimensions[1:2] == (self._atom_dim,)
+            data = np.zeros((len(frames),) + var.shape[1:], dtype=var.dtype)
+            s = var.shape[1] if per_atom else 1
+            if s <= self.chunk_size:
+                # Read as many frames at a time as fit in a chunk
+                nblock = self.chunk_size // s
+                for i in range(0, len(frames), nblock):
+                    block = frames[i:i + nblock]
+                    if len(block) == 1:
+                        # Integer indexing is faster for a single frame
+                        data[i] = var[block.start]
+                    else:
+                        data[i:i + len(block)] = \
+                            var[block.start:block.stop:block.step]
+            else:
+                # If this is a large data set, only read chunks from it to
+                # reduce memory footprint of the NetCDFTrajectory reader.
+                for j, frame in enumerate(frames):
+                    for i in range((s - 1) // self.chunk_size + 1):
+                        sl = slice(i * self.chunk_size,
+                                   min((i + 1) * self.chunk_size, s))
+                        data[j, sl] = var[frame, sl]
+        else:
+            per_atom = var.dimensions[0] == self._atom_dim
+            data = np.zeros(var.shape, dtype=var.dtype)
+            s = var.shape[0]
+            for i in range((s - 1) // self.chunk_size + 1):
+                sl = slice(i * self.chunk_size,
+                           min((i + 1) * self.chunk_size, s))
+                data[sl] = var[sl]
+            data = np.repeat(data[np.newaxis], len(frames), axis=0)
+        if per_atom and order is not None:
+            data = np.take_along_axis(
+                data, order.reshape(order.shape + (1,) * (data.ndim - 2)),
+                axis=1)
+        return data
+
+    def _make_atoms(self, data, j):
+        # Fill info dict with additional data found in the NetCDF file
+        info = {}
+        for name in self.extra_per_frame_atts:
+            if name in data:
+                info[name] = np.array(data[name][j])
+
+        # Create atoms object
+        atoms = ase.Atoms(
+            positions=data['positions'][j],
+            numbers=data['numbers'][j],
+            cell=data['cell'][j],
+            celldisp=data['celldisp'][j],
+            momenta=data['momenta'][j] if 'momenta' in data else None,
+            masses=data['masses'][j],
+            pbc=data['pbc'][j],
+            info=info
+        )
+
+        # Attach additional arrays found in the NetCDF file
+        for name in self.extra_per_frame_vars + self.extra_per_file_vars:
+            if name in data:
+                atoms.set_array(name, data[name][j])
+        return atoms
 
     def _len(self):
         if self._frame_dim in self.nc.dimensions:
@@ -650,10 +752,10 @@ def read_netcdftrajectory(filename, index=-1):
         return traj[index]
 
 
-def write_netcdftrajectory(filename, images):
+def write_netcdftrajectory(filename, images, **kwargs):
     if hasattr(images, 'get_positions'):
         images = [images]
 
-    with NetCDFTrajectory(filename, mode='w') as traj:
+    with NetCDFTrajectory(filename, mode='w', **kwargs) as traj:
         for atoms in images:
             traj.write(atoms)
@@ -0,0 +1,420 @@
+"""
+Ragged-array files
+==================
+
+*Binary format for many frames with different numbers of atoms*
+
+All frames are stored together: per-atom quantities (numbers, positions,
+forces, other :attr:`~ase.Atoms.arrays`, ...) as one concatenated array
+each and per-frame quantities (cell, pbc, energy, numeric :attr:`info`
+values, ...) as one array with a row per frame.  Atom ``j`` of frame ``i``
+is row ``offsets[i] + j`` of the per-atom arrays.  Reading a regular file
+memory-maps it, so single frames or single arrays can be picked out of
+large files without reading the rest.
+
+.. autoclass:: RaggedFrames
+   :members:
+
+
+Fields
+------
+
+Per-atom fields have the names of the arrays in :attr:`~ase.Atoms.arrays`
+and per-frame fields are ``cell`` and ``pbc``.  Calculator results are
+stored as ``calc.<name>`` and info values as ``info.<name>``, as per-atom
+or per-frame fields depending on the property.  Info values which are not
+numbers, strings or arrays of the same shape and kind in all frames, and
+the constraints, are stored as json instead.  Frames without a given field
+are listed in the file, so heterogeneous frames read back as written.
+
+
+File layout
+-----------
+
+::
+
+    0: "ASERAGGD" (magic, ascii)
+    8: array1, array2, ... (8-byte aligned little-endian ndarrays)
+    p0: json header describing the arrays
+    EOF-16: p0 (int64)
+    EOF-8: "ASERAGGD" (magic, ascii)
+
+
+Examples
+--------
+
+>>> from ase.build import bulk
+>>> from ase.io import read, write
+>>> images = [bulk('Cu') * (n, 1, 1) for n in range(1, 5)]
+>>> write('cu.ragged', images)
+>>> frames = RaggedFrames.read('cu.ragged')
+>>> len(frames), len(frames[3])
+(4, 4)
+>>> frames.atom_arrays['positions'].shape
+(10, 3)
+>>> read('cu.ragged', 1) == images[1]
+True
+"""
+import io
+import mmap
+
+import numpy as np
+
+from ase.atoms import Atoms
+from ase.calculators.calculator import all_properties
+from ase.calculators.singlepoint import SinglePointCalculator
+from ase.constraints import dict2constraint
+from ase.io.formats import index2range
+from ase.io.jsonio import decode, encode
+from ase.outputs import all_outputs
+
+magic = b'ASERAGGD'
+VERSION = 1
+
+# dtype kinds which can be stored as arrays
+array_kinds = 'biufcU'
+
+
+def _as_array(value):
+    """Return value as an ndarray, or None if it can't be stored as one."""
+    if not isinstance(value, (np.ndarray, np.generic, bool, int, float,
+                              complex, str)):
+        return None
+    array = np.asarray(value)
+    if array.dtype.kind not in array_kinds:
+        return None
+    return array
+
+
+def _is_per_atom(name, value, natoms):
+    prop = all_outputs.get(name)
+    return (prop is not None and prop.shapespec[:1] == ('natoms',)
+            and np.ndim(value) >= 1 and len(value) == natoms)
+
+
+class RaggedFrames:
+    """Frames stored as concatenated arrays and an offsets table.
+
+    offsets: ndarray of int
+        Index of the first atom of each frame in the per-atom arrays,
+        followed by the total number of atoms.
+    atom_arrays: dict of ndarrays
+        Per-atom fields with ``offsets[-1]`` rows.
+    frame_arrays: dict of ndarrays
+        Per-frame fields with ``len(offsets) - 1`` rows.  ``cell`` and
+        ``pbc`` default to zeros.
+    missing: dict
+        Sorted list of frames without the field for each field that is not
+        present in all frames.  The rows of those frames are ignored.
+    objects: dict
+        Fields stored as json: ``{name: {frame: value}}``.
+    """
+    def __init__(self, offsets, atom_arrays, frame_arrays=None,
+                 missing=None, objects=None):
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.atom_arrays = dict(atom_arrays)
+        self.frame_arrays = dict(frame_arrays or {})
+        self.missing = {name: list(frames)
+                        for name, frames in (missing or {}).items()}
+        self.objects = {name: dict(values)
+                        for name, values in (objects or {}).items()}
+
+        nframes = len(self)
+        self.frame_arrays.setdefault('cell', np.zeros((nframes, 3, 3)))
+        self.frame_arrays.setdefault('pbc', np.zeros((nframes, 3), bool))
+
+        for name, array in self.atom_arrays.items():
+            if len(array) != self.offsets[-1]:
+                raise ValueError(f'Per-atom field {name} has {len(array)} '
+                                 f'rows, expected {self.offsets[-1]}')
+        for name, array in self.frame_arrays.items():
+            if len(array) != nframes:
+                raise ValueError(f'Per-frame field {name} has {len(array)} '
+                                 f'rows, expected {nframes}')
+        for name in ['numbers', 'positions']:
+            if name not in self.atom_arrays:
+                raise ValueError(f'Missing per-atom field {name}')
+
+    @property
+    def natoms(self):
+        """Number of atoms in each frame."""
+        return np.diff(self.offsets)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.get_atoms(i)
+                    for i in range(*index.indices(len(self)))]
+        return self.get_atoms(index)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.get_atoms(i)
+
+    def has(self, name, i):
+        """Whether frame i has the field name."""
+        missing = self.missing.get(name)
+        if missing is None:
+            return (name in self.atom_arrays or name in self.frame_arrays
+                    or i in self.objects.get(name, {}))
+        j = np.searchsorted(missing, i)
+        return j == len(missing) or missing[j] != i
+
+    def get(self, name, i):
+        """Value of the field name for frame i, or None if it has none.
+
+        Per-atom and non-scalar per-frame values are read-only views."""
+        if not -len(self) <= i < len(self):
+            raise IndexError('Frame index out of range')
+        i %= len(self)
+        if name in self.objects:
+            return self.objects[name].get(i)
+        if not self.has(name, i):
+            return None
+        if name in self.atom_arrays:
+            return self.atom_arrays[name][self.offsets[i]:
+                                          self.offsets[i + 1]]
+        value = self.frame_arrays[name][i]
+        if value.ndim == 0:
+            return value.item()
+        return value
+
+    def get_atoms(self, i):
+        """Frame i as an Atoms object."""
+        atoms = Atoms(numbers=self.get('numbers', i),
+                      positions=self.get('positions', i),
+                      cell=self.get('cell', i),
+                      pbc=self.get('pbc', i))
+
+        results = {}
+        for name in [*self.atom_arrays, *self.frame_arrays, *self.objects]:
+            value = self.get(name, i)
+            if value is None:
+                continue
+            if isinstance(value, np.ndarray):
+                value = value.copy()
+            group, _, key = name.partition('.')
+            if group == 'info' and key:
+                atoms.info[key] = value
+            elif group == 'calc' and key:
+                results[key] = value
+            elif (name in self.atom_arrays
+                  and name not in ['numbers', 'positions']):
+                atoms.new_array(name, value)
+
+        constraints = self.get('constraints', i)
+        if constraints:
+            atoms.set_constraint([dict2constraint(d) for d in constraints])
+        if results:
+            atoms.calc = SinglePointCalculator(atoms, **results)
+        return atoms
+
+    def stack(self, name):
+        """Field for all frames stacked in one array.
+
+        Per-atom fields are reshaped to (frames, atoms, ...), which requires
+        all frames to have the same number of atoms."""
+        if name in self.frame_arrays:
+            return self.frame_arrays[name]
+        array = self.atom_arrays[name]
+        natoms = self.natoms
+        if len(natoms) and (natoms != natoms[0]).any():
+            raise ValueError('Frames have different numbers of atoms')
+        n = natoms[0] if len(natoms) else 0
+        return array.reshape((len(self), n) + array.shape[1:])
+
+    @classmethod
+    def from_stacked(cls, atom_arrays, frame_arrays=None):
+        """Create from per-atom arrays of shape (frames, atoms, ...)."""
+        positions = atom_arrays['positions']
+        nframes, natoms = positions.shape[:2]
+        offsets = np.arange(nframes + 1) * natoms
+        atom_arrays = {name: np.reshape(array,
+                                        (nframes * natoms,) + array.shape[2:])
+                       for name, array in atom_arrays.items()}
+        return cls(offsets, atom_arrays, frame_arrays)
+
+    @classmethod
+    def from_images(cls, images):
+        """Create from an Atoms object or a sequence of Atoms objects."""
+        if hasattr(images, 'get_positions'):
+            images = [images]
+
+        natoms = []
+        atom_values = {}
+        frame_values = {}
+        objects = {}
+        for i, atoms in enumerate(images):
+            n = len(atoms)
+            natoms.append(n)
+            frame_values.setdefault('cell', {})[i] = atoms.cell.array
+            frame_values.setdefault('pbc', {})[i] = atoms.pbc
+            for name, array in atoms.arrays.items():
+                atom_values.setdefault(name, {})[i] = array
+            for key, value in atoms.info.items():
+                frame_values.setdefault('info.' + key, {})[i] = value
+            if atoms.calc is not None:
+                for key, value in atoms.calc.results.items():
+                    if key not in all_properties:
+                        continue
+                    if _is_per_atom(key, value, n):
+                        atom_values.setdefault('calc.' + key, {})[i] = value
+                    else:
+                        frame_values.setdefault('calc.' + key, {})[i] = value
+            if atoms.constraints:
+                objects.setdefault('constraints', {})[i] = [
+                    c.todict() for c in atoms.constraints]
+
+        offsets = np.zeros(len(natoms) + 1, np.int64)
+        np.cumsum(natoms, out=offsets[1:])
+
+        missing = {}
+        atom_arrays = {}
+        for name, values in atom_values.items():
+            arrays = {i: np.asarray(value) for i, value in values.items()}
+            for i, array in arrays.items():
+                if array.dtype.kind not in array_kinds:
+                    raise ValueError(f'Cannot store {array.dtype} array '
+                                     f'{name} of frame {i}')
+            atom_arrays[name] = cls._concatenate(arrays, offsets, name)
+            if len(values) < len(natoms):
+                missing[name] = sorted(set(range(len(natoms))) - set(values))
+        if not natoms:
+            atom_arrays['numbers'] = np.zeros(0, int)
+            atom_arrays['positions'] = np.zeros((0, 3))
+
+        frame_arrays = {}
+        for name, values in frame_values.items():
+            arrays = {i: _as_array(value) for i, value in values.items()}
+            shapes = {array.shape for array in arrays.values()
+                      if array is not None}
+            # Values of different kinds, e.g. int and float, are not
+            # promoted to a common type
+            kinds = {array.dtype.kind for array in arrays.values()
+                     if array is not None}
+            if (any(array is None for array in arrays.values())
+                    or len(shapes) > 1 or len(kinds) > 1):
+                objects[name] = values
+                continue
+            rows = np.arange(len(natoms) + 1)
+            frame_arrays[name] = cls._concatenate(
+                {i: array[np.newaxis] for i, array in arrays.items()},
+                rows, name)
+            if len(values) < len(natoms):
+                missing[name] = sorted(set(range(len(natoms))) - set(values))
+
+        return cls(offsets, atom_arrays, frame_arrays, missing, objects)
+
+    @staticmethod
+    def _concatenate(arrays, offsets, name):
+        shapes = {array.shape[1:] for array in arrays.values()}
+        if len(shapes) > 1:
+            raise ValueError(f'Field {name} has different shapes: {shapes}')
+        dtype = np.result_type(*arrays.values())
+        result = np.zeros((offsets[-1],) + shapes.pop(), dtype)
+        for i, array in arrays.items():
+            result[offsets[i]:offsets[i + 1]] = array
+        return result
+
+    def write(self, fd):
+        """Write to a file name or binary file object."""
+        if isinstance(fd, str):
+            with open(fd, 'wb') as fd:
+                return self.write(fd)
+
+        fd.write(magic)
+        pos = len(magic)
+        fields = {}
+        arrays = [('offsets', 'offsets', self.offsets)]
+        arrays += [('atom', name, array)
+                   for name, array in self.atom_arrays.items()]
+        arrays += [('frame', name, array)
+                   for name, array in self.frame_arrays.items()]
+        for kind, name, array in arrays:
+            array = np.ascontiguousarray(array)
+            array = array.astype(array.dtype.newbyteorder('<'), copy=False)
+            data = array.tobytes()
+            fields.setdefault(kind, {})[name] = {
+                'dtype': array.dtype.str,
+                'shape': array.shape,
+                'offset': pos}
+            fd.write(data)
+            pos += len(data)
+            padding = -pos % 8
+            fd.write(b'\0' * padding)
+            pos += padding
+
+        header = {'version': VERSION,
+                  'offsets': fields['offsets']['offsets'],
+                  'atom_arrays': fields.get('atom', {}),
+                  'frame_arrays': fields.get('frame', {}),
+                  'missing': self.missing,
+                  'objects': {name: sorted(values.items())
+                              for name, values in self.objects.items()}}
+        fd.write(encode(header).encode())
+        fd.write(np.array(pos, '<i8').tobytes() + magic)
+
+    @classmethod
+    def read(cls, fd):
+        """Read from a file name or binary file object.
+
+        Regular files are memory-mapped and the arrays are read-only views
+        of the file."""
+        if isinstance(fd, str):
+            with open(fd, 'rb') as fd:
+                return cls.read(fd)
+
+        data = _mmap_file(fd)
+        if data is None:
+            data = fd.read()
+
+        if data[:8] != magic or data[-8:] != magic:
+            raise ValueError('Not a ragged-array file')
+        pos = int(np.frombuffer(data, '<i8', 1, len(data) - 16)[0])
+        header = decode(bytes(data[pos:len(data) - 16]).decode(),
+                        always_array=False)
+        if header['version'] > VERSION:
+            raise ValueError('Ragged-array file version {} is too new'
+                             .format(header['version']))
+
+        def array(field):
+            dtype = np.dtype(field['dtype'])
+            shape = tuple(field['shape'])
+            count = int(np.prod(shape))
+            return np.frombuffer(data, dtype, count,
+                                 field['offset']).reshape(shape)
+
+        return cls(array(header['offsets']),
+                   {name: array(field)
+                    for name, field in header['atom_arrays'].items()},
+                   {name: array(field)
+                    for name, field in header['frame_arrays'].items()},
+                   header['missing'],
+                   {name: dict(values)
+                    for name, values in header['objects'].items()})
+
+
+def _mmap_file(fd):
+    """Memory map the file of fd, or return None if it is not a regular
+    uncompressed file."""
+    if not isinstance(fd, io.BufferedReader):
+        return None
+    try:
+        return mmap.mmap(fd.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        # Empty files cannot be mapped
+        return None
+
+
+def read_ragged(fd, index=-1):
+    """Read frames from a ragged-array file."""
+    frames = RaggedFrames.read(fd)
+    for i in index2range(index, len(frames)):
+        yield frames.get_atoms(i)
+
+
+def write_ragged(fd, images):
+    """Write frames to a ragged-array file."""
+    RaggedFrames.from_images(images).write(fd)
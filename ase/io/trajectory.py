@@ -17,7 +17,8 @@ from ase.utils import tokenize_version
 __all__ = ['Trajectory', 'PickleTrajectory']
 
 
-def Trajectory(filename, mode='r', atoms=None, properties=None, master=None):
+def Trajectory(filename, mode='r', atoms=None, properties=None, master=None,
+               encoding=None):
     """A Trajectory can be created in read, write or append mode.
 
     Parameters:
@@ -43,19 +44,26 @@ def Trajectory(filename, mode='r', atoms=None, properties=None, master=None):
         Controls which process does the actual writing. The
         default is that process number 0 does this.  If this
         argument is given, processes where it is True will write.
-
-    The atoms, properties and master arguments are ignores in read mode.
+    encoding: dict
+        How arrays are stored, e.g. ``{'positions': {'dtype': 'float32',
+        'delta': 10, 'compression': 'zlib'}}``.  See
+        :class:`ase.io.ulm.Writer`.  Calculator results are named
+        'calculator.forces' etc.
+
+    The atoms, properties, master and encoding arguments are ignores in
+    read mode.
     """
     if mode == 'r':
         return TrajectoryReader(filename)
-    return TrajectoryWriter(filename, mode, atoms, properties, master=master)
+    return TrajectoryWriter(filename, mode, atoms, properties, master=master,
+                            encoding=encoding)
 
 
 class TrajectoryWriter:
     """Writes Atoms objects to a .traj file."""
 
     def __init__(self, filename, mode='w', atoms=None, properties=None,
-                 extra=[], master=None):
+                 extra=[], master=None, encoding=None):
         """A Trajectory writer, in write or append mode.
 
         Parameters:
@@ -81,6 +89,8 @@ class TrajectoryWriter:
             Controls which process does the actual writing. The
             default is that process number 0 does this.  If this
             argument is given, processes where it is True will write.
+        encoding: dict
+            How arrays are stored, see :class:`ase.io.ulm.Writer`.
         """
         if master is None:
             master = (world.rank == 0)
@@ -91,6 +101,7 @@ class TrajectoryWriter:
         self.description = {}
         self.header_data = None
         self.multiple_headers = False
+        self.encoding = encoding
 
         self._open(filename, mode)
 
@@ -108,7 +119,8 @@ class TrajectoryWriter:
         if mode not in 'aw':
             raise ValueError('mode must be "w" or "a".')
         if self.master:
-            self.backend = ulm.open(filename, mode, tag='ASE-Trajectory')
+            self.backend = ulm.open(filename, mode, tag='ASE-Trajectory',
+                                    encoding=self.encoding)
             if len(self.backend) > 0 and mode == 'a':
                 with Trajectory(filename) as traj:
                     atoms = traj[0]
@@ -109,6 +109,27 @@ argument:
 >>> r.close()
 
 
+Encoded arrays
+--------------
+
+Arrays can be stored in single precision, as the difference to the array
+of the same name in the previous item and compressed.  This is chosen
+for each array with the encoding argument of the :class:`Writer`:
+
+>>> w = ulm.open('y.ulm', 'w',
+...              encoding={'a': {'dtype': 'float32',
+...                              'delta': 10,
+...                              'compression': 'zlib'}})
+>>> for i in range(20):
+...     w.write(a=np.linspace(0, 1, 1000) + i)
+...     w.sync()
+>>> w.close()
+
+With delta=10, every 10th item is stored in full.  The encoding is
+stored in the json data of the array, and the arrays are decoded when
+read.  Files with encoded arrays cannot be read by older versions of ASE.
+
+
 Versions
 --------
 
@@ -120,7 +141,9 @@ Versions
 3) Changed magic string from "AFFormat" to "- of Ulm".
 """
 
+import lzma
 import numbers
+import zlib
 from pathlib import Path
 from typing import Union, Set
 
@@ -133,8 +156,11 @@ from ase.utils import plural
 VERSION = 3
 N1 = 42  # block size - max number of items: 1, N1, N1*N1, N1*N1*N1, ...
 
+compressors = {'zlib': (zlib.compress, zlib.decompress),
+               'lzma': (lzma.compress, lzma.decompress)}
+
 
-def open(filename, mode='r', index=None, tag=None):
+def open(filename, mode='r', index=None, tag=None, encoding=None):
     """Open ulm-file.
 
     filename: str
@@ -146,6 +172,8 @@ def open(filename, mode='r', index=None, tag=None):
         Index of item to read.  Defaults to 0.
     tag: str
         Magic ID string.
+    encoding: dict
+        How arrays are stored when writing, see :class:`Writer`.
 
     Returns a :class:`Reader` or a :class:`Writer` object.  May raise
     :class:`InvalidULMFileError`.
@@ -156,7 +184,7 @@ def open(filename, mode='r', index=None, tag=None):
     if mode not in 'wa':
         2 / 0
     assert index is None
-    return Writer(filename, mode, tag or '')
+    return Writer(filename, mode, tag or '', encoding=encoding)
 
 
 ulmopen = open
@@ -191,6 +219,19 @@ def readints(fd, n):
     return a
 
 
+def shuffle(a):
+    """Get the bytes of a with the first bytes of all numbers first, then
+    all the second bytes and so on, which compresses much better."""
+    return np.ascontiguousarray(a).view(np.uint8).reshape(
+        -1, a.itemsize).T.tobytes()
+
+
+def unshuffle(buf, dtype):
+    """Inverse of shuffle()."""
+    a = np.frombuffer(buf, np.uint8).reshape(dtype.itemsize, -1)
+    return a.T.copy().view(dtype).ravel()
+
+
 def file_has_fileno(fd):
     """Tell whether file implements fileio() or not.
 
@@ -209,7 +250,7 @@ def file_has_fileno(fd):
 
 
 class Writer:
-    def __init__(self, fd, mode='w', tag='', data=None):
+    def __init__(self, fd, mode='w', tag='', data=None, encoding=None):
         """Create writer object.
 
         fd: str
@@ -219,10 +260,32 @@ class Writer:
             existing one) and 'a' for appending to an existing file.
         tag: str
             Magic ID string.
+        encoding: dict
+            How to store arrays written with write().  The keys are the
+            names of the arrays, e.g. 'positions' or 'calculator.forces'
+            for arrays written to a child, and the values are dicts
+            with any of the keys:
+
+            dtype: str
+                Data type the array is stored as, e.g. 'float32'.
+            delta: int
+                Store the difference to the array in the previous item,
+                except for every delta'th item.
+            compression: str
+                'zlib' or 'lzma'.
         """
 
         assert mode in 'aw'
 
+        for options in (encoding or {}).values():
+            unknown = set(options) - {'dtype', 'delta', 'compression'}
+            if unknown:
+                raise ValueError('Unknown encoding option: {}'
+                                 .format(', '.join(sorted(unknown))))
+            if options.get('compression', 'zlib') not in compressors:
+                raise ValueError('Unknown compression: {}'
+                                 .format(options['compression']))
+
         # Header to be written later:
         self.header = b''
 
@@ -270,6 +333,12 @@ class Writer:
 
         self.data = data
 
+        self.encoding = encoding or {}
+        self.path = ''  # name of this child-writer, e.g. 'calculator.'
+        # Last array written with delta-encoding for each name:
+        # (json data, array as decoded when reading, number of deltas)
+        self.previous = {}
+
         # date for array being filled:
         self.nmissing = 0  # number of missing numbers
         self.shape = None
@@ -394,17 +463,62 @@ class Writer:
                 value = np.asarray(value)
                 if value.ndim == 0:
                     self.data[name] = value.item()
+                elif self.path + name in self.encoding:
+                    self._write_encoded(name, value,
+                                        self.encoding[self.path + name])
                 else:
                     self.add_array(name, value.shape, value.dtype)
                     self.fill(value)
             else:
                 value.write(self.child(name))
 
+    def _write_encoded(self, name, a, options):
+        """Write ndarray with the given encoding options."""
+        assert self.nmissing == 0, 'last array not done'
+        path = self.path + name
+        dtype = np.dtype(options.get('dtype', a.dtype))
+        stored = a.astype(dtype)
+        info = {}
+        if dtype != a.dtype:
+            info['stored_as'] = dtype.name
+
+        delta = options.get('delta', 0)
+        previous = self.previous.get(path)
+        if (delta and previous is not None and previous[2] + 1 < delta and
+                previous[1].shape == a.shape and previous[1].dtype == dtype):
+            stored = stored - previous[1]
+            info['delta'] = previous[0]
+            # What the reader gets, such that errors do not accumulate:
+            decoded = previous[1] + stored
+            ndeltas = previous[2] + 1
+        else:
+            decoded = stored
+            ndeltas = 0
+
+        if 'compression' in options:
+            compress = compressors[options['compression']][0]
+            buf = compress(shuffle(stored))
+            info['compression'] = options['compression']
+            info['nbytes'] = len(buf)
+        else:
+            buf = np.ascontiguousarray(stored).tobytes()
+
+        i = align(self.fd)
+        record = [[int(n) for n in a.shape], a.dtype.name, i, info]
+        self.data[name + '.'] = {'ndarray': record}
+        self.fd.write(buf)
+        if delta:
+            self.previous[path] = (record, decoded, ndeltas)
+
     def child(self, name):
         """Create child-writer object."""
         self._write_header()
         dct = self.data[name + '.'] = {}
-        return Writer(self.fd, data=dct)
+        child = Writer(self.fd, data=dct)
+        child.encoding = self.encoding
+        child.path = self.path + name + '.'
+        child.previous = self.previous
+        return child
 
     def close(self):
         """Close file."""
@@ -467,10 +581,13 @@ class InvalidULMFileError(IOError):
 
 
 class Reader:
-    def __init__(self, fd, index=0, data=None, _little_endian=None):
+    def __init__(self, fd, index=0, data=None, _little_endian=None,
+                 _cache=None):
         """Create reader."""
 
         self._little_endian = _little_endian
+        # Decoded arrays used as reference by delta-encoded arrays
+        self._cache = {} if _cache is None else _cache
 
         if not hasattr(fd, 'read'):
             fd = Path(fd).open('rb')
@@ -499,16 +616,19 @@ class Reader:
         for name, value in data.items():
             if name.endswith('.'):
                 if 'ndarray' in value:
-                    shape, dtype, offset = value['ndarray']
+                    shape, dtype, offset, *encoding = value['ndarray']
                     dtype = dtype.encode()  # compatibility with Numpy 1.4
                     value = NDArrayReader(self._fd,
                                           shape,
                                           np.dtype(dtype),
                                           offset,
-                                          self._little_endian)
+                                          self._little_endian,
+                                          *encoding,
+                                          cache=self._cache)
                 else:
                     value = Reader(self._fd, data=value,
-                                   _little_endian=self._little_endian)
+                                   _little_endian=self._little_endian,
+                                   _cache=self._cache)
                 name = name[:-1]
 
             self._data[name] = value
@@ -581,7 +701,8 @@ class Reader:
     def __getitem__(self, index):
         """Return Reader for item *index*."""
         data = self._read_data(index)
-        return Reader(self._fd, index, data, self._little_endian)
+        return Reader(self._fd, index, data, self._little_endian,
+                      self._cache)
 
     def tostr(self, verbose=False, indent='    '):
         keys = sorted(self._data)
@@ -608,13 +729,16 @@ class Reader:
 
 
 class NDArrayReader:
-    def __init__(self, fd, shape, dtype, offset, little_endian):
+    def __init__(self, fd, shape, dtype, offset, little_endian,
+                 encoding=None, cache=None):
         self.fd = fd
         self.hasfileno = file_has_fileno(fd)
         self.shape = tuple(shape)
         self.dtype = dtype
         self.offset = offset
         self.little_endian = little_endian
+        self.encoding = encoding
+        self.cache = {} if cache is None else cache
 
         self.ndim = len(self.shape)
         self.itemsize = dtype.itemsize
@@ -631,6 +755,13 @@ class NDArrayReader:
         return self[:]
 
     def __getitem__(self, i):
+        if self.encoding is not None:
+            a = self._decode().astype(self.dtype)
+            if self.length_of_last_dimension is not None:
+                a = a[..., :self.length_of_last_dimension]
+            if self.scale != 1.0:
+                a *= self.scale
+            return a[i]
         if isinstance(i, numbers.Integral):
             if i < 0:
                 i += len(self)
@@ -658,7 +789,42 @@ class NDArrayReader:
             a *= self.scale
         return a
 
+    def _decode(self):
+        """Read encoded array in the data type it is stored as."""
+        a = self.cache.get(self.offset)
+        if a is not None:
+            return a
+
+        dtype = np.dtype(self.encoding.get('stored_as', self.dtype))
+        self.fd.seek(self.offset)
+        if 'compression' in self.encoding:
+            decompress = compressors[self.encoding['compression']][1]
+            a = unshuffle(decompress(self.fd.read(self.encoding['nbytes'])),
+                          dtype)
+        else:
+            a = np.frombuffer(self.fd.read(int(self.size * dtype.itemsize)),
+                              dtype)
+        if self.little_endian != np.little_endian:
+            a = a.byteswap()
+        a = a.reshape(self.shape)
+
+        if 'delta' in self.encoding:
+            shape, dtype, offset, encoding = self.encoding['delta']
+            reference = NDArrayReader(self.fd, shape, np.dtype(dtype),
+                                      offset, self.little_endian, encoding,
+                                      self.cache)
+            a = reference._decode() + a
+
+        # Keep the last few arrays, which may be needed by the next item
+        if len(self.cache) >= 8:
+            del self.cache[next(iter(self.cache))]
+        self.cache[self.offset] = a
+        return a
+
     def proxy(self, *indices):
+        if self.encoding is not None:
+            # Encoded arrays are read as a whole anyway
+            return self.read()[indices]
         stride = self.size // len(self)
         start = 0
         for i, index in enumerate(indices):
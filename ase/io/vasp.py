@@ -17,7 +17,8 @@ from pathlib import Path
 
 __all__ = [
     'read_vasp', 'read_vasp_out', 'iread_vasp_out', 'read_vasp_xdatcar',
-    'read_vasp_xml', 'write_vasp', 'write_vasp_xdatcar'
+    'read_vasp_xml', 'index_vasp_xml',
+    'write_vasp', 'write_vasp_xdatcar'
 ]
 
 
@@ -251,21 +252,81 @@ def read_vasp(filename='CONTCAR'):
     return atoms
 
 
-def iread_vasp_out(filename, index=-1):
-    """Import OUTCAR type file, as a generator."""
-    it = ImageIterator(vop.outcarchunks)
-    return it(filename, index=index)
+def iread_vasp_out(filename, index=-1, properties=None):
+    """Import OUTCAR type file, as a generator.
+
+    properties: list of str
+        Results to read, e.g. ['energy', 'forces'].  Default is all.
+
+    Regular files are memory mapped and only the requested ionic steps
+    are decoded and parsed."""
+    chunk_parser = vop.OutcarChunkParser(properties=properties)
+    data = _mmap_vasp_out(filename)
+    if data is None:
+        def chunks(fd):
+            return vop.outcarchunks(fd, chunk_parser=chunk_parser)
+        it = ImageIterator(chunks)
+        return it(filename, index=index)
+    return _iread_vasp_out_mmap(filename, data, index, chunk_parser)
+
+
+def _mmap_vasp_out(fd):
+    """Memory map the file of fd, or return None if it is not a regular
+    uncompressed file."""
+    import io
+    import mmap
+
+    buffer = getattr(fd, 'buffer', fd)
+    if not isinstance(buffer, io.BufferedReader):
+        return None
+    try:
+        return mmap.mmap(buffer.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        # Empty files cannot be mapped
+        return None
+
+
+def _iread_vasp_out_mmap(fd, data, index, chunk_parser):
+    import io
+    from ase.io.formats import string2index
+
+    encoding = getattr(fd, 'encoding', None)
+
+    def getlines(start, end):
+        # Same newline handling as when reading the file in text mode
+        text = data[start:end].decode(encoding or 'utf-8')
+        return list(io.StringIO(text, newline=None))
+
+    try:
+        header_end, offsets = vop.index_outcar(data)
+        header_parser = vop.OutcarHeaderParser(workdir=Path(fd.name).parent)
+        header = header_parser.build(getlines(0, header_end))
+
+        if isinstance(index, str):
+            index = string2index(index)
+        if index is None:
+            index = slice(None)
+        elif not isinstance(index, slice):
+            index = slice(index, (index + 1) or None)
+
+        for i in range(len(offsets))[index]:
+            chunk = vop.OUTCARChunk(getlines(*offsets[i]), header,
+                                    parser=chunk_parser)
+            yield chunk.build()
+    finally:
+        data.close()
 
 
 @reader
-def read_vasp_out(filename='OUTCAR', index=-1):
+def read_vasp_out(filename='OUTCAR', index=-1, properties=None):
     """Import OUTCAR type file.
 
     Reads unitcell, atom positions, energies, and forces from the OUTCAR file
     and attempts to read constraints (if any) from CONTCAR/POSCAR, if present.
+    Use properties, e.g. ['energy'], to only read some of the results.
     """
     # "filename" is actually a file-descriptor thanks to @reader
-    g = iread_vasp_out(filename, index=index)
+    g = iread_vasp_out(filename, index=index, properties=properties)
     # Code borrowed from formats.py:read
     if isinstance(index, (slice, str)):
         # Return list of atoms
@@ -360,247 +421,489 @@ def __get_xml_parameter(par):
         return None
 
 
-def read_vasp_xml(filename='vasprun.xml', index=-1):
-    """Parse vasprun.xml file.
+def index_vasp_xml(filename='vasprun.xml'):
+    """Find the calculation blocks of a vasprun.xml file.
 
-    Reads unit cell, atom positions, energies, forces, and constraints
-    from vasprun.xml file
+    The file is only scanned for the ``<calculation>`` and
+    ``</calculation>`` tags, which is much faster than parsing the XML.
+
+    filename: str or file
+        File name or a seekable file opened in binary mode.
+
+    Returns a list of (start, end) byte offsets of the complete
+    calculation blocks, which can be passed to read_vasp_xml().
     """
+    if isinstance(filename, (str, Path)):
+        with open(filename, 'rb') as fd:
+            return index_vasp_xml(fd)
+    return [block for block in _index_vasp_xml(filename)
+            if block[1] is not None]
+
+
+def _index_vasp_xml(fd):
+    """Return the (start, end) byte offsets of the calculation blocks.
+
+    An incomplete last block is included with end=None."""
+    fd.seek(0)
+    regex = re.compile(rb'<(/?)calculation>')
+    maxlen = len(b'</calculation>')
+    blocks = []
+    start = None
+    pos = 0  # position of data in the file
+    data = b''
+    while True:
+        chunk = fd.read(2**22)
+        if not chunk:
+            if start is not None:
+                blocks.append((start, None))
+            return blocks
+        data += chunk
+        end = 0
+        for match in regex.finditer(data):
+            if match.group(1):
+                if start is not None:
+                    blocks.append((start, pos + match.end()))
+                start = None
+            else:
+                start = pos + match.start()
+            end = match.end()
+        # Keep the end of the data, which may contain part of a tag
+        keep = max(end, len(data) - maxlen + 1)
+        pos += keep
+        data = data[keep:]
+
+
+def _binary_vasp_xml_file(filename):
+    """Return a seekable binary file for filename, or None."""
+    if isinstance(filename, (str, Path)):
+        return open(filename, 'rb')
+    import io
+    fd = getattr(filename, 'buffer', filename)
+    if isinstance(fd, io.TextIOBase) or not hasattr(fd, 'seekable'):
+        return None
+    if not fd.seekable():
+        return None
+    return fd
 
-    import xml.etree.ElementTree as ET
+
+def _parse_vasp_xml_header(elem, header):
+    """Store the information from elem, which is needed to build the
+    Atoms of each calculation, in the header dict."""
     from ase.constraints import FixAtoms, FixScaled
+    from collections import OrderedDict
+
+    if elem.tag == 'kpoints':
+        for subelem in elem.iter(tag='generation'):
+            kpts_params = OrderedDict()
+            header['parameters']['kpoints_generation'] = kpts_params
+            for par in subelem.iter():
+                if par.tag in ['v', 'i']:
+                    parname = par.attrib['name'].lower()
+                    kpts_params[parname] = __get_xml_parameter(par)
+
+        kpts = elem.findall("varray[@name='kpointlist']/v")
+        ibz_kpts = np.zeros((len(kpts), 3))
+
+        for i, kpt in enumerate(kpts):
+            ibz_kpts[i] = [float(val) for val in kpt.text.split()]
+
+        kpt_weights = elem.findall('varray[@name="weights"]/v')
+        header['kpt_weights'] = [float(val.text) for val in kpt_weights]
+        header['ibz_kpts'] = ibz_kpts
+
+    elif elem.tag == 'parameters':
+        for par in elem.iter():
+            if par.tag in ['v', 'i']:
+                parname = par.attrib['name'].lower()
+                header['parameters'][parname] = __get_xml_parameter(par)
+
+    elif elem.tag == 'atominfo':
+        species = []
+
+        for entry in elem.find("array[@name='atoms']/set"):
+            species.append(entry[0].text.strip())
+
+        header['species'] = species
+
+    elif (elem.tag == 'structure'
+          and elem.attrib.get('name') == 'initialpos'):
+        natoms = len(header['species'])
+        cell_init = np.zeros((3, 3), dtype=float)
+
+        for i, v in enumerate(
+                elem.find("crystal/varray[@name='basis']")):
+            cell_init[i] = np.array(
+                [float(val) for val in v.text.split()])
+
+        scpos_init = np.zeros((natoms, 3), dtype=float)
+
+        for i, v in enumerate(
+                elem.find("varray[@name='positions']")):
+            scpos_init[i] = np.array(
+                [float(val) for val in v.text.split()])
+
+        constraints = []
+        fixed_indices = []
+
+        for i, entry in enumerate(
+                elem.findall("varray[@name='selective']/v")):
+            flags = (np.array(
+                entry.text.split() == np.array(['F', 'F', 'F'])))
+            if flags.all():
+                fixed_indices.append(i)
+            elif flags.any():
+                constraints.append(FixScaled(cell_init, i, flags))
+
+        if fixed_indices:
+            constraints.append(FixAtoms(fixed_indices))
+
+        header['atoms_init'] = Atoms(header['species'],
+                                     cell=cell_init,
+                                     scaled_positions=scpos_init,
+                                     constraint=constraints,
+                                     pbc=True)
+
+
+def _prune_vasp_xml_element(elem, read_eigenvalues):
+    """Remove the data of elem, a child of a calculation element, which
+    is not used by _read_vasp_xml_calculation()."""
+    if elem.tag == 'dos':
+        # Only the Fermi energy is used
+        for child in list(elem):
+            if child.attrib.get('name') != 'efermi':
+                elem.remove(child)
+    elif elem.tag == 'projected' or (elem.tag == 'eigenvalues' and
+                                     not read_eigenvalues):
+        elem.clear()
+
+
+def _read_vasp_xml_calculation(step, header, read_eigenvalues=True):
+    """Build the Atoms object of a calculation element."""
     from ase.calculators.singlepoint import (SinglePointDFTCalculator,
                                              SinglePointKPoint)
     from ase.units import GPa
+
+    natoms = len(header['species'])
+    ibz_kpts = header['ibz_kpts']
+    kpt_weights = header['kpt_weights']
+
+    # Workaround for VASP bug, e_0_energy contains the wrong value
+    # in calculation/energy, but calculation/scstep/energy does not
+    # include classical VDW corrections. So, first calculate
+    # e_0_energy - e_fr_energy from calculation/scstep/energy, then
+    # apply that correction to e_fr_energy from calculation/energy.
+    lastscf = step.findall('scstep/energy')[-1]
+    dipoles = step.findall('scstep/dipole')
+    if dipoles:
+        lastdipole = dipoles[-1]
+    else:
+        lastdipole = None
+
+    de = (float(lastscf.find('i[@name="e_0_energy"]').text) -
+          float(lastscf.find('i[@name="e_fr_energy"]').text))
+
+    free_energy = float(step.find('energy/i[@name="e_fr_energy"]').text)
+    energy = free_energy + de
+
+    cell = np.zeros((3, 3), dtype=float)
+    for i, vector in enumerate(
+            step.find('structure/crystal/varray[@name="basis"]')):
+        cell[i] = np.array([float(val) for val in vector.text.split()])
+
+    scpos = np.zeros((natoms, 3), dtype=float)
+    for i, vector in enumerate(
+            step.find('structure/varray[@name="positions"]')):
+        scpos[i] = np.array([float(val) for val in vector.text.split()])
+
+    forces = None
+    fblocks = step.find('varray[@name="forces"]')
+    if fblocks is not None:
+        forces = np.zeros((natoms, 3), dtype=float)
+        for i, vector in enumerate(fblocks):
+            forces[i] = np.array(
+                [float(val) for val in vector.text.split()])
+
+    stress = None
+    sblocks = step.find('varray[@name="stress"]')
+    if sblocks is not None:
+        stress = np.zeros((3, 3), dtype=float)
+        for i, vector in enumerate(sblocks):
+            stress[i] = np.array(
+                [float(val) for val in vector.text.split()])
+        stress *= -0.1 * GPa
+        stress = stress.reshape(9)[[0, 4, 8, 5, 2, 1]]
+
+    dipole = None
+    if lastdipole is not None:
+        dblock = lastdipole.find('v[@name="dipole"]')
+        if dblock is not None:
+            dipole = np.zeros((1, 3), dtype=float)
+            dipole = np.array([float(val) for val in dblock.text.split()])
+
+    dblock = step.find('dipole/v[@name="dipole"]')
+    if dblock is not None:
+        dipole = np.zeros((1, 3), dtype=float)
+        dipole = np.array([float(val) for val in dblock.text.split()])
+
+    efermi = step.find('dos/i[@name="efermi"]')
+    if efermi is not None:
+        efermi = float(efermi.text)
+
+    kpoints = []
+    nkpts = len(ibz_kpts) if read_eigenvalues else 0
+    for ikpt in range(1, nkpts + 1):
+        kblocks = step.findall(
+            'eigenvalues/array/set/set/set[@comment="kpoint %d"]' % ikpt)
+        if kblocks is not None:
+            for spin, kpoint in enumerate(kblocks):
+                eigenvals = kpoint.findall('r')
+                eps_n = np.zeros(len(eigenvals))
+                f_n = np.zeros(len(eigenvals))
+                for j, val in enumerate(eigenvals):
+                    val = val.text.split()
+                    eps_n[j] = float(val[0])
+                    f_n[j] = float(val[1])
+                if len(kblocks) == 1:
+                    f_n *= 2
+                kpoints.append(
+                    SinglePointKPoint(kpt_weights[ikpt - 1], spin, ikpt,
+                                      eps_n, f_n))
+    if len(kpoints) == 0:
+        kpoints = None
+
+    # DFPT properties
+    # dielectric tensor
+    dielectric_tensor = None
+    sblocks = step.find('varray[@name="dielectric_dft"]')
+    if sblocks is not None:
+        dielectric_tensor = np.zeros((3, 3), dtype=float)
+        for ii, vector in enumerate(sblocks):
+            dielectric_tensor[ii] = np.fromstring(vector.text, sep=' ')
+
+    # Born effective charges
+    born_charges = None
+    fblocks = step.find('array[@name="born_charges"]')
+    if fblocks is not None:
+        born_charges = np.zeros((natoms, 3, 3), dtype=float)
+        for ii, block in enumerate(fblocks[1:]):  # 1. element = dimension
+            for jj, vector in enumerate(block):
+                born_charges[ii, jj] = np.fromstring(vector.text, sep=' ')
+
+    atoms = header['atoms_init'].copy()
+    atoms.set_cell(cell)
+    atoms.set_scaled_positions(scpos)
+    atoms.calc = SinglePointDFTCalculator(
+        atoms,
+        energy=energy,
+        forces=forces,
+        stress=stress,
+        free_energy=free_energy,
+        ibzkpts=ibz_kpts,
+        efermi=efermi,
+        dipole=dipole,
+        dielectric_tensor=dielectric_tensor,
+        born_effective_charges=born_charges
+    )
+    atoms.calc.name = 'vasp'
+    atoms.calc.kpts = kpoints
+    atoms.calc.parameters = header['parameters']
+    return atoms
+
+
+def _new_vasp_xml_header():
     from collections import OrderedDict
+    return {'atoms_init': None, 'species': [], 'ibz_kpts': None,
+            'kpt_weights': None, 'parameters': OrderedDict()}
+
+
+def _seek_vasp_xml(fd, index, read_eigenvalues, offsets):
+    """Read the calculations selected by index from the byte offsets of
+    the calculation blocks."""
+    import xml.etree.ElementTree as ET
+
+    fd.seek(0)
+    data = fd.read(offsets[0][0])
+    declaration = b''
+    if data.startswith(b'<?xml'):
+        declaration = data[:data.index(b'?>') + 2]
+    header = _new_vasp_xml_header()
+    parser = ET.XMLPullParser(events=['end'])
+    parser.feed(data)
+    for event, elem in parser.read_events():
+        _parse_vasp_xml_header(elem, header)
+
+    def parse(start, end):
+        fd.seek(start)
+        parser = ET.XMLPullParser(events=['start'])
+        parser.feed(declaration + b'<modeling>')
+        parser.feed(fd.read() if end is None else fd.read(end - start))
+        calculation = None
+        for event, elem in parser.read_events():
+            if calculation is None and elem.tag == 'calculation':
+                calculation = elem
+        return calculation
+
+    # An incomplete last calculation is only used if it has an energy
+    offsets = list(offsets)
+    last = None
+    if offsets and offsets[-1][1] is None:
+        last = parse(*offsets[-1])
+        if last is None or last.find('energy') is None:
+            offsets.pop()
+            last = None
+        if not offsets:
+            yield header['atoms_init']
+            return
+
+    if isinstance(index, int):
+        selected = [range(len(offsets))[index]]
+    else:
+        selected = range(len(offsets))[index]
+
+    for i in selected:
+        if last is not None and i == len(offsets) - 1:
+            elem = last
+        else:
+            elem = parse(*offsets[i])
+        yield _read_vasp_xml_calculation(elem, header, read_eigenvalues)
+
+
+def read_vasp_xml(filename='vasprun.xml', index=-1, read_eigenvalues=True,
+                  offsets=None):
+    """Parse vasprun.xml file.
+
+    Reads unit cell, atom positions, energies, forces, and constraints
+    from vasprun.xml file
+
+    The file is parsed incrementally and only the requested calculations
+    are converted to Atoms objects, while the parsed XML of the other
+    calculations is discarded.  The densities of states and projected
+    eigenvalues are never kept.
+
+    read_eigenvalues: bool
+        Read the eigenvalues and occupations of each k-point.  Use False
+        to skip them.
+    offsets: list of (int, int)
+        Byte offsets of the calculation blocks from index_vasp_xml().
+        The calculations are then read by seeking to them, which requires
+        a file name or a seekable file with a binary buffer.  Negative
+        indices use the offsets found by index_vasp_xml() automatically
+        if possible.
+    """
+
+    import xml.etree.ElementTree as ET
+
+    if isinstance(index, str):
+        from ase.io.formats import string2index
+        index = string2index(index)
+    if isinstance(index, int):
+        streaming = index >= 0
+        start, stop, step = index, index + 1, 1
+    else:
+        start = 0 if index.start is None else index.start
+        step = 1 if index.step is None else index.step
+        stop = index.stop
+        streaming = (start >= 0 and step > 0 and
+                     (stop is None or stop >= 0))
+
+    # Seeking to the calculations is faster unless all calculations
+    # from the first requested one are read
+    if offsets is not None or not streaming or (stop is None and step > 1):
+        fd = _binary_vasp_xml_file(filename)
+        if fd is not None:
+            try:
+                if offsets is None:
+                    offsets = _index_vasp_xml(fd)
+                if offsets:
+                    yield from _seek_vasp_xml(fd, index, read_eigenvalues,
+                                              offsets)
+                    return
+                fd.seek(0)
+            finally:
+                if fd is not getattr(filename, 'buffer', filename):
+                    fd.close()
+
+    def selected(i):
+        return i >= start and (i - start) % step == 0 and (
+            stop is None or i < stop)
 
     tree = ET.iterparse(filename, events=['start', 'end'])
 
-    atoms_init = None
-    calculation = []
-    ibz_kpts = None
-    kpt_weights = None
-    parameters = OrderedDict()
+    header = _new_vasp_xml_header()
+    header_tags = {'kpoints', 'parameters', 'atominfo', 'structure'}
+    depth = 0
+    ncalculations = 0
+    # Calculations which have started but not ended, with their index,
+    # depth and whether they are requested
+    open_calculations = []
+    # All calculations, if the index cannot be evaluated while parsing
+    calculations = []
+    truncated = False
 
     try:
         for event, elem in tree:
+            if event == 'start':
+                depth += 1
+                if elem.tag == 'calculation':
+                    open_calculations.append(
+                        (ncalculations, elem, depth,
+                         not streaming or selected(ncalculations)))
+                    ncalculations += 1
+                continue
+
+            depth -= 1
+            tag = elem.tag
+
+            if tag == 'calculation':
+                i = open_calculations.pop()[0]
+                if not streaming:
+                    calculations.append(elem)
+                    continue
+                if selected(i):
+                    yield _read_vasp_xml_calculation(elem, header,
+                                                     read_eigenvalues)
+                elem.clear()
+                if stop is not None and i + 1 >= stop:
+                    return
+                continue
+
+            if tag in header_tags:
+                _parse_vasp_xml_header(elem, header)
 
-            if event == 'end':
-                if elem.tag == 'kpoints':
-                    for subelem in elem.iter(tag='generation'):
-                        kpts_params = OrderedDict()
-                        parameters['kpoints_generation'] = kpts_params
-                        for par in subelem.iter():
-                            if par.tag in ['v', 'i']:
-                                parname = par.attrib['name'].lower()
-                                kpts_params[parname] = __get_xml_parameter(par)
-
-                    kpts = elem.findall("varray[@name='kpointlist']/v")
-                    ibz_kpts = np.zeros((len(kpts), 3))
-
-                    for i, kpt in enumerate(kpts):
-                        ibz_kpts[i] = [float(val) for val in kpt.text.split()]
-
-                    kpt_weights = elem.findall('varray[@name="weights"]/v')
-                    kpt_weights = [float(val.text) for val in kpt_weights]
-
-                elif elem.tag == 'parameters':
-                    for par in elem.iter():
-                        if par.tag in ['v', 'i']:
-                            parname = par.attrib['name'].lower()
-                            parameters[parname] = __get_xml_parameter(par)
-
-                elif elem.tag == 'atominfo':
-                    species = []
-
-                    for entry in elem.find("array[@name='atoms']/set"):
-                        species.append(entry[0].text.strip())
-
-                    natoms = len(species)
-
-                elif (elem.tag == 'structure'
-                      and elem.attrib.get('name') == 'initialpos'):
-                    cell_init = np.zeros((3, 3), dtype=float)
-
-                    for i, v in enumerate(
-                            elem.find("crystal/varray[@name='basis']")):
-                        cell_init[i] = np.array(
-                            [float(val) for val in v.text.split()])
-
-                    scpos_init = np.zeros((natoms, 3), dtype=float)
-
-                    for i, v in enumerate(
-                            elem.find("varray[@name='positions']")):
-                        scpos_init[i] = np.array(
-                            [float(val) for val in v.text.split()])
-
-                    constraints = []
-                    fixed_indices = []
-
-                    for i, entry in enumerate(
-                            elem.findall("varray[@name='selective']/v")):
-                        flags = (np.array(
-                            entry.text.split() == np.array(['F', 'F', 'F'])))
-                        if flags.all():
-                            fixed_indices.append(i)
-                        elif flags.any():
-                            constraints.append(FixScaled(cell_init, i, flags))
-
-                    if fixed_indices:
-                        constraints.append(FixAtoms(fixed_indices))
-
-                    atoms_init = Atoms(species,
-                                       cell=cell_init,
-                                       scaled_positions=scpos_init,
-                                       constraint=constraints,
-                                       pbc=True)
-
-                elif elem.tag == 'dipole':
-                    dblock = elem.find('v[@name="dipole"]')
-                    if dblock is not None:
-                        dipole = np.array(
-                            [float(val) for val in dblock.text.split()])
-
-            elif event == 'start' and elem.tag == 'calculation':
-                calculation.append(elem)
+            if open_calculations and depth == open_calculations[-1][2]:
+                # elem is a child of a calculation
+                if open_calculations[-1][3]:
+                    _prune_vasp_xml_element(elem, read_eigenvalues)
+                else:
+                    elem.clear()
+            elif depth == 1:
+                elem.clear()
 
     except ET.ParseError as parse_error:
-        if atoms_init is None:
+        if header['atoms_init'] is None:
             raise parse_error
-        if calculation and calculation[-1].find("energy") is None:
-            calculation = calculation[:-1]
-        if not calculation:
-            yield atoms_init
-
-    if calculation:
-        if isinstance(index, int):
-            steps = [calculation[index]]
-        else:
-            steps = calculation[index]
+        truncated = True
+
+    # Calculations which did not end in a truncated file are used
+    # if they have an energy
+    if open_calculations and open_calculations[-1][1].find('energy') is None:
+        open_calculations.pop()
+        ncalculations -= 1
+    if truncated and ncalculations == 0:
+        yield header['atoms_init']
+        return
+
+    if streaming:
+        steps = [calc[1] for calc in open_calculations if calc[3]]
     else:
-        steps = []
-
-    for step in steps:
-        # Workaround for VASP bug, e_0_energy contains the wrong value
-        # in calculation/energy, but calculation/scstep/energy does not
-        # include classical VDW corrections. So, first calculate
-        # e_0_energy - e_fr_energy from calculation/scstep/energy, then
-        # apply that correction to e_fr_energy from calculation/energy.
-        lastscf = step.findall('scstep/energy')[-1]
-        dipoles = step.findall('scstep/dipole')
-        if dipoles:
-            lastdipole = dipoles[-1]
+        calculations += [calc[1] for calc in open_calculations]
+        if isinstance(index, int):
+            steps = [calculations[index]]
         else:
-            lastdipole = None
-
-        de = (float(lastscf.find('i[@name="e_0_energy"]').text) -
-              float(lastscf.find('i[@name="e_fr_energy"]').text))
-
-        free_energy = float(step.find('energy/i[@name="e_fr_energy"]').text)
-        energy = free_energy + de
-
-        cell = np.zeros((3, 3), dtype=float)
-        for i, vector in enumerate(
-                step.find('structure/crystal/varray[@name="basis"]')):
-            cell[i] = np.array([float(val) for val in vector.text.split()])
-
-        scpos = np.zeros((natoms, 3), dtype=float)
-        for i, vector in enumerate(
-                step.find('structure/varray[@name="positions"]')):
-            scpos[i] = np.array([float(val) for val in vector.text.split()])
-
-        forces = None
-        fblocks = step.find('varray[@name="forces"]')
-        if fblocks is not None:
-            forces = np.zeros((natoms, 3), dtype=float)
-            for i, vector in enumerate(fblocks):
-                forces[i] = np.array(
-                    [float(val) for val in vector.text.split()])
-
-        stress = None
-        sblocks = step.find('varray[@name="stress"]')
-        if sblocks is not None:
-            stress = np.zeros((3, 3), dtype=float)
-            for i, vector in enumerate(sblocks):
-                stress[i] = np.array(
-                    [float(val) for val in vector.text.split()])
-            stress *= -0.1 * GPa
-            stress = stress.reshape(9)[[0, 4, 8, 5, 2, 1]]
-
-        dipole = None
-        if lastdipole is not None:
-            dblock = lastdipole.find('v[@name="dipole"]')
-            if dblock is not None:
-                dipole = np.zeros((1, 3), dtype=float)
-                dipole = np.array([float(val) for val in dblock.text.split()])
-
-        dblock = step.find('dipole/v[@name="dipole"]')
-        if dblock is not None:
-            dipole = np.zeros((1, 3), dtype=float)
-            dipole = np.array([float(val) for val in dblock.text.split()])
+            steps = calculations[index]
 
-        efermi = step.find('dos/i[@name="efermi"]')
-        if efermi is not None:
-            efermi = float(efermi.text)
-
-        kpoints = []
-        for ikpt in range(1, len(ibz_kpts) + 1):
-            kblocks = step.findall(
-                'eigenvalues/array/set/set/set[@comment="kpoint %d"]' % ikpt)
-            if kblocks is not None:
-                for spin, kpoint in enumerate(kblocks):
-                    eigenvals = kpoint.findall('r')
-                    eps_n = np.zeros(len(eigenvals))
-                    f_n = np.zeros(len(eigenvals))
-                    for j, val in enumerate(eigenvals):
-                        val = val.text.split()
-                        eps_n[j] = float(val[0])
-                        f_n[j] = float(val[1])
-                    if len(kblocks) == 1:
-                        f_n *= 2
-                    kpoints.append(
-                        SinglePointKPoint(kpt_weights[ikpt - 1], spin, ikpt,
-                                          eps_n, f_n))
-        if len(kpoints) == 0:
-            kpoints = None
-
-        # DFPT properties
-        # dielectric tensor
-        dielectric_tensor = None
-        sblocks = step.find('varray[@name="dielectric_dft"]')
-        if sblocks is not None:
-            dielectric_tensor = np.zeros((3, 3), dtype=float)
-            for ii, vector in enumerate(sblocks):
-                dielectric_tensor[ii] = np.fromstring(vector.text, sep=' ')
-
-        # Born effective charges
-        born_charges = None
-        fblocks = step.find('array[@name="born_charges"]')
-        if fblocks is not None:
-            born_charges = np.zeros((natoms, 3, 3), dtype=float)
-            for ii, block in enumerate(fblocks[1:]):  # 1. element = dimension
-                for jj, vector in enumerate(block):
-                    born_charges[ii, jj] = np.fromstring(vector.text, sep=' ')
-
-        atoms = atoms_init.copy()
-        atoms.set_cell(cell)
-        atoms.set_scaled_positions(scpos)
-        atoms.calc = SinglePointDFTCalculator(
-            atoms,
-            energy=energy,
-            forces=forces,
-            stress=stress,
-            free_energy=free_energy,
-            ibzkpts=ibz_kpts,
-            efermi=efermi,
-            dipole=dipole,
-            dielectric_tensor=dielectric_tensor,
-            born_effective_charges=born_charges
-        )
-        atoms.calc.name = 'vasp'
-        atoms.calc.kpts = kpoints
-        atoms.calc.parameters = parameters
-        yield atoms
+    for elem in steps:
+        yield _read_vasp_xml_calculation(elem, header, read_eigenvalues)
 
 
 @writer
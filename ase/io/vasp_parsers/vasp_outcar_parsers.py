@@ -2,9 +2,11 @@
 Module for parsing OUTCAR files.
 """
 from abc import ABC, abstractmethod
-from typing import (Dict, Any, Sequence, TextIO, Iterator, Optional, Union,
-                    List)
+from typing import (Dict, Any, Sequence, TextIO, Iterable, Iterator,
+                    Optional, Union, List, Tuple)
 import re
+from bisect import bisect_right
+from itertools import accumulate
 from warnings import warn
 from pathlib import Path, PurePath
 
@@ -115,6 +117,12 @@ class VaspPropertyParser(ABC):
         """Function which checks if a property can be derived from a given
         cursor position"""
 
+    def line_filter(self) -> Optional[str]:
+        """Text which is in every line where "has_property" can be True.
+        The other lines are skipped without calling "has_property".
+        None means that all lines are checked"""
+        return None
+
     @staticmethod
     def get_line(cursor: _CURSOR, lines: _CHUNK) -> str:
         """Helper function to get a line, and apply the check_line function"""
@@ -139,6 +147,11 @@ class SimpleProperty(VaspPropertyParser, ABC):
         line = lines[cursor]
         return self.LINE_DELIMITER in line
 
+    def line_filter(self) -> Optional[str]:
+        if type(self).has_property is SimpleProperty.has_property:
+            return self.LINE_DELIMITER
+        return None
+
 
 class VaspChunkPropertyParser(VaspPropertyParser, ABC):
     """Base class for parsing a chunk of the OUTCAR.
@@ -293,6 +306,9 @@ class KpointHeader(VaspHeaderPropertyParser):
         line = lines[cursor]
         return "NKPTS" in line and "NBANDS" in line
 
+    def line_filter(self) -> Optional[str]:
+        return "NKPTS"
+
     def parse(self, cursor: _CURSOR, lines: _CHUNK) -> _RESULT:
         line = lines[cursor].strip()
         parts = line.split()
@@ -388,6 +404,9 @@ class Magmom(VaspChunkPropertyParser):
                 return True
         return False
 
+    def line_filter(self) -> Optional[str]:
+        return 'number of electron'
+
     def parse(self, cursor: _CURSOR, lines: _CHUNK) -> _RESULT:
         line = self.get_line(cursor, lines)
         parts = line.split()
@@ -475,6 +494,9 @@ class Kpoints(VaspChunkPropertyParser):
                     return True
         return False
 
+    def line_filter(self) -> Optional[str]:
+        return 'spin component 1'
+
     def parse(self, cursor: _CURSOR, lines: _CHUNK) -> _RESULT:
         nkpts = self.get_from_header('nkpts')
         nbands = self.get_from_header('nbands')
@@ -540,10 +562,13 @@ class DefaultParsersContainer:
     def parsers_dct(self) -> dict:
         return self._parsers_dct
 
-    def make_parsers(self):
+    def make_parsers(self, names: Optional[Sequence[str]] = None):
         """Return a copy of the internally stored parsers.
-        Parsers are created upon request."""
-        return list(parser() for parser in self.parsers_dct.values())
+        Parsers are created upon request.
+
+        If names is given, only the parsers with those names are made."""
+        return list(parser() for name, parser in self.parsers_dct.items()
+                    if names is None or name in names)
 
     def remove_parser(self, name: str):
         """Remove a parser based on the name.
@@ -577,19 +602,37 @@ class TypeParser(ABC):
 
     def parse(self, lines) -> _RESULT:
         """Execute the attached paresers, and return the parsed properties"""
+        # Find the lines where each parser can extract a property,
+        # only checking the lines which pass the filter of the parser
+        text = ''.join(lines)
+        ends = list(accumulate(len(line) for line in lines))
+        found: List[Tuple[int, int]] = []
+        for i, parser in enumerate(self.parsers):
+            line_filter = parser.line_filter()
+            cursors: Iterable[int]
+            if line_filter is None:
+                cursors = range(len(lines))
+            else:
+                matches = []
+                pos = text.find(line_filter)
+                while pos >= 0:
+                    cursor = bisect_right(ends, pos)
+                    matches.append(cursor)
+                    pos = text.find(line_filter, ends[cursor])
+                cursors = matches
+            found.extend((cursor, i) for cursor in cursors
+                         if parser.has_property(cursor, lines))
+
+        # Parse line by line in the order of the parsers.  Note: This
+        # will override any existing properties we found, if we found it
+        # previously. This is usually correct, as some VASP settings can
+        # cause certain pieces of information to be written multiple
+        # times during SCF. We are only interested in the final values
+        # within a given chunk.
         properties = {}
-        for cursor, _ in enumerate(lines):
-            for parser in self.parsers:
-                # Check if any of the parsers can extract a property
-                # from this line Note: This will override any existing
-                # properties we found, if we found it previously. This
-                # is usually correct, as some VASP settings can cause
-                # certain pieces of information to be written multiple
-                # times during SCF. We are only interested in the
-                # final values within a given chunk.
-                if parser.has_property(cursor, lines):
-                    prop = parser.parse(cursor, lines)
-                    properties.update(prop)
+        for cursor, i in sorted(found):
+            prop = self.parsers[i].parse(cursor, lines)
+            properties.update(prop)
         return properties
 
 
@@ -642,12 +685,25 @@ class HeaderParser(TypeParser, ABC):
 
 
 class OutcarChunkParser(ChunkParser):
-    """Class for parsing a chunk of an OUTCAR."""
+    """Class for parsing a chunk of an OUTCAR.
+
+    If properties, e.g. ['energy', 'forces'], is given, only the default
+    parsers needed for those properties are used, in addition to the
+    ones for the cell and positions."""
 
     def __init__(self,
                  header: _HEADER = None,
-                 parsers: Sequence[VaspChunkPropertyParser] = None):
+                 parsers: Sequence[VaspChunkPropertyParser] = None,
+                 properties: Optional[Sequence[str]] = None):
         global default_chunk_parsers
+        if parsers is None and properties is not None:
+            names = {'Cell', 'PositionsAndForces'}
+            for prop in properties:
+                if prop not in property_parsers:
+                    raise ValueError(f'Cannot read {prop!r} from OUTCAR, '
+                                     f'use one of {sorted(property_parsers)}')
+                names.add(property_parsers[prop])
+            parsers = default_chunk_parsers.make_parsers(names)
         parsers = parsers or default_chunk_parsers.make_parsers()
         super().__init__(parsers, header=header)
 
@@ -804,6 +860,39 @@ def build_chunk(fd: TextIO) -> _CHUNK:
     return lines
 
 
+def index_outcar(data: bytes) -> Tuple[int, List[Tuple[int, int]]]:
+    """Find the header and the ionic steps of an OUTCAR.
+
+    data: bytes or mmap
+        Contents of the OUTCAR file.
+
+    The data is only searched for the delimiters used by build_header()
+    and build_chunk(), which is much faster than reading it line by line.
+    Returns the byte offset of the end of the header and a list of
+    (start, end) byte offsets of the complete ionic steps."""
+    pos = data.find(b'Iteration')
+    if pos < 0:
+        raise ParseError('Incomplete OUTCAR')
+    size = len(data)
+    header_end = data.find(b'\n', pos) + 1 or size
+
+    delim = _OUTCAR_SCF_DELIM.encode()
+    chunks: List[Tuple[int, int]] = []
+    start = header_end
+    while True:
+        pos = data.find(delim, start)
+        if pos < 0:
+            return header_end, chunks
+        # The chunk ends 4 lines after the delimiter, to include the energy
+        end = pos
+        for _ in range(5):
+            if end >= size:
+                return header_end, chunks
+            end = data.find(b'\n', end) + 1 or size
+        chunks.append((start, end))
+        start = end
+
+
 def outcarchunks(fd: TextIO,
                  chunk_parser: ChunkParser = None,
                  header_parser: HeaderParser = None) -> Iterator[OUTCARChunk]:
@@ -842,6 +931,18 @@ default_chunk_parsers = DefaultParsersContainer(
     Energy,
 )
 
+# Names of the default chunk parsers which read each property
+property_parsers = {
+    'energy': 'Energy',
+    'free_energy': 'Energy',
+    'forces': 'PositionsAndForces',
+    'stress': 'Stress',
+    'magmoms': 'Magmoms',
+    'magmom': 'Magmom',
+    'efermi': 'EFermi',
+    'kpts': 'Kpoints',
+}
+
 # Create the default header parsers
 default_header_parsers = DefaultParsersContainer(
     SpeciesTypes,
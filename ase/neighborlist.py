@@ -1,8 +1,5 @@
 import numpy as np
 import itertools
-from scipy import sparse as sp
-from scipy.spatial import cKDTree
-import scipy.sparse.csgraph as csgraph
 
 from ase.data import atomic_numbers, covalent_radii
 from ase.geometry import complete_cell, find_mic, wrap_positions
@@ -80,6 +77,9 @@ def get_distance_matrix(graph, limit=3):
     Why not dok_matrix like the connectivity-matrix? Because row-picking
     is most likely and this is super fast with csr.
     """
+    from scipy import sparse as sp
+    import scipy.sparse.csgraph as csgraph
+
     mat = csgraph.dijkstra(graph, directed=False, limit=limit)
     mat[mat == np.inf] = 0
     return sp.csr_matrix(mat, dtype=np.int8)
@@ -105,6 +105,8 @@ def get_distance_indices(distanceMatrix, distance):
     distances longer than one, we need to add the lower values for cases
     where atoms are connected via a shorter path too.
     """
+    from scipy import sparse as sp
+
     shape = distanceMatrix.get_shape()
     indices = []
     # iterate over rows
@@ -729,6 +731,7 @@ def get_connectivity_matrix(nl, sparse=True):
             'Must call update(atoms) on your neighborlist first!')
 
     if sparse:
+        from scipy import sparse as sp
         matrix = sp.dok_matrix((nAtoms, nAtoms), dtype=np.int8)
     else:
         matrix = np.zeros((nAtoms, nAtoms), dtype=np.int8)
@@ -939,6 +942,7 @@ class PrimitiveNeighborList:
                 n = 0
             N.append(n)
 
+        from scipy.spatial import cKDTree
         tree = cKDTree(positions, copy_data=True)
         offsets = cell.scaled_positions(positions - positions0)
         offsets = offsets.round().astype(int)
@@ -1,6 +1,4 @@
 import numpy as np
-from scipy.optimize import minimize
-from scipy.linalg import solve_triangular, cho_factor, cho_solve
 from ase.optimize.gpmin.kernel import SquaredExponential
 from ase.optimize.gpmin.prior import ZeroPrior
 
@@ -68,6 +66,7 @@ class GaussianProcess():
 
         self.m = self.prior.prior(X)
         self.a = Y.flatten() - self.m
+        from scipy.linalg import cho_factor, cho_solve
         self.L, self.lower = cho_factor(K, lower=True, check_finite=True)
         cho_solve((self.L, self.lower), self.a, overwrite_b=True,
                   check_finite=True)
@@ -90,6 +89,7 @@ class GaussianProcess():
         k = self.kernel.kernel_vector(x, self.X, n)
         f = self.prior.prior(x) + np.dot(k, self.a)
         if get_variance:
+            from scipy.linalg import solve_triangular
             v = solve_triangular(self.L, k.T.copy(), lower=True,
                                  check_finite=False)
             variance = self.kernel.kernel(x, x)
@@ -127,6 +127,7 @@ class GaussianProcess():
         # vectorizing the derivative of the log likelihood
         D_P_input = np.array([np.dot(np.outer(self.a, self.a), g)
                               for g in grad])
+        from scipy.linalg import cho_solve
         D_complexity = np.array([cho_solve((self.L, self.lower), g)
                                  for g in grad])
 
@@ -167,6 +168,7 @@ class GaussianProcess():
         else:
             bounds = None
 
+        from scipy.optimize import minimize
         result = minimize(self.neg_log_likelihood, params, args=arguments,
                           method='L-BFGS-B', jac=True, bounds=bounds,
                           options={'gtol': tol, 'ftol': 0.01 * tol})
@@ -1,7 +1,6 @@
 import numpy as np
 import warnings
 
-from scipy.optimize import minimize
 from ase.parallel import world
 from ase.io.jsonio import write_json
 from ase.optimize.optimize import Optimizer
@@ -239,6 +238,7 @@ class GPMin(Optimizer, GaussianProcess):
         self.train(np.array(self.x_list), np.array(self.y_list))
 
     def relax_model(self, r0):
+        from scipy.optimize import minimize
         result = minimize(self.acquisition, r0, method='L-BFGS-B', jac=True)
         if result.success:
             return result.x
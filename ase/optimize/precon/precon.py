@@ -10,7 +10,7 @@ from abc import ABC, abstractmethod
 
 import numpy as np
 from scipy import sparse
-from scipy.sparse.linalg import spsolve
+from scipy.sparse.linalg import factorized
 from scipy.interpolate import CubicSpline
 
 
@@ -23,6 +23,7 @@ from ase.optimize.precon.neighbors import (get_neighbours,
                                            estimate_nearest_neighbour_distance)
 from ase.neighborlist import neighbor_list
 from ase.utils import tokenize_version
+from ase.utils.timing import Timer
 
 try:
     import pyamg
@@ -178,7 +179,7 @@ class SparsePrecon(Precon):
                  solver="auto", solve_tol=1e-8,
                  apply_positions=True, apply_cell=True,
                  estimate_mu_eigmode=False, logfile=None, rng=None,
-                 neighbour_list=neighbor_list):
+                 neighbour_list=neighbor_list, incremental=False):
         """Initialise a preconditioner object based on passed parameters.
 
         Parameters:
@@ -237,6 +238,16 @@ class SparsePrecon(Precon):
             neighbor_list: function (optional). Optionally replace the built-in
                 ASE neighbour list with an alternative with the same call
                 signature, e.g. `matscipy.neighbours.neighbour_list`.
+            incremental: bool
+                If True, a rebuild of the preconditioner only updates the
+                entries of the previous matrix which changed, as long as the
+                neighbour pairs are the same.  The PyAMG hierarchy of the
+                previous matrix is then reused as preconditioner for the
+                conjugate gradient solution with the new matrix.
+
+        The time spent building the neighbour list, assembling the matrix,
+        setting up and using the solver is collected in the Timer object
+        ``self.timer``, and the number of calls in the dict ``self.counts``.
 
         Raises:
             ValueError for problem with arguments
@@ -253,6 +264,13 @@ class SparsePrecon(Precon):
         self.reinitialize = reinitialize
         self.P = None
         self.old_positions = None
+        self.incremental = incremental
+        self.ml = None
+        self.ml_reused = False
+        self.lu = None
+        self.pattern = None
+        self.timer = Timer()
+        self.counts = {}
 
         use_pyamg = False
         if solver == "auto":
@@ -289,16 +307,31 @@ class SparsePrecon(Precon):
     def Pdot(self, x):
         return self.P.dot(x)
 
+    def timing(self, name):
+        """Count a call and return the timer context for it."""
+        self.counts[name] = self.counts.get(name, 0) + 1
+        return self.timer(name)
+
     def solve(self, x):
+        if self.ml is None and self.lu is None:
+            self.create_solver()
         start_time = time.time()
-        if self.use_pyamg and have_pyamg:
-            y = self.ml.solve(x, x0=self.rng.random(self.P.shape[0]),
-                              tol=self.solve_tol,
-                              accel='cg',
-                              maxiter=300,
-                              cycle='W')
-        else:
-            y = spsolve(self.P, x)
+        with self.timing('solve'):
+            if self.use_pyamg and have_pyamg:
+                x0 = self.rng.random(self.P.shape[0])
+                if self.ml_reused:
+                    # The hierarchy was set up for a previous matrix
+                    y, _ = pyamg.krylov.cg(
+                        self.P, x, x0=x0, tol=self.solve_tol, maxiter=300,
+                        M=self.ml.aspreconditioner(cycle='W'))
+                else:
+                    y = self.ml.solve(x, x0=x0,
+                                      tol=self.solve_tol,
+                                      accel='cg',
+                                      maxiter=300,
+                                      cycle='W')
+            else:
+                y = self.lu(x)
         self.logfile.write('--- Precon applied in %s seconds ---\n' %
                            (time.time() - start_time))
         return y
@@ -502,12 +535,67 @@ class SparsePrecon(Precon):
                            (time.time() - start_time))
         return P
 
-    def create_solver(self):
+    def create_solver(self, reuse=False):
+        """Set up the solver for P.
+
+        With reuse=True, P must have the same sparsity pattern as the
+        matrix of the previous call, and an existing multigrid hierarchy
+        is kept.  The LU factorization of the direct solver is always
+        recalculated."""
         if self.use_pyamg and have_pyamg:
+            if reuse and self.ml is not None:
+                self.counts['solver reuse'] = (
+                    self.counts.get('solver reuse', 0) + 1)
+                self.ml_reused = True
+                return
             start_time = time.time()
-            self.ml = create_pyamg_solver(self.P)
+            with self.timing('solver setup'):
+                self.ml = create_pyamg_solver(self.P)
+            self.ml_reused = False
             self.logfile.write('--- multi grid solver created in %s ---\n' %
                                (time.time() - start_time))
+        else:
+            with self.timing('solver setup'):
+                self.lu = factorized(self.P.tocsc())
+
+    def update_matrix(self, i, j, coeff, N):
+        """Assemble P from the entries coeff at (i, j) of the N x N matrix
+        and set up the solver.
+
+        If the nonzero entries are the same as in the previous call, only
+        the entries of the previous P which changed are updated, and the
+        solver setup is reused as far as possible, see create_solver()."""
+        with self.timing('assembly'):
+            keys, inverse = np.unique(i * N + j, return_inverse=True)
+            coeff = np.bincount(inverse, coeff, minlength=len(keys))
+            if (self.pattern is not None and
+                    np.array_equal(self.pattern[0], keys)):
+                _, old_coeff, positions, P = self.pattern
+                changed = np.flatnonzero(coeff != old_coeff)
+                P.data[positions[changed]] = coeff[changed, np.newaxis]
+                reuse = True
+                self.counts['pattern reuse'] = (
+                    self.counts.get('pattern reuse', 0) + 1)
+            else:
+                # Number the entries to find where they end up in the
+                # expanded matrix
+                indptr = np.searchsorted(keys // N, np.arange(N + 1))
+                csr_P = sparse.csr_matrix(
+                    (np.arange(1.0, len(keys) + 1), keys % N, indptr),
+                    shape=(N, N))
+                P = self.one_dim_to_ndim(csr_P, N)
+                index = P.data.astype(int) - 1
+                positions = np.argsort(index, kind='stable').reshape(
+                    len(keys), -1)
+                P.data = coeff[index]
+                changed = np.arange(len(keys))
+                reuse = False
+            self.pattern = (keys, coeff, positions, P)
+        self.logfile.write('--- updated %d of %d entries, pattern reused: '
+                           '%r ---\n' % (len(changed), len(keys), reuse))
+        self.P = P
+        if len(changed) > 0 or (self.ml is None and self.lu is None):
+            self.create_solver(reuse=reuse)
 
 
 class SparseCoeffPrecon(SparsePrecon):
@@ -542,9 +630,10 @@ class SparseCoeffPrecon(SparsePrecon):
         start_time = time.time()
         if self.apply_positions:
             # compute neighbour list
-            i, j, rij, fixed_atoms = get_neighbours(
-                atoms, self.r_cut,
-                neighbor_list=self.neighbor_list)
+            with self.timing('neighbour list'):
+                i, j, rij, fixed_atoms = get_neighbours(
+                    atoms, self.r_cut,
+                    neighbor_list=self.neighbor_list)
             logfile.write('--- neighbour list created in %s s --- \n' %
                           (time.time() - start_time))
 
@@ -591,14 +680,26 @@ class SparseCoeffPrecon(SparsePrecon):
             j = diag_i
             coeff = diag_coeff
 
+        if self.incremental and not initial_assembly:
+            self.update_matrix(i, j, coeff, N)
+            return
+
         # create an N x N precon matrix in compressed sparse column (CSC) format
         start_time = time.time()
-        csc_P = sparse.csc_matrix((coeff, (i, j)), shape=(N, N))
-        logfile.write('--- created CSC matrix in %s s ---\n' %
-                      (time.time() - start_time))
+        with self.timing('assembly'):
+            csc_P = sparse.csc_matrix((coeff, (i, j)), shape=(N, N))
+            logfile.write('--- created CSC matrix in %s s ---\n' %
+                          (time.time() - start_time))
 
-        self.P = self.one_dim_to_ndim(csc_P, N)
-        self.create_solver()
+            self.P = self.one_dim_to_ndim(csc_P, N)
+        if initial_assembly:
+            # The matrix of the initial assembly is only used to estimate mu.
+            # Drop the solver of the previous matrix, solve() sets up a new
+            # one if needed.
+            self.ml = None
+            self.lu = None
+        else:
+            self.create_solver()
 
     def make_precon(self, atoms, reinitialize=None):
         if self.r_NN is None:
@@ -748,7 +849,8 @@ class C1(SparseCoeffPrecon):
                  force_stab=False,
                  reinitialize=False, array_convention='C',
                  solver="auto", solve_tol=1e-9,
-                 apply_positions=True, apply_cell=True, logfile=None):
+                 apply_positions=True, apply_cell=True, logfile=None,
+                 incremental=False):
         super().__init__(r_cut=r_cut, mu=mu, mu_c=mu_c,
                          dim=dim, c_stab=c_stab,
                          force_stab=force_stab,
@@ -757,7 +859,7 @@ class C1(SparseCoeffPrecon):
                          solver=solver, solve_tol=solve_tol,
                          apply_positions=apply_positions,
                          apply_cell=apply_cell,
-                         logfile=logfile)
+                         logfile=logfile, incremental=incremental)
 
     def get_coeff(self, r):
         return -self.mu * np.ones_like(r)
@@ -772,13 +874,13 @@ class Exp(SparseCoeffPrecon):
                  force_stab=False, reinitialize=False, array_convention='C',
                  solver="auto", solve_tol=1e-9,
                  apply_positions=True, apply_cell=True,
-                 estimate_mu_eigmode=False, logfile=None):
+                 estimate_mu_eigmode=False, logfile=None, incremental=False):
         """
         Initialise an Exp preconditioner with given parameters.
 
         Args:
-            r_cut, mu, c_stab, dim, sparse, reinitialize, array_convention: see
-                precon.__init__()
+            r_cut, mu, c_stab, dim, sparse, reinitialize, array_convention,
+            incremental: see precon.__init__()
             A: coefficient in exp(-A*r/r_NN). Default is A=3.0.
         """
         super().__init__(r_cut=r_cut, r_NN=r_NN,
@@ -791,7 +893,7 @@ class Exp(SparseCoeffPrecon):
                          apply_positions=apply_positions,
                          apply_cell=apply_cell,
                          estimate_mu_eigmode=estimate_mu_eigmode,
-                         logfile=logfile)
+                         logfile=logfile, incremental=incremental)
 
         self.A = A
 
@@ -1119,8 +1221,9 @@ class Exp_FF(Exp, FF):
         start_time = time.time()
         if self.apply_positions:
             # compute neighbour list
-            i_list, j_list, rij_list, fixed_atoms = get_neighbours(
-                atoms, self.r_cut, self.neighbor_list)
+            with self.timing('neighbour list'):
+                i_list, j_list, rij_list, fixed_atoms = get_neighbours(
+                    atoms, self.r_cut, self.neighbor_list)
             self.logfile.write('--- neighbour list created in %s s ---\n' %
                                (time.time() - start_time))
 
@@ -1,5 +1,4 @@
 import numpy as np
-import scipy.optimize as opt
 from ase.optimize.optimize import Optimizer
 
 
@@ -131,6 +130,7 @@ class SciPyFminCG(SciPyOptimizer):
     """Non-linear (Polak-Ribiere) conjugate gradient algorithm"""
 
     def call_fmin(self, fmax, steps):
+        import scipy.optimize as opt
         output = opt.fmin_cg(self.f,
                              self.x0(),
                              fprime=self.fprime,
@@ -154,6 +154,7 @@ class SciPyFminBFGS(SciPyOptimizer):
     """Quasi-Newton method (Broydon-Fletcher-Goldfarb-Shanno)"""
 
     def call_fmin(self, fmax, steps):
+        import scipy.optimize as opt
         output = opt.fmin_bfgs(self.f,
                                self.x0(),
                                fprime=self.fprime,
@@ -290,6 +291,7 @@ class SciPyFmin(SciPyGradientlessOptimizer):
     """
 
     def call_fmin(self, xtol, ftol, steps):
+        import scipy.optimize as opt
         opt.fmin(self.f,
                  self.x0(),
                  # args=(),
@@ -326,6 +328,7 @@ class SciPyFminPowell(SciPyGradientlessOptimizer):
             self.direc = np.eye(len(self.x0()), dtype=float) * direc
 
     def call_fmin(self, xtol, ftol, steps):
+        import scipy.optimize as opt
         opt.fmin_powell(self.f,
                         self.x0(),
                         # args=(),
@@ -155,7 +155,8 @@ class Displacement:
         from ase.vibrations.vibrations import Displacement as VDisplacement
         return VDisplacement(a, i, np.sign(step), abs(step), self)
 
-    def run(self):
+    def run(self, use_symmetry=False, symprec=1e-5, executor=None,
+            calculator_factory=None, logfile=None):
         """Run the calculations for the required displacements.
 
         This will do a calculation for 6 displacements per atom, +-x, +-y, and
@@ -164,45 +165,90 @@ class Displacement:
         file (ending with .json), which must be deleted before restarting the
         job. Otherwise the calculation for that displacement will not be done.
 
+        use_symmetry: bool
+            Use the symmetry of the unit cell, found with spglib, to only
+            calculate displacements which are not equivalent by symmetry in
+            the supercell.  The forces of the other displacements are
+            obtained by rotating and permuting the calculated forces.
+        symprec: float
+            Tolerance used by spglib to find the symmetry.
+        executor: concurrent.futures.Executor
+            If given, the displacements are calculated by this executor,
+            e.g. a ProcessPoolExecutor, and the results are saved in the
+            cache as they finish.
+        calculator_factory: callable
+            Used with executor.  Called without arguments to create a new
+            calculator for each displacement.  Required with executor.
+        logfile: file object or str
+            Used with executor.  Progress and estimated time left are
+            written here.  Use '-' for stdout.
+
         """
 
         # Atoms in the supercell -- repeated in the lattice vector directions
         # beginning with the last
         atoms_N = self.atoms * self.supercell
 
+        # Positions of atoms to be displaced in the reference cell
+        natoms = len(self.atoms)
+        offset = natoms * self.offset
+        pos = atoms_N.positions[offset: offset + natoms].copy()
+
+        eq_disp = self._eq_disp()
+        displacements = [self._disp(a, i, sign) for a in self.indices
+                         for i in range(3) for sign in [-1, 1]]
+        derived = []
+        if use_symmetry:
+            from ase.vibrations.symmetry import DisplacementSymmetry
+            symmetry = DisplacementSymmetry(self.atoms, self.supercell,
+                                            self.offset, symprec)
+            displacements, derived = symmetry.reduce(displacements)
+
+        if executor is not None:
+            from ase.vibrations.executor import run_displacements
+            if calculator_factory is None:
+                raise ValueError('Provide calculator_factory to run with '
+                                 'an executor')
+            tasks = [(eq_disp, atoms_N.copy())]
+            for disp in displacements:
+                atoms = atoms_N.copy()
+                atoms.positions[offset + disp.a, disp.i] += \
+                    disp.sign * self.delta
+                tasks.append((disp, atoms))
+            run_displacements(self, tasks, executor, calculator_factory,
+                              logfile)
+            for disp, source, k in derived:
+                symmetry.save_derived(self.cache, disp, source, k)
+            return
+
         # Set calculator if provided
         assert self.calc is not None, "Provide calculator in __init__ method"
         atoms_N.calc = self.calc
 
         # Do calculation on equilibrium structure
-        eq_disp = self._eq_disp()
         with self.cache.lock(eq_disp.name) as handle:
             if handle is not None:
                 output = self.calculate(atoms_N, eq_disp)
                 handle.save(output)
 
-        # Positions of atoms to be displaced in the reference cell
-        natoms = len(self.atoms)
-        offset = natoms * self.offset
-        pos = atoms_N.positions[offset: offset + natoms].copy()
-
         # Loop over all displacements
-        for a in self.indices:
-            for i in range(3):
-                for sign in [-1, 1]:
-                    disp = self._disp(a, i, sign)
-                    with self.cache.lock(disp.name) as handle:
-                        if handle is None:
-                            continue
-                        try:
-                            atoms_N.positions[offset + a, i] = \
-                                pos[a, i] + sign * self.delta
-
-                            result = self.calculate(atoms_N, disp)
-                            handle.save(result)
-                        finally:
-                            # Return to initial positions
-                            atoms_N.positions[offset + a, i] = pos[a, i]
+        for disp in displacements:
+            a, i, sign = disp.a, disp.i, disp.sign
+            with self.cache.lock(disp.name) as handle:
+                if handle is None:
+                    continue
+                try:
+                    atoms_N.positions[offset + a, i] = \
+                        pos[a, i] + sign * self.delta
+
+                    result = self.calculate(atoms_N, disp)
+                    handle.save(result)
+                finally:
+                    # Return to initial positions
+                    atoms_N.positions[offset + a, i] = pos[a, i]
+
+        for disp, source, k in derived:
+            symmetry.save_derived(self.cache, disp, source, k)
 
     def clean(self):
         """Delete generated files."""
@@ -571,7 +617,8 @@ class Phonons(Displacement):
             This is a Fourier transform from real-space dynamical matrix D_N
             for a given momentum vector q.
 
-        q_scaled: q vector in scaled coordinates.
+        q_scaled: q vector in scaled coordinates, or an array of shape
+                  (nq, 3) of q vectors which are all transformed at once.
 
         D_N: the dynamical matrix in real-space. It is necessary, at least
              currently, to provide this matrix explicitly (rather than use
@@ -580,15 +627,46 @@ class Phonons(Displacement):
 
         Result:
             D(q): two-dimensional, complex-valued array of
-                  shape=(3 * natoms, 3 * natoms).
+                  shape=(3 * natoms, 3 * natoms), or three-dimensional array
+                  of shape=(nq, 3 * natoms, 3 * natoms) for several q vectors.
         """
-        # Evaluate fourier sum
+        q_qc = np.asarray(q_scaled)
+        if q_qc.ndim == 1:
+            return self.compute_dynamical_matrix(q_qc[np.newaxis], D_N)[0]
+
+        # Evaluate fourier sum for all q vectors as two real matrix products
         R_cN = self._lattice_vectors_array
-        phase_N = np.exp(-2.j * pi * np.dot(q_scaled, R_cN))
-        D_q = np.sum(phase_N[:, np.newaxis, np.newaxis] * D_N, axis=0)
-        return D_q
+        arg_qN = 2 * pi * np.dot(q_qc, R_cN)
+        D_Nx = D_N.reshape(len(D_N), -1)
+        D_qx = np.dot(np.cos(arg_qN), D_Nx) - 1.j * np.dot(np.sin(arg_qN), D_Nx)
+        return D_qx.reshape((len(q_qc),) + D_N.shape[1:])
+
+    def _non_analytic_part(self, q_qc):
+        """Non-analytic contribution to the dynamical matrix at the q vectors
+        q_qc from the Born charges and the dielectric tensor."""
+        # Reciprocal basis vectors
+        reci_vc = 2 * pi * la.inv(self.atoms.cell)
+        # Unit cell volume in Bohr^3
+        vol = abs(la.det(self.atoms.cell)) / units.Bohr**3
+
+        # q-vectors in cartesian coordinates
+        q_qv = np.dot(q_qc, reci_vc.T)
+        # Non-analytic contribution to force constants in atomic units
+        qdotZ_qx = np.einsum('qv,avw->qaw', q_qv, self.Z_avv)
+        qdotZ_qx = qdotZ_qx.reshape(len(q_qv), -1)
+        qepsq_q = np.einsum('qv,vw,qw->q', q_qv, self.eps_vv, q_qv)
+        C_na = (4 * pi * qdotZ_qx[:, :, np.newaxis] *
+                qdotZ_qx[:, np.newaxis, :] /
+                qepsq_q[:, np.newaxis, np.newaxis] / vol)
+        self.C_na = C_na[-1] / units.Bohr**2 * units.Hartree
+        # Add mass prefactor and convert to eV / (Ang^2 * amu)
+        M_inv = np.outer(self.m_inv_x, self.m_inv_x)
+        D_na = C_na * M_inv / units.Bohr**2 * units.Hartree
+        self.D_na = D_na[-1]
+        return D_na
 
-    def band_structure(self, path_kc, modes=False, born=False, verbose=True):
+    def band_structure(self, path_kc, modes=False, born=False, verbose=True,
+                       max_memory=2**28, comm=None):
         """Calculate phonon dispersion along a path in the Brillouin zone.
 
         The dynamical matrix at arbitrary q-vectors is obtained by Fourier
@@ -614,6 +692,14 @@ class Phonons(Displacement):
             between the LO and TO branches for q -> 0.
         verbose: bool
             Print warnings when imaginary frequncies are detected.
+        max_memory: int
+            Approximate number of bytes used for the dynamical matrices.
+            The q-points are treated in chunks of this size, where the
+            dynamical matrices of a chunk are built and diagonalized at once.
+        comm: communicator object
+            If given, the chunks of q-points are distributed over the ranks
+            of this MPI communicator, e.g. ase.parallel.world, and the
+            results are collected on all ranks.
 
         """
 
@@ -625,58 +711,59 @@ class Phonons(Displacement):
         # Dynamical matrix in real-space
         D_N = self.D_N
 
-        # Lists for frequencies and modes along path
-        omega_kl = []
-        u_kl = []
+        path_kc = np.asarray(path_kc, dtype=float).reshape(-1, 3)
+        nq = len(path_kc)
+        nx = D_N.shape[1]
 
-        # Reciprocal basis vectors for use in non-analytic contribution
-        reci_vc = 2 * pi * la.inv(self.atoms.cell)
-        # Unit cell volume in Bohr^3
-        vol = abs(la.det(self.atoms.cell)) / units.Bohr**3
+        # Frequencies and modes along path
+        omega_kl = np.zeros((nq, nx))
+        if modes:
+            u_kl = np.zeros((nq, nx, len(self.indices), 3), dtype=complex)
 
-        for q_c in path_kc:
+        # Complex dynamical matrices, and eigenvectors or the non-analytic
+        # part, of all q-points in a chunk
+        nbytes = 16 * nx**2 * (1 + (modes or born))
+        nchunk = max(1, int(max_memory // nbytes))
 
-            # Add non-analytic part
-            if born:
-                # q-vector in cartesian coordinates
-                q_v = np.dot(reci_vc, q_c)
-                # Non-analytic contribution to force constants in atomic units
-                qdotZ_av = np.dot(q_v, self.Z_avv).ravel()
-                C_na = (4 * pi * np.outer(qdotZ_av, qdotZ_av) /
-                        np.dot(q_v, np.dot(self.eps_vv, q_v)) / vol)
-                self.C_na = C_na / units.Bohr**2 * units.Hartree
-                # Add mass prefactor and convert to eV / (Ang^2 * amu)
-                M_inv = np.outer(self.m_inv_x, self.m_inv_x)
-                D_na = C_na * M_inv / units.Bohr**2 * units.Hartree
-                self.D_na = D_na
-                D_N = self.D_N + D_na / np.prod(self.supercell)
-
-            # if np.prod(self.N_c) == 1:
-            #
-            #     q_av = np.tile(q_v, len(self.indices))
-            #     q_xx = np.vstack([q_av]*len(self.indices)*3)
-            #     D_m += q_xx
+        for n, start in enumerate(range(0, nq, nchunk)):
+            if comm is not None and n % comm.size != comm.rank:
+                continue
+            q_qc = path_kc[start:start + nchunk]
 
             # Evaluate fourier sum
-            D_q = self.compute_dynamical_matrix(q_c, D_N)
+            D_qxx = self.compute_dynamical_matrix(q_qc, D_N)
+
+            # Add non-analytic part
+            if born:
+                R_cN = self._lattice_vectors_array
+                phase_q = np.exp(-2.j * pi * np.dot(q_qc, R_cN)).sum(axis=1)
+                phase_q /= np.prod(self.supercell)
+                D_qxx += (self._non_analytic_part(q_qc) *
+                          phase_q[:, np.newaxis, np.newaxis])
 
             if modes:
-                omega2_l, u_xl = la.eigh(D_q, UPLO='U')
+                omega2_ql, u_qxl = la.eigh(D_qxx, UPLO='U')
                 # Sort eigenmodes according to eigenvalues (see below) and
                 # multiply with mass prefactor
-                u_lx = (self.m_inv_x[:, np.newaxis] *
-                        u_xl[:, omega2_l.argsort()]).T.copy()
-                u_kl.append(u_lx.reshape((-1, len(self.indices), 3)))
+                order_ql = omega2_ql.argsort(axis=1)
+                u_qxl = np.take_along_axis(u_qxl, order_ql[:, np.newaxis, :],
+                                           axis=2)
+                u_qlx = (self.m_inv_x[:, np.newaxis] * u_qxl).swapaxes(1, 2)
+                u_kl[start:start + len(q_qc)] = u_qlx.reshape(
+                    (len(q_qc), nx, len(self.indices), 3))
             else:
-                omega2_l = la.eigvalsh(D_q, UPLO='U')
+                omega2_ql = la.eigvalsh(D_qxx, UPLO='U')
+            del D_qxx
 
             # Sort eigenvalues in increasing order
-            omega2_l.sort()
+            omega2_ql.sort(axis=1)
             # Use dtype=complex to handle negative eigenvalues
-            omega_l = np.sqrt(omega2_l.astype(complex))
+            omega_ql = np.sqrt(omega2_ql.astype(complex))
 
             # Take care of imaginary frequencies
-            if not np.all(omega2_l >= 0.):
+            for q_c, omega2_l, omega_l in zip(q_qc, omega2_ql, omega_ql):
+                if np.all(omega2_l >= 0.):
+                    continue
                 indices = np.where(omega2_l < 0)[0]
 
                 if verbose:
@@ -687,14 +774,19 @@ class Phonons(Displacement):
 
                 omega_l[indices] = -1 * np.sqrt(np.abs(omega2_l[indices].real))
 
-            omega_kl.append(omega_l.real)
+            omega_kl[start:start + len(q_qc)] = omega_ql.real
+
+        if comm is not None:
+            comm.sum(omega_kl)
+            if modes:
+                comm.sum(u_kl)
 
         # Conversion factor: sqrt(eV / Ang^2 / amu) -> eV
         s = units._hbar * 1e10 / sqrt(units._e * units._amu)
-        omega_kl = s * np.asarray(omega_kl)
+        omega_kl = s * omega_kl
 
         if modes:
-            return omega_kl, np.asarray(u_kl)
+            return omega_kl, u_kl
 
         return omega_kl
 
@@ -706,7 +798,8 @@ class Phonons(Displacement):
         dos = RawDOSData(omega_w, np.ones_like(omega_w))
         return dos
 
-    def dos(self, kpts=(10, 10, 10), npts=1000, delta=1e-3, indices=None):
+    def dos(self, kpts=(10, 10, 10), npts=1000, delta=1e-3, indices=None,
+            max_memory=2**28, comm=None):
         """Calculate phonon dos as a function of energy.
 
         Parameters:
@@ -716,10 +809,17 @@ class Phonons(Displacement):
         npts: int
             Number of energy points.
         delta: float
-            Broadening of Lorentzian line-shape in eV.
+            Broadening of Lorentzian line-shape in eV.  Use delta=0.0
+            for linear tetrahedron interpolation.
         indices: list
             If indices is not None, the atomic-partial dos for the specified
             atoms will be calculated.
+        max_memory: int
+            Approximate number of bytes used for temporary arrays,
+            see band_structure().
+        comm: communicator object
+            MPI communicator over which the q-points are distributed,
+            see band_structure().
 
         """
 
@@ -727,16 +827,29 @@ class Phonons(Displacement):
         kpts_kc = monkhorst_pack(kpts)
         N = np.prod(kpts)
         # Get frequencies
-        omega_kl = self.band_structure(kpts_kc)
+        omega_kl = self.band_structure(kpts_kc, max_memory=max_memory,
+                                       comm=comm)
         # Energy axis and dos
         omega_e = np.linspace(0., np.amax(omega_kl) + 5e-3, num=npts)
-        dos_e = np.zeros_like(omega_e)
 
-        # Sum up contribution from all q-points and branches
-        for omega_l in omega_kl:
-            diff_el = (omega_e[:, np.newaxis] - omega_l[np.newaxis, :])**2
-            dos_el = 1. / (diff_el + (0.5 * delta)**2)
-            dos_e += dos_el.sum(axis=1)
+        if delta == 0.0:
+            from ase.dft.dos import linear_tetrahedron_integration
+            from ase.parallel import DummyMPI
+            eigs = omega_kl.reshape(tuple(kpts) + (-1,))
+            dos_e = linear_tetrahedron_integration(
+                self.atoms.cell, eigs, omega_e,
+                comm=DummyMPI() if comm is None else comm)
+            return omega_e, dos_e
+
+        # Sum up contribution from all q-points and branches, a chunk of
+        # frequencies at a time
+        omega_w = omega_kl.ravel()
+        nchunk = max(1, int(max_memory // (8 * npts)))
+        dos_e = np.zeros_like(omega_e)
+        for start in range(0, len(omega_w), nchunk):
+            diff_ew = (omega_e[:, np.newaxis] -
+                       omega_w[np.newaxis, start:start + nchunk])**2
+            dos_e += (1. / (diff_ew + (0.5 * delta)**2)).sum(axis=1)
 
         dos_e *= 1. / (N * pi) * 0.5 * delta
 
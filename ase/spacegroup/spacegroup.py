@@ -3,12 +3,19 @@
 """Definition of the Spacegroup class.
 
 This module only depends on NumPy and the space group database.
+
+The database is parsed once per process.  If the environment variable
+ASE_SPACEGROUP_CACHE is set to a directory, the parsed database is also
+pickled there and reused by later processes.  Unreadable cache files
+are ignored and overwritten, and failures to write the cache are ignored.
 """
 
+import hashlib
 import os
+import pickle
 import warnings
 from functools import total_ordering
-from typing import Union
+from typing import Dict, List, Tuple, Union
 
 import numpy as np
 
@@ -131,8 +138,12 @@ class Spacegroup:
             return
         if not datafile:
             datafile = get_datafile()
-        with open(datafile, 'r') as fd:
-            _read_datafile(self, spacegroup, setting, fd)
+        spg = _find_spacegroup(get_datafile_table(datafile),
+                               spacegroup, setting)
+        for k, v in spg.__dict__.items():
+            if isinstance(v, np.ndarray):
+                v = v.copy()
+            setattr(self, k, v)
 
     def __repr__(self):
         return 'Spacegroup(%d, setting=%d)' % (self.no, self.setting)
@@ -217,6 +228,23 @@ class Spacegroup:
                     symop.append((parity * rot, newtrans))
         return symop
 
+    def _get_symop_arrays(self):
+        """Returns the symmetry operations of get_symop() as two
+        ndarrays, in the same order."""
+        parities = [1]
+        if self.centrosymmetric:
+            parities.append(-1)
+        nparities = len(parities)
+        parities = np.array(parities)[:, None, None, None, None]
+        rot = np.broadcast_to(parities * self.rotations[None, None],
+                              (nparities, self.nsubtrans,
+                               *self.rotations.shape))
+        trans = np.broadcast_to(
+            np.mod(self.translations[None, None] +
+                   self.subtrans[None, :, None], 1),
+            (nparities, self.nsubtrans, *self.translations.shape))
+        return rot.reshape(-1, 3, 3), trans.reshape(-1, 3)
+
     def get_op(self):
         """Returns all symmetry operations (including inversions and
         subtranslations), but unlike get_symop(), they are returned as
@@ -405,47 +433,51 @@ class Spacegroup:
         [0, 0, 0, 0, 1, 1, 1, 1]
         """
         kinds = []
-        sites = []
+        sites = np.zeros((0, 3))
 
         scaled = np.array(scaled_positions, ndmin=2)
-
-        for kind, pos in enumerate(scaled):
-            for rot, trans in self.get_symop():
-                site = np.mod(np.dot(rot, pos) + trans, 1.)
-                if not sites:
-                    sites.append(site)
-                    kinds.append(kind)
-                    continue
-                t = site - sites
-                mask = np.all(
-                    (abs(t) < symprec) | (abs(abs(t) - 1.0) < symprec), axis=1)
-                if np.any(mask):
-                    inds = np.argwhere(mask).flatten()
-                    for ind in inds:
-                        # then we would just add the same thing again -> skip
-                        if kinds[ind] == kind:
-                            pass
-                        elif onduplicates == 'keep':
-                            pass
-                        elif onduplicates == 'replace':
-                            kinds[ind] = kind
-                        elif onduplicates == 'warn':
-                            warnings.warn('scaled_positions %d and %d '
-                                          'are equivalent' %
-                                          (kinds[ind], kind))
-                        elif onduplicates == 'error':
-                            raise SpacegroupValueError(
-                                'scaled_positions %d and %d are equivalent' %
-                                (kinds[ind], kind))
-                        else:
-                            raise SpacegroupValueError(
-                                'Argument "onduplicates" must be one of: '
-                                '"keep", "replace", "warn" or "error".')
-                else:
-                    sites.append(site)
-                    kinds.append(kind)
-
-        return np.array(sites), kinds
+        rot, trans = self._get_symop_arrays()
+
+        def same_site(a, b):
+            t = a[:, np.newaxis] - b[np.newaxis]
+            return np.all(
+                (abs(t) < symprec) | (abs(abs(t) - 1.0) < symprec), axis=2)
+
+        # all images of all sites under all symmetry operations
+        allsites = np.mod(np.einsum('kij,nj->nki', rot, scaled) + trans, 1.)
+
+        for kind, newsites in enumerate(allsites):
+            # keep the first of the images which are the same site
+            same = same_site(newsites, newsites)
+            newsites = newsites[~np.tril(same, -1).any(axis=1)]
+
+            same = same_site(newsites, sites)
+            for inds in same:
+                for ind in np.flatnonzero(inds):
+                    # then we would just add the same thing again -> skip
+                    if kinds[ind] == kind:
+                        pass
+                    elif onduplicates == 'keep':
+                        pass
+                    elif onduplicates == 'replace':
+                        kinds[ind] = kind
+                    elif onduplicates == 'warn':
+                        warnings.warn('scaled_positions %d and %d '
+                                      'are equivalent' %
+                                      (kinds[ind], kind))
+                    elif onduplicates == 'error':
+                        raise SpacegroupValueError(
+                            'scaled_positions %d and %d are equivalent' %
+                            (kinds[ind], kind))
+                    else:
+                        raise SpacegroupValueError(
+                            'Argument "onduplicates" must be one of: '
+                            '"keep", "replace", "warn" or "error".')
+            newsites = newsites[~same.any(axis=1)]
+            sites = np.concatenate([sites, newsites])
+            kinds.extend([kind] * len(newsites))
+
+        return sites, kinds
 
     def symmetry_normalised_sites(self,
                                   scaled_positions,
@@ -467,17 +499,14 @@ class Spacegroup:
                [ 0.,  0.,  0.]])
         """
         scaled = np.array(scaled_positions, ndmin=2)
-        normalised = np.empty(scaled.shape, float)
         rot, trans = self.get_op()
-        for i, pos in enumerate(scaled):
-            sympos = np.dot(rot, pos) + trans
-            if map_to_unitcell:
-                # Must be done twice, see the scaled_positions.py test
-                sympos %= 1.0
-                sympos %= 1.0
-            j = np.lexsort(sympos.T)[0]
-            normalised[i, :] = sympos[j]
-        return normalised
+        sympos = np.einsum('kij,nj->nki', rot, scaled) + trans
+        if map_to_unitcell:
+            # Must be done twice, see the scaled_positions.py test
+            sympos %= 1.0
+            sympos %= 1.0
+        j = np.lexsort(sympos.transpose(2, 0, 1), axis=-1)[:, 0]
+        return sympos[np.arange(len(scaled)), j]
 
     def unique_sites(self,
                      scaled_positions,
@@ -582,38 +611,91 @@ def format_symbol(symbol):
     return ' '.join(s.split())
 
 
-# Functions for parsing the database. They are moved outside the
-# Spacegroup class in order to make it easier to later implement
-# caching to avoid reading the database each time a new Spacegroup
-# instance is created.
+# Functions for parsing the database. They are outside the Spacegroup
+# class, such that the database is only read once and new Spacegroup
+# instances are copied from the parsed entries.
+
+_datafile_tables: Dict[Tuple[str, int], List['Spacegroup']] = {}
+
+
+def get_datafile_table(datafile=None):
+    """Return all entries of the database as a list of Spacegroup objects
+    in the order of the file.
+
+    The database is only parsed the first time, or when it has been
+    modified.  See the module docstring for the on-disk cache."""
+    if not datafile:
+        datafile = get_datafile()
+    datafile = os.path.abspath(datafile)
+    key = (datafile, os.stat(datafile).st_mtime_ns)
+    table = _datafile_tables.get(key)
+    if table is None:
+        table = _load_cached_table(key)
+        if table is None:
+            with open(datafile, 'r') as fd:
+                table = _read_datafile_table(fd)
+            _save_cached_table(key, table)
+        _datafile_tables[key] = table
+    return table
+
+
+def _get_cache_path(key):
+    cachedir = os.environ.get('ASE_SPACEGROUP_CACHE')
+    if not cachedir:
+        return None
+    digest = hashlib.sha1(repr(key).encode()).hexdigest()[:16]
+    name = 'spacegroup-%s.pckl' % digest
+    return os.path.join(cachedir, name)
+
+
+def _load_cached_table(key):
+    path = _get_cache_path(key)
+    if path is None or not os.path.isfile(path):
+        return None
+    try:
+        with open(path, 'rb') as fd:
+            cached_key, table = pickle.load(fd)
+    except (OSError, EOFError, pickle.UnpicklingError, ValueError):
+        # truncated or corrupt cache: parse the database again
+        return None
+    if cached_key != key:
+        return None
+    return table
+
+
+def _save_cached_table(key, table):
+    path = _get_cache_path(key)
+    if path is None:
+        return
+    # write to a temporary file first, such that other processes never
+    # read a partially written cache
+    tmp = '%s.%d' % (path, os.getpid())
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp, 'wb') as fd:
+            pickle.dump((key, table), fd, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    except OSError:
+        # the cache is optional, e.g. the directory may not be writable
+        pass
 
 
-def _skip_to_blank(f, spacegroup, setting):
-    """Read lines from f until a blank line is encountered."""
-    while True:
-        line = f.readline()
-        if not line:
-            raise SpacegroupNotFoundError(
-                'invalid spacegroup `%s`, setting `%s` not found in data base'
-                % (spacegroup, setting))
-        if not line.strip():
-            break
-
-
-def _skip_to_nonblank(f, spacegroup, setting):
-    """Read lines from f until a nonblank line not starting with a
-    hash (#) is encountered and returns this and the next line."""
+def _read_datafile_table(f):
+    """Read all entries of the database in f."""
+    table = []
     while True:
         line1 = f.readline()
         if not line1:
-            raise SpacegroupNotFoundError(
-                'invalid spacegroup %s, setting %i not found in data base' %
-                (spacegroup, setting))
-        line1.strip()
-        if line1 and not line1.startswith('#'):
-            line2 = f.readline()
-            break
-    return line1, line2
+            return table
+        if not line1.strip() or line1.startswith('#'):
+            continue
+        line2 = f.readline()
+        _no, _symbol = line1.strip().split(None, 1)
+        _symbol = format_symbol(_symbol)
+        _setting = int(line2.strip().split()[1])
+        spg = Spacegroup.__new__(Spacegroup)
+        _read_datafile_entry(spg, int(_no), _symbol, _setting, f)
+        table.append(spg)
 
 
 def _read_datafile_entry(spg, no, symbol, setting, f):
@@ -655,34 +737,24 @@ def _read_datafile_entry(spg, no, symbol, setting, f):
     spg._translations = symop[:, 9:]
 
 
-def _read_datafile(spg, spacegroup, setting, f):
+def _find_spacegroup(table, spacegroup, setting):
+    """Return the first entry in table matching spacegroup and setting."""
     if isinstance(spacegroup, int):
-        pass
+        for spg in table:
+            if spg._no == spacegroup and spg._setting == setting:
+                return spg
     elif isinstance(spacegroup, str):
         spacegroup = ' '.join(spacegroup.strip().split())
         compact_spacegroup = ''.join(spacegroup.split())
+        for spg in table:
+            if (''.join(spg._symbol.split()) == compact_spacegroup and
+                    (setting is None or spg._setting == setting)):
+                return spg
     else:
         raise SpacegroupValueError('`spacegroup` must be of type int or str')
-    while True:
-        line1, line2 = _skip_to_nonblank(f, spacegroup, setting)
-        _no, _symbol = line1.strip().split(None, 1)
-        _symbol = format_symbol(_symbol)
-        compact_symbol = ''.join(_symbol.split())
-        _setting = int(line2.strip().split()[1])
-        _no = int(_no)
-
-        condition = (
-            (isinstance(spacegroup, int) and _no == spacegroup
-             and _setting == setting)
-            or (isinstance(spacegroup, str)
-                and compact_symbol == compact_spacegroup) and
-            (setting is None or _setting == setting))
-
-        if condition:
-            _read_datafile_entry(spg, _no, _symbol, _setting, f)
-            break
-        else:
-            _skip_to_blank(f, spacegroup, setting)
+    raise SpacegroupNotFoundError(
+        'invalid spacegroup `%s`, setting `%s` not found in data base'
+        % (spacegroup, setting))
 
 
 def parse_sitesym_element(element):
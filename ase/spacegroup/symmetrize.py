@@ -3,6 +3,8 @@ Provides FixSymmetry class to preserve spacegroup symmetry during optimisation
 """
 import warnings
 import numpy as np
+from scipy import sparse
+from scipy.spatial import cKDTree
 
 from ase.constraints import FixConstraint
 from ase.stress import voigt_6_to_full_3x3_stress, full_3x3_to_voigt_6_stress
@@ -124,35 +126,65 @@ def prep_symmetry(atoms, symprec=1.0e-6, verbose=False):
         print_symmetry(symprec, dataset)
     rotations = dataset['rotations'].copy()
     translations = dataset['translations'].copy()
-    symm_map = []
-    scaled_pos = atoms.get_scaled_positions()
-    for (rot, trans) in zip(rotations, translations):
-        this_op_map = [-1] * len(atoms)
-        for i_at in range(len(atoms)):
-            new_p = rot @ scaled_pos[i_at, :] + trans
-            dp = scaled_pos - new_p
-            dp -= np.round(dp)
-            i_at_map = np.argmin(np.linalg.norm(dp, axis=1))
-            this_op_map[i_at] = i_at_map
-        symm_map.append(this_op_map)
+    scaled_pos = wrap_scaled_positions(atoms.get_scaled_positions())
+    # nearest atom to each image, with periodic distances in scaled
+    # coordinates
+    tree = cKDTree(scaled_pos, boxsize=1.0)
+    new_p = np.einsum('kij,aj->kai', rotations, scaled_pos)
+    new_p += translations[:, None]
+    _, symm_map = tree.query(wrap_scaled_positions(new_p.reshape(-1, 3)))
+    symm_map = [list(this_op_map)
+                for this_op_map in symm_map.reshape(len(rotations), -1)]
     return (rotations, translations, symm_map)
 
 
-def symmetrize_rank1(lattice, inv_lattice, forces, rot, trans, symm_map):
+def wrap_scaled_positions(scaled_pos):
+    scaled_pos = scaled_pos - np.floor(scaled_pos)
+    scaled_pos[scaled_pos >= 1.0] = 0.0
+    return scaled_pos
+
+
+def symmetrization_operator(rot, symm_map):
+    """
+    Return the operator which symmetrizes rank 1 tensors in scaled coordinates
+
+    The result is a sparse (3 N, 3 N) matrix, which is applied to the
+    flattened (N, 3) array of scaled forces.  It only depends on the
+    symmetry operations and not on the cell.
+    """
+    rot = np.asarray(rot)
+    symm_map = np.asarray(symm_map)
+    nops, natoms = symm_map.shape
+    xyz = np.arange(3)
+    # forces on atom a are rotated by r and added to atom symm_map[a]
+    rows = 3 * symm_map[:, :, None, None] + xyz[:, None]
+    cols = 3 * np.arange(natoms)[:, None, None] + xyz
+    shape = (nops, natoms, 3, 3)
+    operator = sparse.coo_matrix(
+        (np.broadcast_to(rot[:, None] / nops, shape).ravel(),
+         (np.broadcast_to(rows, shape).ravel(),
+          np.broadcast_to(cols, shape).ravel())),
+        shape=(3 * natoms, 3 * natoms))
+    return operator.tocsr()
+
+
+def symmetrize_rank1(lattice, inv_lattice, forces, rot, trans, symm_map,
+                     operator=None):
     """
     Return symmetrized forces
 
     lattice vectors expected as row vectors (same as ASE get_cell() convention),
     inv_lattice is its matrix inverse (reciprocal().T)
-    """
-    scaled_symmetrized_forces_T = np.zeros(forces.T.shape)
 
-    scaled_forces_T = np.dot(inv_lattice.T, forces.T)
-    for (r, t, this_op_map) in zip(rot, trans, symm_map):
-        transformed_forces_T = np.dot(r, scaled_forces_T)
-        scaled_symmetrized_forces_T[:, this_op_map] += transformed_forces_T
-    scaled_symmetrized_forces_T /= len(rot)
-    symmetrized_forces = (lattice.T @ scaled_symmetrized_forces_T).T
+    operator is the result of symmetrization_operator(rot, symm_map), which
+    is calculated if not given.
+    """
+    if operator is None:
+        operator = symmetrization_operator(rot, symm_map)
+    scaled_forces = forces @ inv_lattice
+    scaled_symmetrized_forces = (operator @ scaled_forces.ravel()).reshape(
+        forces.shape)
+    symmetrized_forces = scaled_symmetrized_forces @ lattice
 
     return symmetrized_forces
 
@@ -166,10 +198,8 @@ def symmetrize_rank2(lattice, lattice_inv, stress_3_3, rot):
     """
     scaled_stress = np.dot(np.dot(lattice, stress_3_3), lattice.T)
 
-    symmetrized_scaled_stress = np.zeros((3, 3))
-    for r in rot:
-        symmetrized_scaled_stress += np.dot(np.dot(r.T, scaled_stress), r)
-    symmetrized_scaled_stress /= len(rot)
+    symmetrized_scaled_stress = np.einsum('kji,jl,klm->im',
+                                          rot, scaled_stress, rot) / len(rot)
 
     sym = np.dot(np.dot(lattice_inv, symmetrized_scaled_stress), lattice_inv.T)
     return sym
@@ -188,6 +218,8 @@ class FixSymmetry(FixConstraint):
         refine_symmetry(atoms, symprec, self.verbose)  # refine initial symmetry
         sym = prep_symmetry(atoms, symprec, self.verbose)
         self.rotations, self.translations, self.symm_map = sym
+        self.operator = symmetrization_operator(self.rotations,
+                                                self.symm_map)
         self.do_adjust_positions = adjust_positions
         self.do_adjust_cell = adjust_cell
 
@@ -232,7 +264,7 @@ class FixSymmetry(FixConstraint):
         symmetrized_step = symmetrize_rank1(atoms.get_cell(),
                                             atoms.cell.reciprocal().T, step,
                                             self.rotations, self.translations,
-                                            self.symm_map)
+                                            self.symm_map, self.operator)
         new[:] = atoms.positions + symmetrized_step
 
     def adjust_forces(self, atoms, forces):
@@ -241,7 +273,7 @@ class FixSymmetry(FixConstraint):
         forces[:] = symmetrize_rank1(atoms.get_cell(),
                                      atoms.cell.reciprocal().T, forces,
                                      self.rotations, self.translations,
-                                     self.symm_map)
+                                     self.symm_map, self.operator)
 
     def adjust_stress(self, atoms, stress):
         # symmetrize stress as rank 2 tensor
@@ -263,8 +295,9 @@ class FixSymmetry(FixConstraint):
         new_symm_map = []
         for sm in self.symm_map:
             new_sm = np.array([-1] * len(atoms))
-            for at_i in range(len(ind)):
-                new_sm[ind_reversed[at_i]] = ind_reversed[sm[at_i]]
+            new_sm[ind_reversed] = ind_reversed[sm]
             new_symm_map.append(new_sm)
 
         self.symm_map = new_symm_map
+        self.operator = symmetrization_operator(self.rotations,
+                                                self.symm_map)
@@ -10,7 +10,6 @@ knowledge of the space group.
 from typing import Dict, Any
 
 import numpy as np
-from scipy import spatial
 
 import ase
 from ase.symbols import string2symbols
@@ -126,6 +125,7 @@ def crystal(symbols=None, basis=None, occupancies=None, spacegroup=1, setting=1,
         basis_coords = np.array(basis, dtype=float, copy=False, ndmin=2)
 
     if occupancies is not None:
+        from scipy import spatial
         occupancies_dict = {}
 
         for index, coord in enumerate(basis_coords):
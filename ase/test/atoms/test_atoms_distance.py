@@ -1,4 +1,8 @@
 import itertools
+
+import numpy as np
+import pytest
+
 from ase import Atoms
 from ase.geometry import get_distances
 from ase.lattice.cubic import FaceCenteredCubic
@@ -69,3 +73,35 @@ def test_antisymmetry():
 
     for i, j in itertools.combinations(range(len(atoms)), 2):
         assert (vmin[i, j] == -vmin[j, i]).all()
+
+
+@pytest.mark.parametrize('mic', [False, True])
+def test_all_distances_cutoff(mic):
+    from ase.build import bulk
+    from ase.geometry import get_distances, get_pair_distances
+
+    atoms = bulk('Cu', 'hcp', a=2.5, c=4.1) * (2, 2, 1)
+    atoms.rattle(0.2, seed=1)
+    cutoff = 4.0
+
+    dense = atoms.get_all_distances(mic=mic)
+    sparse = atoms.get_all_distances(mic=mic, cutoff=cutoff)
+    assert sparse.shape == dense.shape
+    mask = dense < cutoff
+    np.fill_diagonal(mask, False)
+    assert sparse.nnz == mask.sum()
+    assert np.allclose(sparse.toarray(), np.where(mask, dense, 0.0))
+
+    with pytest.raises(ValueError):
+        atoms.get_all_distances(mic=mic, vector=True, cutoff=cutoff)
+
+    # Pairs between two sets of positions
+    cell = atoms.cell if mic else None
+    pbc = atoms.pbc if mic else None
+    p1 = atoms.positions[:3]
+    D, d = get_distances(p1, atoms.positions, cell=cell, pbc=pbc)
+    i, j, Dp, dp = get_pair_distances(p1, cutoff, p2=atoms.positions,
+                                      cell=cell, pbc=pbc)
+    assert len(i) == (d < cutoff).sum()
+    assert np.allclose(d[i, j], dp)
+    assert np.allclose(D[i, j], Dp)
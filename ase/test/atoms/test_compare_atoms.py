@@ -43,3 +43,104 @@ def test_compare_atoms():
     atoms1 = Atoms(numbers=[0], positions=[[0, 0, 0]])
     atoms2 = Atoms(numbers=[0], positions=[[0, 0, 0]], charges=[1.13])
     assert set(compare_atoms(atoms1, atoms2)) == {"initial_charges"}
+
+
+def test_compare_versioned_atoms():
+    import numpy as np
+    import pytest
+    from ase.build import molecule
+    from ase.calculators.calculator import compare_atoms
+
+    atoms = molecule('H2O')
+    atoms.versioned = True
+    ref = atoms.copy()
+    assert not ref.versioned
+    assert compare_atoms(ref, atoms) == []
+    # Only cell and pbc are compared element-wise
+    assert atoms._get_unchanged_arrays(ref) == set(atoms.arrays)
+
+    version = atoms.get_version('positions')
+    atoms.set_positions(atoms.get_positions() + 0.1)
+    assert atoms.get_version('positions') == version + 1
+    assert compare_atoms(ref, atoms) == ['positions']
+
+    # Setting the same values gives a new version, but the element-wise
+    # comparison finds no change
+    ref = atoms.copy()
+    atoms.set_positions(atoms.get_positions())
+    assert compare_atoms(ref, atoms) == []
+
+    atoms.set_cell([5, 5, 5])
+    assert atoms.get_version('cell') == 1
+    assert compare_atoms(ref, atoms) == ['cell']
+
+    # In-place edits through references fall back to full comparison
+    ref = atoms.copy()
+    pos = atoms.positions
+    assert 'positions' not in atoms._get_unchanged_arrays(ref)
+    pos[0, 0] += 1.0
+    assert compare_atoms(ref, atoms) == ['positions']
+
+    # ... until the array is set again through the public API
+    atoms.set_positions(atoms.get_positions())
+    ref = atoms.copy()
+    assert 'positions' in atoms._get_unchanged_arrays(ref)
+    pos[0, 0] += 1.0
+    assert compare_atoms(ref, atoms) == []
+
+    atoms.numbers[0] = 1
+    assert compare_atoms(ref, atoms) == ['numbers']
+
+    # Copies of other objects are always compared
+    assert atoms._get_unchanged_arrays(atoms.copy().copy()) == set()
+
+    atoms.versioned = False
+    with pytest.raises(RuntimeError):
+        atoms.get_version('positions')
+    assert np.array_equal(atoms.positions, ref.positions)
+
+
+def test_versioned_calculator():
+    from ase.build import molecule
+    from ase.calculators.emt import EMT
+
+    atoms = molecule('H2O')
+    atoms.versioned = True
+    atoms.calc = EMT()
+    e1 = atoms.get_potential_energy()
+    assert atoms.calc.check_state(atoms) == []
+    atoms.positions[0, 2] += 0.1
+    assert atoms.calc.check_state(atoms) == ['positions']
+    e2 = atoms.get_potential_energy()
+    assert e2 != e1
+    atoms.set_positions(atoms.get_positions() - [0, 0, 0.1] * (
+        atoms.numbers == 8)[:, None])
+    assert atoms.get_potential_energy() == e1
+
+
+def test_versioned_inplace_methods():
+    from ase.build import molecule
+    from ase.calculators.emt import EMT
+
+    def move_atom(atoms):
+        atoms[0].position += 0.3
+
+    def move_view(atoms):
+        position = atoms[0].position
+        position += 0.3
+
+    def set_number(atoms):
+        atoms[0].number = 1
+
+    def set_distance(atoms):
+        atoms.set_distance(0, 1, 2.0)
+
+    for change in [move_atom, move_view, set_number, set_distance]:
+        atoms = molecule('CH3CH2OH')
+        atoms.versioned = True
+        atoms.calc = EMT()
+        atoms.get_potential_energy()
+        change(atoms)
+        ref = atoms.copy()
+        ref.calc = EMT()
+        assert atoms.get_potential_energy() == ref.get_potential_energy()
@@ -1,5 +1,9 @@
+import pytest
+
 from ase.build import bulk
+from ase.cli.convert import iread_chunks, random_access_chunks
 from ase.io import read, write
+from ase.io.formats import string2index
 from ase.calculators.calculator import compare_atoms
 
 
@@ -15,3 +19,51 @@ def test_convert(tmp_path, cli):
     assert len(images2) == 2
     for a1, a2 in zip(images, images2):
         assert not compare_atoms(a1, a2)
+
+
+@pytest.mark.parametrize('suffix', ['traj', 'xyz'])
+def test_convert_inplace(tmp_path, cli, suffix):
+    filename = tmp_path / f'images.{suffix}'
+    images = [bulk('Cu') * (i, 1, 1) for i in range(1, 6)]
+    write(filename, images)
+    cli.ase('convert', '-f', str(filename), str(filename))
+    assert read(filename, ':') == images
+
+
+@pytest.fixture
+def trajectory(tmp_path):
+    images = []
+    for i in range(25):
+        atoms = bulk('Cu') * (1 + i % 3, 1, 1)
+        atoms.rattle(0.01, seed=i)
+        atoms.info['step'] = i
+        images.append(atoms)
+    return images
+
+
+@pytest.mark.parametrize('suffix', ['traj', 'xyz'])
+@pytest.mark.parametrize('index', [':', '3:20:4', '-5:', '::-3', '7'])
+def test_convert_jobs(tmp_path, cli, trajectory, suffix, index):
+    infile = tmp_path / f'images.{suffix}'
+    write(infile, trajectory)
+    outfile = tmp_path / 'out.traj'
+    cli.ase('convert', '-j', '2', '--chunk-size', '3', f'-n={index}',
+            str(infile), str(outfile))
+    # Same as a serial read of the input file
+    expected = read(infile, index)
+    steps = [atoms.info['step'] for atoms in trajectory]
+    steps = steps[string2index(index)]
+    if not isinstance(expected, list):
+        expected = [expected]
+        steps = [steps]
+    images = read(outfile, ':')
+    assert images == expected
+    assert [atoms.info['step'] for atoms in images] == steps
+
+
+def test_convert_chunks(tmp_path, trajectory):
+    infile = str(tmp_path / 'images.xyz')
+    write(infile, trajectory)
+    images = list(iread_chunks(infile, '2:', jobs=2, chunksize=4))
+    assert images == read(infile, '2:')
+    assert random_access_chunks(infile + '.gz', ':', None, 4) is None
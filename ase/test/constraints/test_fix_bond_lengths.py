@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+
+from ase import Atoms
+from ase.calculators.tip3p import rOH, angleHOH
+from ase.constraints import FixBondLengths, FixLinearTriatomic
+
+
+@pytest.fixture
+def water_box():
+    x = angleHOH * np.pi / 180 / 2
+    water = Atoms('OH2',
+                  positions=[[0, 0, 0],
+                             [0, rOH * np.cos(x), rOH * np.sin(x)],
+                             [0, rOH * np.cos(x), -rOH * np.sin(x)]],
+                  cell=[3.1, 3.1, 3.1], pbc=True)
+    atoms = water.repeat((3, 3, 3))
+    atoms.rattle(0.05, seed=1)
+    # Molecules cross the cell boundaries
+    atoms.wrap()
+    n = len(atoms) // 3
+    pairs = ([(3 * i, 3 * i + 1) for i in range(n)] +
+             [(3 * i, 3 * i + 2) for i in range(n)] +
+             [(3 * i + 1, 3 * i + 2) for i in range(n)])
+    return atoms, pairs
+
+
+def test_pair_groups(water_box):
+    atoms, pairs = water_box
+    constraint = FixBondLengths(pairs)
+    groups = constraint.get_pair_groups()
+    assert len(groups) == 3
+    assert sorted(np.concatenate(groups)) == list(range(len(pairs)))
+    for group in groups:
+        indices = constraint.pairs[group].ravel()
+        assert len(np.unique(indices)) == len(indices)
+
+
+def test_fix_bond_lengths(water_box):
+    atoms, pairs = water_box
+    constraint = FixBondLengths(pairs)
+    d0 = [atoms.get_distance(a, b, mic=True) for a, b in pairs]
+
+    rng = np.random.RandomState(2)
+    new = atoms.positions + 0.01 * rng.randn(len(atoms), 3)
+    constraint.adjust_positions(atoms, new)
+    assert constraint.bondlengths == pytest.approx(d0, abs=1e-12)
+    atoms.positions = new
+    d1 = [atoms.get_distance(a, b, mic=True) for a, b in pairs]
+    assert d1 == pytest.approx(d0, abs=1e-10)
+
+    # The relative velocities along the bonds are removed
+    p = rng.randn(len(atoms), 3)
+    constraint.adjust_momenta(atoms, p)
+    v = p / atoms.get_masses()[:, None]
+    for a, b in pairs:
+        d = atoms.get_distance(a, b, mic=True, vector=True)
+        assert np.dot(v[a] - v[b], d) == pytest.approx(0, abs=1e-10)
+
+
+def test_linear_triatomic_bond_lengths():
+    atoms = Atoms('CO2', positions=[[9.5, 0, 0], [0, 0, 0], [0.5, 0, 0]],
+                  cell=[10, 10, 10], pbc=True)
+    constraint = FixLinearTriatomic(triples=[(0, 1, 2)])
+    bondlengths = constraint.initialize_bond_lengths(atoms)
+    assert bondlengths.shape == (1, 2)
+    assert bondlengths.ravel() == pytest.approx([0.5, 0.5])
+
+
+def test_fix_bond_lengths_list():
+    atoms = Atoms('OH2', positions=[[0, 0, 0], [1.1, 0, 0], [0, 0.9, 0]])
+    constraint = FixBondLengths([(0, 1), (0, 2)], bondlengths=[1.0, 1.0])
+    atoms.set_constraint(constraint)
+
+    atoms.set_positions([[0, 0, 0], [1.2, 0.1, 0], [0.1, 0.8, 0]])
+    assert atoms.get_distance(0, 1) == pytest.approx(1.0, abs=1e-10)
+    assert atoms.get_distance(0, 2) == pytest.approx(1.0, abs=1e-10)
+
+    atoms.set_momenta([[0, 0, 0], [1, 0.5, 0], [0.5, -1, 0]])
+    v = atoms.get_velocities()
+    for a, b in [(0, 1), (0, 2)]:
+        d = atoms.get_distance(a, b, vector=True)
+        assert np.dot(v[a] - v[b], d) == pytest.approx(0, abs=1e-10)
+
+
+def test_fix_bond_lengths_empty():
+    atoms = Atoms('OH2', positions=[[0, 0, 0], [1.1, 0, 0], [0, 0.9, 0]])
+    atoms.set_constraint(FixBondLengths([]))
+    atoms.set_positions(atoms.positions + 0.1)
+    atoms.set_momenta(np.ones((3, 3)))
+    assert atoms.positions[0] == pytest.approx([0.1, 0.1, 0.1])
+    assert atoms.get_momenta() == pytest.approx(np.ones((3, 3)))
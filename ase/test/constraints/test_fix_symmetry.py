@@ -5,7 +5,9 @@ from ase.atoms import Atoms
 from ase.build import bulk
 from ase.calculators.calculator import all_changes
 from ase.calculators.lj import LennardJones
-from ase.spacegroup.symmetrize import FixSymmetry, check_symmetry, is_subgroup
+from ase.spacegroup.symmetrize import (FixSymmetry, check_symmetry,
+                                       is_subgroup, prep_symmetry,
+                                       symmetrize_rank1)
 from ase.optimize.precon.lbfgs import PreconLBFGS
 from ase.constraints import UnitCellFilter, ExpCellFilter
 
@@ -143,3 +145,26 @@ def test_fix_symmetry_shuffle_indices():
     permut_dp2 = perturb(at_permut, pos0, 1, (0.0, 0.1, -0.1))
     assert np.max(np.abs(dp1 - permut_dp1)) < 1.0e-10
     assert np.max(np.abs(dp2 - permut_dp2)) < 1.0e-10
+
+
+def test_symmetrize_rank1_operator():
+    atoms = bulk('Al', 'fcc', a=4.05, cubic=True) * (2, 1, 1)
+    atoms.set_cell(atoms.cell * [1.0, 1.1, 1.1], scale_atoms=True)
+    rot, trans, symm_map = prep_symmetry(atoms)
+    lattice = atoms.cell.array
+    inv_lattice = atoms.cell.reciprocal().T
+    forces = np.random.RandomState(0).normal(size=(len(atoms), 3))
+
+    # reference: average over the symmetry operations one at a time
+    scaled_forces = forces @ inv_lattice
+    ref = np.zeros_like(forces)
+    for r, this_op_map in zip(rot, symm_map):
+        ref[this_op_map] += scaled_forces @ r.T
+    ref = ref / len(rot) @ lattice
+
+    symmetrized = symmetrize_rank1(lattice, inv_lattice, forces,
+                                   rot, trans, symm_map)
+    assert symmetrized == pytest.approx(ref, abs=1e-12)
+    # symmetrizing twice changes nothing
+    assert symmetrize_rank1(lattice, inv_lattice, symmetrized, rot, trans,
+                            symm_map) == pytest.approx(symmetrized, abs=1e-12)
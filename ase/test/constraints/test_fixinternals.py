@@ -192,3 +192,47 @@ def test_undefined_dihedral_error():
     opt = BFGS(atoms)
     with pytest.raises(ZeroDivisionError):
         opt.run()
+
+
+def test_many_constraints():
+    """All bonds of a molecule are fixed at once and the projected forces
+    are orthogonal to all constraints."""
+    import numpy as np
+    from ase.neighborlist import neighbor_list
+    atoms = molecule('C60')
+    i, j = neighbor_list('ij', atoms, 1.6)
+    bonds = [(None, [a, b]) for a, b in zip(i, j) if a < b]
+    constr = FixInternals(bonds=bonds,
+                          dihedrals_deg=[(None, [0, 1, 2, 3])])
+    atoms.set_constraint(constr)
+    ref = atoms.copy()
+    rng = np.random.RandomState(42)
+    atoms.set_positions(atoms.positions +
+                        rng.normal(scale=0.05, size=(len(atoms), 3)))
+    for _, (a, b) in bonds:
+        assert atoms.get_distance(a, b) == pytest.approx(
+            ref.get_distance(a, b), abs=1e-7)
+    assert atoms.get_dihedral(0, 1, 2, 3) == pytest.approx(
+        ref.get_dihedral(0, 1, 2, 3), abs=1e-5)
+
+    forces = rng.normal(size=(len(atoms), 3))
+    constr.adjust_forces(atoms, forces)
+    for sub in constr.constraints:
+        assert sub.jacobian @ forces.ravel() == pytest.approx(0, abs=1e-10)
+
+
+def test_no_constraints():
+    import numpy as np
+    atoms = setup_atoms()
+    constr = FixInternals()
+    atoms.set_constraint(constr)
+    positions = atoms.positions + 0.1
+    atoms.set_positions(positions)
+    assert atoms.positions == pytest.approx(positions)
+    assert len(constr.get_sigmas(positions)) == 0
+    assert constr.get_jacobian(positions).shape == (0, 3 * len(atoms))
+
+    # Only translations and rotations are projected out
+    forces = np.ones((len(atoms), 3))
+    constr.adjust_forces(atoms, forces)
+    assert forces == pytest.approx(0)
@@ -0,0 +1,98 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from ase.build import bulk
+from ase.calculators.emt import EMT
+from ase.constraints import FixAtoms
+from ase.io import read, write
+from ase.io.bundletrajectory import (BundleTrajectory,
+                                     print_bundletrajectory_info)
+
+
+@pytest.fixture
+def images():
+    atoms = bulk('Cu', cubic=True) * (2, 2, 1)
+    atoms.set_constraint(FixAtoms(indices=[0]))
+    atoms.set_tags(np.arange(len(atoms)))
+    atoms.set_momenta(np.ones((len(atoms), 3)))
+    images = []
+    for i in range(7):
+        atoms = atoms.copy()
+        atoms.rattle(seed=i)
+        atoms.calc = EMT()
+        atoms.get_forces()
+        images.append(atoms)
+    return images
+
+
+@pytest.mark.parametrize('compression', ['zlib', 'lzma', None])
+def test_column_backend(images, compression):
+    write('traj.bundle', images, format='bundletrajectory',
+          backend='column', compression=compression, chunksize=3)
+    # No directory for each frame
+    assert sorted(p.name for p in (Path('traj.bundle').iterdir())) == [
+        'columns', 'frames', 'log.txt', 'metadata.json']
+
+    images1 = read('traj.bundle', ':')
+    assert len(images1) == len(images)
+    for atoms, atoms1 in zip(images, images1):
+        assert atoms1 == atoms
+        assert atoms1.get_tags() == pytest.approx(atoms.get_tags())
+        assert atoms1.get_momenta() == pytest.approx(atoms.get_momenta())
+        assert atoms1.get_potential_energy() == pytest.approx(
+            atoms.get_potential_energy())
+        assert atoms1.get_forces() == pytest.approx(atoms.get_forces())
+        assert len(atoms1.constraints) == 1
+
+    traj = BundleTrajectory('traj.bundle')
+    assert traj[-2] == images[-2]
+    positions = traj.read_time_series('positions', [1, 3])
+    assert positions == pytest.approx(
+        np.array([atoms.positions[[1, 3]] for atoms in images]))
+    with pytest.raises(ValueError):
+        traj.read_time_series('tags')
+    traj.close()
+
+
+@pytest.mark.parametrize('backend', ['ulm', 'column'])
+def test_read_time_series(images, backend):
+    write('traj.bundle', images, format='bundletrajectory', backend=backend)
+    traj = BundleTrajectory('traj.bundle')
+    forces = traj.read_time_series('forces', 2)
+    assert forces == pytest.approx(
+        np.array([atoms.get_forces()[2] for atoms in images]))
+    positions = traj.read_time_series('positions')
+    assert positions == pytest.approx(
+        np.array([atoms.positions for atoms in images]))
+    traj.close()
+
+
+def test_column_backend_incomplete(images):
+    traj = BundleTrajectory('traj.bundle', 'w', backend='column',
+                            chunksize=3, singleprecision=True)
+    for atoms in images:
+        traj.write(atoms)
+    # Only complete chunks are stored before the trajectory is closed
+    images1 = read('traj.bundle', ':')
+    assert len(images1) == 6
+    assert images1[5].positions.dtype == np.float64
+    assert images1[5].positions == pytest.approx(images[5].positions,
+                                                 abs=1e-5)
+    traj.close()
+    assert len(read('traj.bundle', ':')) == 7
+
+
+def test_column_backend_append(images, capsys):
+    write('traj.bundle', images[:4], format='bundletrajectory',
+          backend='column', chunksize=3)
+    write('traj.bundle', images[4:], format='bundletrajectory',
+          append=True)
+    images1 = read('traj.bundle', ':')
+    assert images1 == images
+
+    print_bundletrajectory_info('traj.bundle')
+    out = capsys.readouterr().out
+    assert 'Number of frames: 7' in out
+    assert 'positions: shape = (16, 3)' in out
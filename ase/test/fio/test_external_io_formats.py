@@ -6,6 +6,7 @@ import pytest
 import copy
 import sys
 import io
+import json
 
 if sys.version_info >= (3, 8):
     from importlib.metadata import EntryPoint
@@ -14,7 +15,9 @@ else:
 
 from ase.build import bulk
 from ase.io import formats, read, write
-from ase.io.formats import define_external_io_format
+from ase.io.formats import (define_external_io_format, filetype,
+                            register_external_io_formats,
+                            UnknownFileTypeError)
 from ase.utils.plugins import ExternalIOFormat
 
 
@@ -35,6 +38,14 @@ VALID_IO_FORMAT = ExternalIOFormat(
 )
 
 
+GLOB_IO_FORMAT = ExternalIOFormat(
+    desc='Test IO format with file name pattern',
+    code='1F',
+    module='ase.test.fio.test_external_io_formats',
+    glob='dummyfile*'
+)
+
+
 # These are dummy functions for reading and writing the dummy io format
 def read_dummy(file):
     return "Atoms dummy"
@@ -130,3 +141,53 @@ def test_external_ioformat_import_error():
         define_external_io_format(test_entry_point)
 
     assert 'dummy' not in formats.ioformats
+
+
+def test_external_ioformat_filetype():
+    """
+    Test that the file name patterns of an external io format
+    are used after it is registered
+    """
+
+    with pytest.raises(UnknownFileTypeError):
+        filetype('dummyfile1', read=False)
+
+    test_entry_point = EntryPoint(
+        name='dummy',
+        value='ase.test.fio.test_external_io_formats:GLOB_IO_FORMAT',
+        group='ase.ioformats')
+
+    define_external_io_format(test_entry_point)
+
+    assert filetype('dummyfile1', read=False) == 'dummy'
+
+
+def test_external_ioformat_cache(tmp_path, monkeypatch):
+    """
+    Test the cache of entry points in the ASE_IOFORMATS_CACHE directory
+    """
+
+    monkeypatch.setenv('ASE_IOFORMATS_CACHE', str(tmp_path))
+    group = 'ase.test.ioformats'
+    assert formats._find_entry_points(group) == []
+    path = formats._get_entry_point_cache_path(group)
+    with open(path) as fd:
+        cache = json.load(fd)
+    assert cache['entry_points'] == []
+
+    # A cache with the same key is used instead of the installed packages
+    cache['entry_points'] = [
+        ['dummy', 'ase.test.fio.test_external_io_formats:VALID_IO_FORMAT']]
+    with open(path, 'w') as fd:
+        json.dump(cache, fd)
+    register_external_io_formats(group)
+    assert formats.ioformats['dummy'].description == 'Test IO format'
+
+    # Changes to sys.path invalidate the cache
+    monkeypatch.syspath_prepend(str(tmp_path))
+    assert formats._find_entry_points(group) == []
+
+    # An unwritable cache directory is ignored
+    (tmp_path / 'file').write_text('')
+    monkeypatch.setenv('ASE_IOFORMATS_CACHE', str(tmp_path / 'file' / 'x'))
+    assert formats._find_entry_points(group) == []
@@ -392,3 +392,32 @@ def test_write_read_charges(at, tmpdir, enable_initial_charges, enable_charges):
         assert np.allclose(r.get_initial_charges(), initial_charges)
     if enable_charges:
         assert np.allclose(r.get_charges(), charges)
+
+
+def test_write_executor(images):
+    from concurrent.futures import ThreadPoolExecutor
+    from io import StringIO
+    images = images * 5
+    for i, atoms in enumerate(images):
+        atoms = images[i] = atoms.copy()
+        atoms.info['step'] = i
+        atoms.set_constraint(FixAtoms([0]))
+        atoms.calc = SinglePointCalculator(atoms, energy=float(i),
+                                           forces=np.ones((len(atoms), 3)))
+    columns = ['symbols', 'positions', 'move_mask']
+
+    for kwargs in [{}, {'columns': columns}, {'plain': True}]:
+        serial = StringIO()
+        extxyz.write_xyz(serial, images, **kwargs)
+        parallel = StringIO()
+        with ThreadPoolExecutor(2) as executor:
+            extxyz.write_xyz(parallel, images, executor=executor,
+                             chunksize=4, **kwargs)
+        assert parallel.getvalue() == serial.getvalue()
+
+    with ThreadPoolExecutor(2) as executor:
+        ase.io.write('parallel.xyz', images, executor=executor, chunksize=3)
+    frames = ase.io.read('parallel.xyz', ':')
+    assert frames == images
+    assert [atoms.info['step'] for atoms in frames] == list(range(15))
+    assert frames[-1].get_potential_energy() == 14.0
@@ -19,3 +19,27 @@ def test_ioformat(name):
     print('=' * len(name))
     print(ioformat.full_description())
     print()
+
+
+def test_format_matcher():
+    from ase.io import formats
+    matcher = formats.get_format_matcher()
+    assert formats.get_format_matcher() is matcher
+
+    names = ['OUTCAR', 'x.OUTCAR.gz', 'vasprun.xml', 'POSCAR_1', 'coord',
+             'gradient', 'a.XV', 'input.xml', 'xyz.in', 'x_o_GSR.nc', 'inp',
+             'HISTORY', 'a.xyz', 'unknown']
+    for name in names:
+        fmt = matcher.match_name(name)
+        expected = [f for f in formats.ioformats.values()
+                    if f.match_name(name)]
+        assert fmt is (expected[0] if expected else None)
+
+    samples = [b'ITEM: TIMESTEP\n1\n', b'$coord\n', b'CDF\x01',
+               b'- of UlmASE-Trajectory', b'Some text\n Program PWSCF v.6',
+               b'3\n\nH 0 0 0\n']
+    for data in samples:
+        fmt = matcher.match_magic(data)
+        expected = [f for f in formats.ioformats.values()
+                    if f.match_magic(data)]
+        assert fmt is (expected[0] if expected else None)
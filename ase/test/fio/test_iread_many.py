@@ -0,0 +1,48 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from ase.build import bulk
+from ase.io import iread_many, read, write
+
+
+@pytest.fixture
+def files(tmp_path):
+    names = []
+    for i in range(7):
+        atoms = bulk('Cu', a=3.6 + 0.01 * i)
+        name = str(tmp_path / f'{i}.xyz')
+        write(name, [atoms, atoms * (1, 1, 2)])
+        names.append(name)
+    bad = tmp_path / '7.xyz'
+    bad.write_text('not an xyz file\n')
+    names.append(str(bad))
+    return names
+
+
+def test_iread_many(files):
+    results = list(iread_many(files, chunksize=3, max_workers=2))
+    assert [name for name, _ in results] == files
+    for name, atoms in results[:-1]:
+        assert atoms == read(name)
+    assert isinstance(results[-1][1], Exception)
+
+
+def test_iread_many_glob(files, tmp_path):
+    with ThreadPoolExecutor(2) as executor:
+        results = dict(iread_many(tmp_path / '*.xyz', index=':',
+                                  ordered=False, chunksize=2,
+                                  executor=executor))
+    assert sorted(results) == sorted(files)
+    for name in files[:-1]:
+        assert results[name] == read(name, ':')
+
+
+def test_iread_many_errors(files):
+    with ThreadPoolExecutor(1) as executor:
+        with pytest.raises(Exception):
+            for _ in iread_many(files, errors='raise', executor=executor):
+                pass
+    with pytest.raises(TypeError):
+        with open(files[0]) as fd:
+            next(iread_many([fd]))
@@ -1,7 +1,13 @@
+import inspect
+import io
+
 import numpy as np
 import pytest
 
+from ase.io import iread
 from ase.io.formats import ioformats, match_magic
+from ase.io.lammpsrun import (index_lammps_dump_text, iread_lammps_dump_text,
+                              read_lammps_dump_text)
 
 # some of the possible bound parameters
 bounds_parameters = [
@@ -126,3 +132,79 @@ def test_lammpsdump_bounds(fmt, lammpsdump, bounds, expected):
     atoms = fmt.parse_atoms(lammpsdump(bounds=bounds))
     assert pytest.approx(atoms.cell.lengths()) == [4., 5., 20.]
     assert np.all(atoms.get_pbc() == expected)
+
+
+def multiframe_dump(nframes):
+    frames = []
+    for i in range(nframes):
+        frames.append(f"""\
+ITEM: TIMESTEP
+{i}
+ITEM: NUMBER OF ATOMS
+2
+ITEM: BOX BOUNDS pp pp pp
+0.0 4.0
+0.0 5.0
+0.0 20.0
+ITEM: ATOMS id type x y z
+1 1 {i} 0.0 0.0
+2 1 0.0 {i} 1.0
+""")
+    return "".join(frames)
+
+
+class NonSeekable(io.StringIO):
+    def seekable(self):
+        return False
+
+
+@pytest.mark.parametrize("index", [0, 3, -1, -4, slice(None),
+                                   slice(1, None, 2), slice(-3, None),
+                                   slice(None, None, -2), slice(2, -1),
+                                   slice(7, 10), "1:4"])
+@pytest.mark.parametrize("stream", [io.StringIO, NonSeekable])
+def test_lammpsdump_iread(index, stream):
+    nframes = 6
+    frames = list(range(nframes))
+    if isinstance(index, str):
+        expected = frames[1:4]
+    elif isinstance(index, slice):
+        expected = frames[index]
+    else:
+        expected = [frames[index]]
+
+    images = list(iread_lammps_dump_text(stream(multiframe_dump(nframes)),
+                                         index=index))
+    assert [atoms.positions[0, 0] for atoms in images] == expected
+
+    atoms = read_lammps_dump_text(io.StringIO(multiframe_dump(nframes)),
+                                  index=-2)
+    assert atoms.positions[1, 1] == nframes - 2
+
+
+def test_lammpsdump_index():
+    fd = io.StringIO(multiframe_dump(4))
+    offsets = index_lammps_dump_text(fd)
+    assert len(offsets) == 4
+    fd.seek(offsets[2])
+    assert fd.readline() == "ITEM: TIMESTEP\n"
+    assert fd.readline() == "2\n"
+
+
+def test_lammpsdump_incomplete_frame():
+    buf = multiframe_dump(3)[:-10]
+    images = list(iread_lammps_dump_text(io.StringIO(buf), index=slice(None)))
+    assert len(images) == 2
+    atoms = read_lammps_dump_text(io.StringIO(buf), index=-1)
+    assert atoms.positions[0, 0] == 1
+
+
+def test_lammpsdump_iread_lazy():
+    buf = multiframe_dump(4)
+    fd = io.StringIO(buf)
+    images = iread(fd, ':', format='lammps-dump-text')
+    assert inspect.isgenerator(images)
+    atoms = next(images)
+    assert atoms.positions[0, 0] == 0
+    assert fd.tell() < len(buf) // 2
+    assert [atoms.positions[0, 0] for atoms in images] == [1, 2, 3]
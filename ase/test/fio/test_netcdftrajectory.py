@@ -227,3 +227,77 @@ def test_types_to_numbers_argument(co):
     assert (traj[-1].numbers == [15, 8]).all()
 
     traj.close()
+
+
+def test_read_frames(co):
+    images = []
+    for i in range(12):
+        atoms = co.copy()
+        atoms.positions[:, 2] += 0.1 * i
+        atoms.set_momenta(np.full((2, 3), 0.01 * i))
+        atoms.set_array('charges', np.array([i, -i], float))
+        images.append(atoms)
+    with NetCDFTrajectory('9.nc', 'w') as traj:
+        for i, atoms in enumerate(images):
+            traj.write(atoms, arrays=['charges'], time=0.5 * i)
+
+    traj = NetCDFTrajectory('9.nc', 'r', chunk_size=5)
+    data = traj.read_frames(slice(1, None, 3))
+    assert data['positions'].shape == (4, 2, 3)
+    assert np.allclose(data['positions'],
+                       [atoms.positions for atoms in images[1::3]])
+    assert np.allclose(data['charges'][:, 0], [1, 4, 7, 10])
+    assert np.allclose(data['time'], [0.5, 2.0, 3.5, 5.0])
+    assert (data['numbers'] == [6, 8]).all()
+
+    for index in [slice(None), slice(2, 9, 2), slice(None, None, -4),
+                  slice(-3, None)]:
+        frames = traj[index]
+        assert len(frames) == len(images[index])
+        for atoms, ref in zip(frames, images[index]):
+            assert np.allclose(atoms.positions, ref.positions)
+            assert np.allclose(atoms.get_momenta(), ref.get_momenta())
+            assert np.allclose(atoms.cell, ref.cell)
+            assert np.allclose(atoms.get_array('charges'),
+                               ref.get_array('charges'))
+        assert [atoms.info['time'] for atoms in frames] == \
+            list(np.arange(12)[index] * 0.5)
+    with pytest.raises(IndexError):
+        traj.read_frames(12)
+    traj.close()
+
+
+def test_nonconsecutive_index_read_frames(netCDF4):
+    test_netcdf_with_nonconsecutive_index(netCDF4)
+    with NetCDFTrajectory('7.nc', 'r') as traj:
+        data = traj.read_frames()
+        assert (data['numbers'] == [[2, 3, 1], [3, 1, 2]]).all()
+        assert np.allclose(data['positions'][1], [[14, 16, 18], [2, 4, 6],
+                                                  [8, 10, 12]])
+
+
+def test_chunking_and_compression(co):
+    with NetCDFTrajectory('10.nc', 'w', netcdf_format='NETCDF4',
+                          chunksizes={'coordinates': 4, 'cell_angles': (8, 3)},
+                          compression='zlib', complevel=6) as traj:
+        for i in range(10):
+            co.positions[:, 2] += 0.1
+            traj.write(co)
+
+    import netCDF4
+    nc = netCDF4.Dataset('10.nc')
+    try:
+        positions = nc.variables['coordinates']
+        assert positions.chunking() == [4, 2, 3]
+        assert positions.filters()['zlib']
+        assert positions.filters()['complevel'] == 6
+        assert nc.variables['cell_angles'].chunking() == [8, 3]
+    finally:
+        nc.close()
+
+    images = read('10.nc', ':', format='netcdftrajectory')
+    assert len(images) == 10
+    assert np.allclose(images[-1].positions, co.positions)
+
+    with pytest.raises(ValueError):
+        NetCDFTrajectory('11.nc', 'w', compression='zlib')
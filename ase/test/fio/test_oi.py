@@ -47,12 +47,12 @@ def check(a, ref_atoms, format):
     assert abs(a.positions - ref_atoms.positions).max() < 1e-6, \
         (a.positions - ref_atoms.positions)
     if format in ['traj', 'cube', 'cfg', 'struct', 'gen', 'extxyz',
-                  'db', 'json', 'trj']:
+                  'db', 'json', 'trj', 'ragged']:
         assert abs(a.cell - ref_atoms.cell).max() < 1e-6
-    if format in ['cfg', 'extxyz']:
+    if format in ['cfg', 'extxyz', 'ragged']:
         assert abs(a.get_array('extra') -
                    ref_atoms.get_array('extra')).max() < 1e-6
-    if format in ['extxyz', 'traj', 'trj', 'db', 'json']:
+    if format in ['extxyz', 'traj', 'trj', 'db', 'json', 'ragged']:
         assert (a.pbc == ref_atoms.pbc).all()
         assert a.get_potential_energy() == ref_atoms.get_potential_energy()
         assert (a.get_stress() == ref_atoms.get_stress()).all()
@@ -0,0 +1,114 @@
+import io
+
+import numpy as np
+import pytest
+
+from ase.build import bulk, molecule
+from ase.calculators.singlepoint import SinglePointCalculator
+from ase.constraints import FixAtoms
+from ase.io import iread, read, write
+from ase.io.ragged import RaggedFrames
+
+
+@pytest.fixture
+def images():
+    images = []
+    for n in range(1, 5):
+        atoms = bulk('Cu') * (n, 1, 1)
+        atoms.rattle(0.1, seed=n)
+        atoms.info['step'] = n
+        atoms.info['config_type'] = 'bulk' * n
+        images.append(atoms)
+    images[1].set_constraint(FixAtoms([0]))
+    images[2].set_initial_magnetic_moments(np.arange(3.0))
+    images[2].info['params'] = {'kpts': [4, 4, 4]}
+    images[3].calc = SinglePointCalculator(images[3], energy=-1.5,
+                                           forces=np.ones((4, 3)),
+                                           stress=np.arange(6.0))
+    mol = molecule('CH3CH2OH')
+    mol.info['step'] = np.arange(3)
+    images.append(mol)
+    return images
+
+
+def check(frames, images):
+    assert len(frames) == len(images)
+    for atoms, ref in zip(frames, images):
+        assert atoms == ref
+        assert atoms.info.keys() == ref.info.keys()
+        for key, value in ref.info.items():
+            assert np.all(atoms.info[key] == value)
+        assert atoms.arrays.keys() == ref.arrays.keys()
+        assert str(atoms.constraints) == str(ref.constraints)
+        if ref.calc is None:
+            assert atoms.calc is None
+        else:
+            assert atoms.get_potential_energy() == ref.get_potential_energy()
+            assert (atoms.get_forces() == ref.get_forces()).all()
+            assert (atoms.get_stress() == ref.get_stress()).all()
+
+
+def test_ragged(images):
+    write('images.ragged', images)
+    check(read('images.ragged', ':'), images)
+    check(list(iread('images.ragged', '1::2')), images[1::2])
+    assert read('images.ragged') == images[-1]
+
+    frames = RaggedFrames.read('images.ragged')
+    check(frames, images)
+    assert list(frames.natoms) == [len(atoms) for atoms in images]
+    positions = frames.atom_arrays['positions']
+    assert not positions.flags.writeable
+    assert (frames.get('positions', 2) == images[2].positions).all()
+    assert frames.get('initial_magmoms', 1) is None
+    assert frames.get('calc.energy', -2) == -1.5
+    assert frames.missing['calc.energy'] == [0, 1, 2, 4]
+    assert 'info.params' in frames.objects
+    with pytest.raises(ValueError):
+        frames.stack('positions')
+
+
+def test_ragged_fileobj(images):
+    buf = io.BytesIO()
+    write(buf, images, format='ragged')
+    buf.seek(0)
+    check(read(buf, ':', format='ragged'), images)
+
+    write('images.ragged.gz', images)
+    check(read('images.ragged.gz', ':'), images)
+
+
+def test_ragged_mixed_kinds():
+    images = [bulk('Cu') for _ in range(3)]
+    for atoms, value in zip(images, [1, 1.5, True]):
+        atoms.info['n'] = value
+    write('mixed.ragged', images)
+    values = [atoms.info['n'] for atoms in read('mixed.ragged', ':')]
+    assert values == [1, 1.5, True]
+    assert [type(value) for value in values] == [int, float, bool]
+    assert 'info.n' in RaggedFrames.read('mixed.ragged').objects
+
+
+def test_ragged_empty():
+    write('empty.ragged', [])
+    assert read('empty.ragged', ':') == []
+    frames = RaggedFrames.read('empty.ragged')
+    assert len(frames) == 0
+    assert frames.atom_arrays['positions'].shape == (0, 3)
+
+
+def test_stacked():
+    positions = np.random.RandomState(42).rand(5, 3, 3)
+    numbers = np.ones((5, 3), int)
+    energy = np.arange(5.0)
+    frames = RaggedFrames.from_stacked(
+        {'numbers': numbers, 'positions': positions},
+        {'calc.energy': energy})
+    frames.write('stacked.ragged')
+
+    frames = RaggedFrames.read('stacked.ragged')
+    assert (frames.stack('positions') == positions).all()
+    assert (frames.stack('calc.energy') == energy).all()
+    atoms = read('stacked.ragged', 3)
+    assert (atoms.positions == positions[3]).all()
+    assert atoms.get_potential_energy() == 3.0
@@ -125,3 +125,30 @@ def test_constraint_and_momenta():
         t.write()
     b = read('constraint.traj')
     assert not (b.get_momenta() - a.get_momenta()).any()
+
+
+def test_encoding(co):
+    from ase.calculators.emt import EMT
+    from ase.io.ulm import Reader
+    images = []
+    for i in range(5):
+        atoms = co.copy()
+        atoms.rattle(seed=i)
+        atoms.calc = EMT()
+        atoms.get_forces()
+        images.append(atoms)
+
+    encoding = {'positions': {'dtype': 'float32', 'delta': 3,
+                              'compression': 'zlib'},
+                'calculator.forces': {'dtype': 'float32'}}
+    with Trajectory('encoded.traj', 'w', encoding=encoding) as t:
+        for atoms in images:
+            t.write(atoms)
+
+    images1 = read('encoded.traj', ':')
+    for atoms, atoms1 in zip(images, images1):
+        assert atoms1.positions == pytest.approx(atoms.positions, abs=1e-6)
+        assert atoms1.get_forces() == pytest.approx(atoms.get_forces(),
+                                                    abs=1e-5)
+    with Reader('encoded.traj') as r:
+        assert r[1]._data['positions'].encoding['stored_as'] == 'float32'
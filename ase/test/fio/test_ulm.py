@@ -81,3 +81,39 @@ def test_ulm_copy(ulmfile):
     with ulm.open(path) as r:
         assert 'a' not in r
         assert 'y' in r
+
+
+@pytest.mark.parametrize('options', [{'dtype': 'float32'},
+                                     {'compression': 'zlib'},
+                                     {'compression': 'lzma', 'delta': 3},
+                                     {'dtype': 'float32', 'delta': 4,
+                                      'compression': 'zlib'}])
+def test_encoding(tmp_path, options):
+    path = tmp_path / 'e.ulm'
+    rng = np.random.RandomState(42)
+    arrays = np.cumsum(rng.normal(size=(10, 5, 3)), axis=0)
+    encoding = {'x': options, 'a.x': options}
+    with ulm.open(path, 'w', encoding=encoding) as w:
+        for x in arrays:
+            w.write(x=x, a=A(), n=np.arange(4))
+            w.sync()
+
+    tol = 1e-6 if 'dtype' in options else 0
+    with ulm.open(path) as r:
+        # Read in random order, such that delta-encoded arrays must
+        # be decoded from their references
+        for i in [7, 2, 9, 0, 8]:
+            x = r[i].x
+            assert x.dtype == float
+            assert x == pytest.approx(arrays[i], rel=tol, abs=tol)
+            assert (r[i].a.x == 1).all()
+            assert (r[i].n == np.arange(4)).all()
+        assert r[3].proxy('n')[1:3].tolist() == [1, 2]
+        assert r[4].proxy('x', 2) == pytest.approx(arrays[4, 2], rel=tol,
+                                                   abs=tol)
+        for i, item in enumerate(r):
+            assert item.x[1:3] == pytest.approx(arrays[i, 1:3], rel=tol,
+                                                abs=tol)
+
+    with pytest.raises(ValueError):
+        ulm.open(path, 'w', encoding={'x': {'compression': 'bz2'}})
@@ -345,3 +345,114 @@ def test_vasp_parameters(vasprun, calculation):
                      ('isym', 0), ('symprec', 1e-05)])
 
     assert atoms.calc.parameters == expected_parameters
+
+
+EIGENVALUES = """\
+  <eigenvalues>
+   <array>
+    <set>
+     <set comment="spin 1">
+      <set comment="kpoint 1">
+       <r>   -1.0000    1.0000 </r>
+       <r>    2.0000    0.0000 </r>
+      </set>
+     </set>
+    </set>
+   </array>
+  </eigenvalues>
+  <dos>
+   <i name="efermi">      0.50000000 </i>
+   <total>
+    <array>
+     <set>
+      <r>   -1.0000    0.1000    0.1000 </r>
+     </set>
+    </array>
+   </total>
+  </dos>
+ </calculation>
+"""
+
+
+@pytest.fixture()
+def complete_vasprun(vasprun, calculation):
+    # Five complete calculations, which alternate between the two
+    # test cases
+    records = [vasprun.replace(
+        '<varray name="kpointlist" >',
+        '<varray name="weights" >\n   <v> 1.0 </v>\n  </varray>\n'
+        '  <varray name="kpointlist" >')]
+    expected = []
+    for i in range(5):
+        record, values = calculation(test_case_index=i % 2)
+        records.append(record + EIGENVALUES)
+        expected.append(values)
+    return ''.join(records) + '</modeling>\n', expected
+
+
+@pytest.mark.parametrize('index', [-1, 0, 3, -4, ':', '::2', '-2:',
+                                   '::-2', '1:4'])
+def test_read_vasp_xml_index(tmp_path, complete_vasprun, index):
+    from ase.io.formats import string2index
+    text, expected = complete_vasprun
+    path = tmp_path / 'vasprun.xml'
+    path.write_text(text)
+
+    # Read by seeking to the calculations, and by parsing the whole file
+    images = read(path, index=index, format='vasp-xml')
+    images_parsed = read(StringIO(text), index=index, format='vasp-xml')
+    if isinstance(string2index(str(index)), int):
+        images = [images]
+        images_parsed = [images_parsed]
+        expected = [expected[string2index(str(index))]]
+    else:
+        expected = expected[string2index(index)]
+
+    assert len(images) == len(images_parsed) == len(expected)
+    for atoms, atoms_parsed, values in zip(images, images_parsed, expected):
+        for a in [atoms, atoms_parsed]:
+            assert a.get_potential_energy() == pytest.approx(
+                values['e_0_energy'])
+            np.testing.assert_allclose(a.get_forces(), values['forces'])
+            assert a.calc.get_fermi_level() == 0.5
+            np.testing.assert_allclose(a.calc.get_eigenvalues(), [-1, 2])
+            np.testing.assert_allclose(a.calc.get_occupation_numbers(),
+                                       [2, 0])
+
+
+def test_read_vasp_xml_offsets(tmp_path, complete_vasprun):
+    from ase.io.vasp import index_vasp_xml, read_vasp_xml
+    text, expected = complete_vasprun
+    path = tmp_path / 'vasprun.xml'
+    path.write_text(text)
+
+    offsets = index_vasp_xml(path)
+    assert len(offsets) == 5
+    data = path.read_bytes()
+    for start, end in offsets:
+        assert data[start:end].startswith(b'<calculation>')
+        assert data[start:end].endswith(b'</calculation>')
+
+    atoms, = read_vasp_xml(str(path), index=2, offsets=offsets,
+                           read_eigenvalues=False)
+    assert atoms.get_potential_energy() == pytest.approx(
+        expected[2]['e_0_energy'])
+    assert atoms.calc.kpts is None
+    assert atoms.calc.get_fermi_level() == 0.5
+
+    # An incomplete last calculation is not indexed, but read if it
+    # has an energy, as when parsing the whole file
+    truncated = text[:text.rindex('<eigenvalues>')]
+    path.write_text(truncated)
+    assert index_vasp_xml(path) == offsets[:4]
+    for fd in [path, StringIO(truncated)]:
+        atoms = read(fd, index=-1, format='vasp-xml')
+        assert atoms.get_potential_energy() == pytest.approx(
+            expected[4]['e_0_energy'])
+
+    truncated = text[:text.rindex('<energy>')]
+    path.write_text(truncated)
+    for fd in [path, StringIO(truncated)]:
+        atoms = read(fd, index=-1, format='vasp-xml')
+        assert atoms.get_potential_energy() == pytest.approx(
+            expected[3]['e_0_energy'])
@@ -3,7 +3,7 @@ import inspect
 import pytest
 import numpy as np
 from ase import Atoms
-from ase.io import read, iread
+from ase.io import read, iread, string2index
 from ase.calculators.calculator import compare_atoms
 
 
@@ -83,3 +83,68 @@ def test_read_vasp_multiple_times(outcar):
     print(result1)
     print(result2)
     assert len(compare_atoms(result1, result2)) == 0
+
+
+@pytest.fixture
+def outcar_steps(outcar, tmp_path):
+    """OUTCAR with 5 ionic steps with different energies."""
+    lines = outcar.read_text().splitlines(True)
+    start = next(i for i, line in enumerate(lines) if 'Iteration' in line)
+    end = next(i for i, line in enumerate(lines)
+               if 'FREE ENERGIE' in line) + 5
+    chunk = ''.join(lines[start + 1:end])
+    energies = []
+    text = ''.join(lines[:start + 1])
+    for i in range(5):
+        energy = -68.0 - i
+        text += chunk.replace('-68.22868532', f'{energy:.8f}')
+        energies.append(energy)
+    text += ''.join(lines[end:])
+    path = tmp_path / 'OUTCAR'
+    path.write_text(text)
+    return path, energies
+
+
+@pytest.mark.parametrize('index', [-1, 0, 3, -4, ':', '::2', '-2:',
+                                   '1:4', 10])
+def test_vasp_out_index(outcar_steps, index):
+    import gzip
+    import shutil
+    from ase.io.vasp import iread_vasp_out
+    path, energies = outcar_steps
+
+    # Compressed files are read line by line instead of memory mapped
+    gzpath = path.with_suffix('.gz')
+    with open(path, 'rb') as fd, gzip.open(gzpath, 'wb') as gzfd:
+        shutil.copyfileobj(fd, gzfd)
+
+    if isinstance(index, str):
+        expected = energies[string2index(index)]
+    else:
+        expected = energies[index:(index + 1) or None]
+    for opener in [open, gzip.open]:
+        with opener(path if opener is open else gzpath, 'rt') as fd:
+            images = list(iread_vasp_out(fd, index))
+        assert [atoms.get_potential_energy(force_consistent=True)
+                for atoms in images] == pytest.approx(expected)
+
+
+def test_vasp_out_properties(outcar_steps):
+    from ase.io.vasp_parsers.vasp_outcar_parsers import index_outcar
+    path, energies = outcar_steps
+    atoms = read(path, properties=['energy'])
+    assert set(atoms.calc.results) == {'energy', 'free_energy', 'forces'}
+    assert atoms.calc.kpts is None
+    assert atoms.get_potential_energy(force_consistent=True) == energies[-1]
+
+    with pytest.raises(ValueError):
+        read(path, properties=['dipole'])
+
+    # An incomplete last step is skipped
+    data = path.read_bytes()
+    header_end, offsets = index_outcar(data)
+    assert len(offsets) == 5
+    assert data[:header_end].rstrip().endswith(b'---')
+    end = offsets[-1][1]
+    truncated = data[:end - len(data[:end].splitlines(True)[-1])]
+    assert index_outcar(truncated) == (header_end, offsets[:4])
@@ -0,0 +1,47 @@
+import numpy as np
+
+from ase.build import bulk
+from ase.ga.ofp_comparator import OFPComparator
+
+
+def get_images(rng, n):
+    images = []
+    for i in range(n):
+        atoms = bulk('NaCl', 'rocksalt', a=5.64, cubic=True)
+        atoms.rattle(0.1 * (i % 3), rng=rng)
+        images.append(atoms)
+    return images
+
+
+def test_distance_matrix(seed):
+    rng = np.random.RandomState(seed)
+    images = get_images(rng, 6)
+    comp = OFPComparator(rcut=6., recalculate=True)
+
+    D = comp.get_distance_matrix(images)
+    assert D.shape == (6, 6)
+    for i in range(6):
+        for j in range(6):
+            if i != j:
+                ref = comp._compare_structure(images[i], images[j])
+                assert abs(D[i, j] - ref) < 1e-10
+
+    Dp = comp.get_distance_matrix(images, processes=2)
+    assert np.allclose(D, Dp)
+
+    condensed = comp.get_distance_matrix(images, condensed=True)
+    assert np.allclose(condensed, D[np.triu_indices(6, k=1)])
+
+    groups = comp.get_similarity_groups(images)
+    assert sorted(sum(groups, [])) == list(range(6))
+    # The unrattled images are identical
+    assert any({0, 3} <= set(group) for group in groups)
+
+
+def test_fingerprints_stored():
+    images = get_images(np.random.RandomState(0), 2)
+    comp = OFPComparator(rcut=6.)
+    F = comp.get_fingerprint_matrix(images)
+    assert np.allclose(np.linalg.norm(F, axis=1), 1)
+    assert all('fingerprints' in atoms.info for atoms in images)
+    assert np.allclose(comp.get_fingerprint_matrix(images), F)
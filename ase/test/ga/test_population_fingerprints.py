@@ -0,0 +1,109 @@
+import numpy as np
+
+from ase.build import fcc111
+from ase.calculators.singlepoint import SinglePointCalculator
+from ase.ga import set_raw_score
+from ase.ga.data import PrepareDB, DataConnection
+from ase.ga.population import Population, count_looks_like
+from ase.ga.standard_comparators import (InteratomicDistanceComparator,
+                                         SequentialComparator,
+                                         get_sorted_dist_list)
+from ase.ga.startgenerator import StartGenerator
+from ase.ga.utilities import closest_distances_generator
+
+
+def loop_sorted_dist_list(atoms, mic=False):
+    pair_cor = dict()
+    for n in set(atoms.numbers):
+        i_un = [i for i in range(len(atoms)) if atoms[i].number == n]
+        d = []
+        for i, n1 in enumerate(i_un):
+            for n2 in i_un[i + 1:]:
+                d.append(atoms.get_distance(n1, n2, mic))
+        pair_cor[n] = np.sort(d)
+    return pair_cor
+
+
+def get_candidates(rng, n):
+    slab = fcc111('Au', size=(2, 2, 2), vacuum=10.0, orthogonal=True)
+    pos = slab.get_positions()
+    cell = slab.get_cell()
+    p0 = np.array([0., 0., max(pos[:, 2]) + 2.])
+    box = [p0, [cell[0] * 0.8, cell[1] * 0.8, [0., 0., 3.]]]
+    atom_numbers = 3 * [47] + 3 * [79]
+    blmin = closest_distances_generator(atom_numbers=[47, 79],
+                                        ratio_of_covalent_radii=0.7)
+    sg = StartGenerator(slab=slab, blocks=atom_numbers, blmin=blmin,
+                        box_to_place_in=box, rng=rng)
+    cands = []
+    for i in range(n):
+        a = sg.get_new_candidate()
+        e = 0.001 * rng.randint(20)
+        a.calc = SinglePointCalculator(a, energy=e)
+        set_raw_score(a, -e)
+        cands.append(a)
+    return slab, atom_numbers, cands
+
+
+def test_sorted_dist_list(seed):
+    rng = np.random.RandomState(seed)
+    _, _, cands = get_candidates(rng, 2)
+    for a in cands:
+        for mic in [False, True]:
+            p1 = get_sorted_dist_list(a, mic=mic)
+            p2 = loop_sorted_dist_list(a, mic=mic)
+            assert p1.keys() == p2.keys()
+            for n in p1:
+                assert np.allclose(p1[n], p2[n])
+
+
+def test_looks_like_many(seed):
+    rng = np.random.RandomState(seed)
+    _, _, cands = get_candidates(rng, 10)
+    # Add slightly perturbed copies which should look alike
+    for a in cands[:5]:
+        b = a.copy()
+        b.rattle(0.001, rng=rng)
+        b.calc = SinglePointCalculator(b, energy=a.get_potential_energy())
+        cands.append(b)
+    for i, a in enumerate(cands):
+        a.info['relax_id'] = a.info['confid'] = i
+        a.info['data'] = {}
+
+    comp = InteratomicDistanceComparator(n_top=6, dE=0.01, mic=True)
+    for a in cands:
+        many = comp.looks_like_many(a, cands)
+        single = [comp.looks_like(a, b) for b in cands]
+        assert list(many) == single
+    for a, b in zip(cands[:5], cands[10:]):
+        assert comp.looks_like_many(a, [b])[0]
+    assert all(comp.fingerprint_key in a.info['data'] for a in cands)
+    assert len(comp.fingerprints) == len(cands)
+
+
+def test_population_fingerprints(seed, testdir):
+    rng = np.random.RandomState(seed)
+    slab, atom_numbers, cands = get_candidates(rng, 20)
+    db_file = 'gadb_fingerprints.db'
+    d = PrepareDB(db_file_name=db_file, simulation_cell=slab,
+                  stoichiometry=atom_numbers)
+    for a in cands:
+        d.add_relaxed_candidate(a)
+
+    dc = DataConnection(db_file)
+    comp = InteratomicDistanceComparator(n_top=6, dE=0.005, mic=False)
+    pop = Population(data_connection=dc, population_size=5,
+                     comparator=comp)
+    # Without looks_like_many every candidate is compared pairwise
+    slow_comp = SequentialComparator(
+        [InteratomicDistanceComparator(n_top=6, dE=0.005, mic=False)])
+    for a in pop.pop:
+        slow = count_looks_like(a, pop.all_cand, slow_comp)
+        assert a.info['looks_like'] == slow
+
+    key = comp.fingerprint_key
+    for a in DataConnection(db_file).get_all_relaxed_candidates():
+        assert key in a.info['data']
+        fp = InteratomicDistanceComparator(n_top=6).get_fingerprint(a)
+        for n, dists in loop_sorted_dist_list(a[-6:]).items():
+            assert np.allclose(fp[n], dists)
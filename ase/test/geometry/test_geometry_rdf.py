@@ -71,3 +71,18 @@ def test_rdf_compute():
     rdf = get_rdf(bulk, 4.2, 5)[0]
     reference_rdf2 = [0., 0., 1.43905094, 0.36948605, 1.34468694]
     assert all(abs(rdf - reference_rdf2) < eps)
+
+
+@pytest.mark.parametrize('elements', [None, (11, 17), (11, 11)])
+def test_rdf_sparse(elements):
+    atoms = bulk('NaCl', 'rocksalt', a=5.64, cubic=True) * (2, 2, 2)
+    atoms.rattle(0.1, seed=3)
+    rmax = 5.0
+    dense = get_rdf(atoms, rmax, 50, elements=elements,
+                    distance_matrix=atoms.get_all_distances(mic=True))[0]
+    sparse = get_rdf(atoms, rmax, 50, elements=elements,
+                     distance_matrix=atoms.get_all_distances(mic=True,
+                                                             cutoff=rmax))[0]
+    default = get_rdf(atoms, rmax, 50, elements=elements)[0]
+    assert sparse == pytest.approx(dense, abs=1e-12)
+    assert default == pytest.approx(dense, abs=1e-12)
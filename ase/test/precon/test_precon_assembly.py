@@ -110,3 +110,41 @@ def test_apply_atoms(precon, atoms):
 @pytest.mark.parametrize('precon', precons)
 def test_apply_fixed_atoms(precon, fixed_atoms):
     check_apply(precon, fixed_atoms)
+
+
+@pytest.mark.parametrize('precon', ['C1', 'Exp'])
+@pytest.mark.parametrize('array_convention', ['C', 'F'])
+def test_incremental(precon, array_convention, fixed_atoms):
+    atoms, bonds = fixed_atoms
+    kwargs = dict(mu=1.0, array_convention=array_convention)
+    ref = make_precon(precon, **kwargs)
+    precon = make_precon(precon, incremental=True, **kwargs)
+    for seed in range(3):
+        # small displacements do not change the neighbour pairs
+        atoms.rattle(stdev=0.01, seed=seed)
+        ref.P = None
+        ref.make_precon(atoms)
+        precon.P = None
+        precon.make_precon(atoms)
+        assert abs(precon.asarray() - ref.asarray()).max() < 1e-12
+        forces = atoms.get_forces().reshape(-1)
+        assert precon.solve(forces) == pytest.approx(ref.solve(forces),
+                                                     abs=1e-6)
+    assert precon.counts['pattern reuse'] == 2
+    assert precon.counts['assembly'] == 3
+    assert precon.counts['solve'] == 3
+
+
+@pytest.mark.parametrize('precon', ['C1', 'Exp'])
+def test_solver_follows_matrix(precon, atoms):
+    atoms, bonds = atoms
+    precon = make_precon(precon, atoms)
+    forces = atoms.get_forces().reshape(-1)
+    # mu is estimated again with a new matrix, and the small displacement
+    # keeps that matrix
+    precon.make_precon(atoms, reinitialize=True)
+    assert precon.P.dot(precon.solve(forces)) == pytest.approx(forces)
+    # a new matrix without the solver set up
+    precon.mu *= 2
+    precon._make_sparse_precon(atoms, initial_assembly=True)
+    assert precon.P.dot(precon.solve(forces)) == pytest.approx(forces)
@@ -3,7 +3,8 @@ import numpy as np
 from ase.spacegroup import Spacegroup
 from ase.lattice import FCC
 from ase.spacegroup.spacegroup import (
-    parse_sitesym, parse_sitesym_single, parse_sitesym_element)
+    parse_sitesym, parse_sitesym_single, parse_sitesym_element,
+    SpacegroupNotFoundError, SpacegroupValueError, get_datafile_table)
 
 
 def test_spacegroup_miscellaneous():
@@ -77,3 +78,67 @@ def test_spacegroup_parse_sitesym_element():
         rot, trans = parse_sitesym_element(element)
         assert rot == expected_rot
         assert np.allclose(trans, expected_trans)
+
+
+def test_spacegroup_table_cache(tmp_path, monkeypatch):
+    from ase.spacegroup import spacegroup
+    monkeypatch.setenv('ASE_SPACEGROUP_CACHE', str(tmp_path))
+    monkeypatch.setattr(spacegroup, '_datafile_tables', {})
+    table = get_datafile_table()
+    assert get_datafile_table() is table
+    assert len(list(tmp_path.glob('*.pckl'))) == 1
+
+    # a new process would load the pickled table
+    monkeypatch.setattr(spacegroup, '_datafile_tables', {})
+    assert get_datafile_table() is not table
+    assert ([str(sg) for sg in get_datafile_table()] ==
+            [str(sg) for sg in table])
+
+    sg = Spacegroup('P2/m')
+    assert sg.no == 10
+    # instances do not share arrays with the table
+    sg.rotations[:] = 0
+    assert Spacegroup(10).rotations.any()
+    with pytest.raises(SpacegroupNotFoundError):
+        Spacegroup(231)
+    with pytest.raises(SpacegroupValueError):
+        Spacegroup(1.0)
+
+
+def test_spacegroup_table_cache_corrupt(tmp_path, monkeypatch):
+    from ase.spacegroup import spacegroup
+    monkeypatch.setenv('ASE_SPACEGROUP_CACHE', str(tmp_path))
+    monkeypatch.setattr(spacegroup, '_datafile_tables', {})
+    table = get_datafile_table()
+    path, = tmp_path.glob('*.pckl')
+    for data in [b'', b'garbage', path.read_bytes()[:100]]:
+        path.write_bytes(data)
+        monkeypatch.setattr(spacegroup, '_datafile_tables', {})
+        assert len(get_datafile_table()) == len(table)
+        # the corrupt file was replaced by a valid cache
+        key, = spacegroup._datafile_tables
+        assert len(spacegroup._load_cached_table(key)) == len(table)
+
+
+def test_spacegroup_table_cache_unwritable(tmp_path, monkeypatch):
+    from ase.spacegroup import spacegroup
+    # a directory below a regular file cannot be created
+    (tmp_path / 'file').write_text('')
+    monkeypatch.setenv('ASE_SPACEGROUP_CACHE', str(tmp_path / 'file' / 'x'))
+    monkeypatch.setattr(spacegroup, '_datafile_tables', {})
+    assert Spacegroup(225).symbol == 'F m -3 m'
+
+
+def test_equivalent_sites_duplicates():
+    sg = Spacegroup(225)
+    basis = [[0, 0, 0], [0.5, 0.5, 0.0], [0.5, 0.0, 0.0]]
+    sites, kinds = sg.equivalent_sites(basis, onduplicates='keep')
+    assert len(sites) == 8
+    assert kinds == [0, 0, 0, 0, 2, 2, 2, 2]
+    sites, kinds = sg.equivalent_sites(basis, onduplicates='replace')
+    assert kinds == [1, 1, 1, 1, 2, 2, 2, 2]
+    with pytest.warns(UserWarning):
+        sg.equivalent_sites(basis, onduplicates='warn')
+    with pytest.raises(SpacegroupValueError):
+        sg.equivalent_sites(basis)
+    assert np.array_equal(sg.unique_sites(sites), [[0, 0, 0], [0.5, 0, 0]])
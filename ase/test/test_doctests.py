@@ -15,6 +15,7 @@ ase.eos
 ase.formula
 ase.geometry.cell
 ase.geometry.geometry
+ase.io.ragged
 ase.io.ulm
 ase.lattice
 ase.phasediagram
@@ -0,0 +1,50 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import ase
+
+# Modules which are slow to import and must only be imported when used
+heavy_modules = {'scipy', 'matplotlib', 'importlib.metadata'}
+
+
+def importtime(code):
+    """Return the self time in seconds of each module imported by code."""
+    env = dict(os.environ)
+    topdir = str(Path(ase.__file__).parent.parent)
+    env['PYTHONPATH'] = os.pathsep.join(
+        [topdir] + env.get('PYTHONPATH', '').split(os.pathsep))
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                          env=env, stderr=subprocess.PIPE, check=True,
+                          universal_newlines=True)
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        selftime, _, name = line.split(':', 1)[1].split('|')
+        if selftime.strip() == 'self [us]':
+            continue
+        times[name.strip()] = int(selftime) * 1e-6
+    return times
+
+
+@pytest.mark.parametrize('module', ['ase', 'ase.io', 'ase.build',
+                                    'ase.optimize', 'ase.calculators.emt'])
+def test_no_heavy_imports(module):
+    times = importtime(f'import {module}')
+    assert module in times
+    assert not heavy_modules & set(times)
+
+
+def test_lazy_io():
+    times = importtime('import ase.io')
+    assert 'ase.atoms' not in times
+    assert 'ase.io.formats' not in times
+    assert 'ase.io.trajectory' not in times
+
+    times = importtime('import ase.io; ase.io.read')
+    assert 'ase.io.formats' in times
+    assert 'importlib.metadata' not in times
@@ -65,3 +65,35 @@ def test_numpy_array():
                               pbc=True)
 
     find_mic(atoms.positions, np.array(atoms.cell), pbc=True)
+
+
+@pytest.mark.parametrize('pbc', [True, [True, True, False], False])
+def test_minimum_image_object(pbc):
+    from ase.geometry import MinimumImage
+    from ase.geometry.geometry import general_find_mic, get_minimum_image
+
+    rng = np.random.RandomState(42)
+    cell = np.array([[4.0, 0, 0], [3.5, 1.0, 0], [1.0, 2.0, 5.0]])
+    v = rng.uniform(-10, 10, (50, 3))
+
+    mic = MinimumImage(cell, pbc)
+    vmin, vlen = mic.find_mic(v)
+    assert_allclose(np.linalg.norm(vmin, axis=1), vlen)
+    if np.any(pbc):
+        pbc3 = mic.pbc
+        ref, reflen = general_find_mic(v, cell, pbc3)
+        assert_allclose(vlen, reflen)
+        # The images differ by lattice vectors
+        n = np.linalg.solve(cell.T, (vmin - v).T).T
+        assert_allclose(n, np.round(n), atol=1e-9)
+        assert_allclose(n[:, ~pbc3], 0, atol=1e-9)
+    else:
+        assert_allclose(vmin, v)
+
+    vmin1, vlen1 = mic.find_mic(v[0])
+    assert_allclose(vmin1, vmin[0])
+    assert vlen1 == pytest.approx(vlen[0])
+
+    # find_mic() reuses the same object for the same cell
+    assert get_minimum_image(cell, pbc) is get_minimum_image(cell.copy(), pbc)
+    assert_allclose(find_mic(v, cell, pbc)[0], vmin)
@@ -1,3 +1,5 @@
+import pytest
+
 from ase.build import bulk, molecule
 from ase.phonons import Phonons
 from ase.calculators.emt import EMT
@@ -52,3 +54,69 @@ def test_check_consistent_format(testdir):
     assert set(eq_data) == set(disp_data), "dict keys mismatch"
     for array_key in eq_data:
         assert eq_data[array_key].shape == disp_data[array_key].shape, array_key
+
+
+def test_band_structure_chunks(testdir):
+    import numpy as np
+
+    atoms = bulk('Al', 'fcc', a=4.05)
+    phonons = Phonons(atoms, EMT(), supercell=(3, 3, 3), delta=0.05)
+    phonons.run()
+    phonons.read(acoustic=True)
+
+    q_qc = np.random.RandomState(42).rand(20, 3)
+    D_qxx = phonons.compute_dynamical_matrix(q_qc, phonons.D_N)
+    for q_c, D_xx in zip(q_qc, D_qxx):
+        assert np.allclose(phonons.compute_dynamical_matrix(q_c, phonons.D_N),
+                           D_xx)
+
+    # One q-point per chunk versus all at once
+    omega1_kl, u1_kl = phonons.band_structure(q_qc, modes=True,
+                                              max_memory=1)
+    omega2_kl, u2_kl = phonons.band_structure(q_qc, modes=True)
+    assert np.allclose(omega1_kl, omega2_kl)
+    assert np.allclose(abs(u1_kl), abs(u2_kl))
+
+    # Both Lorentzian and tetrahedron DOS integrate to the number of branches
+    for delta in [1e-3, 0.0]:
+        omega_e, dos_e = phonons.dos(kpts=(6, 6, 6), npts=500, delta=delta)
+        integral = dos_e.sum() * (omega_e[1] - omega_e[0])
+        assert abs(integral - 3) < 0.2
+
+
+def test_run_symmetry(testdir):
+    import numpy as np
+    pytest.importorskip('spglib')
+
+    atoms = bulk('Cu', 'hcp', a=2.6, c=4.2)
+    phonons = Phonons(atoms, EMT(), supercell=(2, 2, 2), center_refcell=True,
+                      delta=0.05, name='ph')
+    phonons.run()
+    phonons.read()
+
+    sym = Phonons(atoms, EMT(), supercell=(2, 2, 2), center_refcell=True,
+                  delta=0.05, name='sym')
+    sym.run(use_symmetry=True)
+    sym.read()
+
+    assert set(sym.cache) == set(phonons.cache)
+    assert np.allclose(sym.C_N, phonons.C_N, atol=1e-10)
+
+
+def test_run_executor(testdir):
+    import numpy as np
+    from concurrent.futures import ProcessPoolExecutor
+
+    atoms = bulk('Al', 'fcc', a=4.05)
+    phonons = Phonons(atoms, EMT(), supercell=(2, 2, 2), delta=0.05,
+                      name='ph')
+    phonons.run()
+    phonons.read()
+
+    par = Phonons(atoms, supercell=(2, 2, 2), delta=0.05, name='par')
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        par.run(executor=executor, calculator_factory=EMT)
+    par.read()
+
+    assert set(par.cache) == set(phonons.cache)
+    assert np.allclose(par.C_N, phonons.C_N)
@@ -1,4 +1,4 @@
-from pytest import approx, fixture
+from pytest import approx, fixture, raises
 
 from ase import Atoms
 from ase.build import bulk
@@ -85,3 +85,34 @@ def test_c3(testdir):
     i_vib = pz.get_absolute_intensities()
     assert i_vib[-3:] == approx([5.36301901, 5.36680555, 35.7323934], 1e-6)
     pz.summary()
+
+
+def test_executor(Cbulk, testdir):
+    """Static Raman calculators can be sent to a process pool"""
+    from concurrent.futures import ProcessPoolExecutor
+
+    rm = StaticRamanCalculator(Cbulk, BondPolarizability, name='serial',
+                               delta=0.02)
+    rm.run()
+    rm = StaticRamanCalculator(Cbulk, BondPolarizability, name='pool',
+                               delta=0.02)
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        rm.run(executor=executor, calculator_factory=EMT)
+
+    serial = PlaczekStatic(Cbulk, name='serial')
+    pool = PlaczekStatic(Cbulk, name='pool')
+    assert pool.get_energies()[3:] == approx(serial.get_energies()[3:])
+    # The intensities of degenerate modes are not unique
+    assert pool.get_absolute_intensities().sum() == approx(
+        serial.get_absolute_intensities().sum())
+
+
+def test_symmetry(Cbulk, testdir):
+    """Polarizabilities are not derived by symmetry"""
+    rm = StaticRamanCalculator(Cbulk, BondPolarizability, name='sym')
+    with raises(ValueError):
+        rm.run(use_symmetry=True)
+    rm = StaticRamanPhononsCalculator(Cbulk, BondPolarizability,
+                                      calc=EMT(), name='phsym')
+    with raises(ValueError):
+        rm.run(True)
@@ -186,6 +186,83 @@ def test_vibrations_restart_dir(testdir, random_dimer):
         assert vib.clean() == 13
 
 
+def test_vibrations_symmetry(testdir):
+    pytest.importorskip('spglib')
+    from ase.build import molecule
+    from ase.calculators.emt import EMT
+
+    atoms = molecule('CH4', vacuum=4.0)
+    atoms.calc = EMT()
+    vib = Vibrations(atoms, name='vib')
+    vib.run()
+    sym = Vibrations(atoms, name='sym')
+    sym.run(use_symmetry=True)
+
+    # The displacements obtained by symmetry are saved in the cache too
+    assert set(sym.cache) == set(vib.cache)
+    for key in vib.cache:
+        assert_array_almost_equal(sym.cache[key]['forces'],
+                                  vib.cache[key]['forces'], decimal=10)
+    assert_array_almost_equal(sym.get_energies(), vib.get_energies())
+
+
+@pytest.mark.parametrize('executor_class', ['thread', 'process'])
+def test_vibrations_executor(testdir, executor_class):
+    import io
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+    from ase.build import molecule
+    from ase.calculators.emt import EMT
+
+    atoms = molecule('H2O', vacuum=3.0)
+    atoms.calc = EMT()
+    vib = Vibrations(atoms, name='vib')
+    vib.run()
+
+    par = Vibrations(atoms.copy(), name='par')
+    # Pretend another process already did one displacement
+    par.cache['0x+'] = vib.cache['0x+']
+    log = io.StringIO()
+    cls = {'thread': ThreadPoolExecutor,
+           'process': ProcessPoolExecutor}[executor_class]
+    with cls(max_workers=2) as executor:
+        par.run(executor=executor, calculator_factory=EMT, logfile=log)
+
+    assert set(par.cache) == set(vib.cache)
+    for key in vib.cache:
+        assert_array_almost_equal(par.cache[key]['forces'],
+                                  vib.cache[key]['forces'])
+    assert len(log.getvalue().splitlines()) == len(vib.cache) - 1
+    assert_array_almost_equal(par.get_energies(), vib.get_energies())
+
+    with pytest.raises(ValueError):
+        with ThreadPoolExecutor() as executor:
+            Vibrations(atoms, name='nofactory').run(executor=executor)
+
+
+def test_vibrations_executor_logfile_and_error(testdir):
+    from concurrent.futures import ThreadPoolExecutor
+    from ase.build import molecule
+    from ase.calculators.emt import EMT
+
+    atoms = molecule('H2O', vacuum=3.0)
+    vib = Vibrations(atoms, name='log')
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        vib.run(executor=executor, calculator_factory=EMT,
+                logfile='progress.log')
+    with open('progress.log') as fd:
+        assert len(fd.readlines()) == len(vib.cache)
+
+    def broken():
+        raise RuntimeError('calculation failed')
+
+    vib = Vibrations(atoms, name='broken')
+    with pytest.raises(RuntimeError):
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            vib.run(executor=executor, calculator_factory=broken)
+    # No empty, locked entries are left behind
+    assert len(vib.cache) == 0
+
+
 class TestVibrationsDataStaticMethods:
     @pytest.mark.parametrize('mask,expected_indices',
                              [([True, True, False, True], [0, 1, 3]),
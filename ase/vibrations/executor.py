@@ -0,0 +1,125 @@
+"""Run finite displacement calculations with a concurrent.futures executor.
+
+The displaced structures are sent to the executor together with a copy of
+the Vibrations, Phonons, ... object, which creates a new calculator with the
+calculator factory and calls its ``calculate(atoms, disp)`` method.  The
+results are saved in the cache by the calling process as they finish.
+"""
+import copy
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+from contextlib import ExitStack
+
+from ase.utils import IOContext
+
+
+def calculate_displacement(displacements, calculator_factory, atoms, disp):
+    """Calculate the results for one displaced structure with a new
+    calculator.  This runs in the executor."""
+    displacements = copy.copy(displacements)
+    calc = calculator_factory()
+    displacements.calc = calc
+    atoms.calc = calc
+    try:
+        return displacements.calculate(atoms,
+                                       disp._replace(vib=displacements))
+    finally:
+        close(displacements)
+
+
+def close(displacements):
+    # Copies of IOContext objects, e.g. Raman calculators, open their own
+    # output files
+    if hasattr(displacements, 'close'):
+        displacements.close()
+
+
+def run_displacements(displacements, tasks, executor, calculator_factory,
+                      logfile=None, max_pending=64):
+    """Calculate displaced structures with an executor.
+
+    displacements: Vibrations, Phonons, ...
+        Object with a cache and a ``calculate(atoms, disp)`` method.
+    tasks: list
+        (disp, atoms) pairs of displacements and displaced structures.
+    executor: concurrent.futures.Executor
+        Executor, e.g. ProcessPoolExecutor, which runs the calculations.
+    calculator_factory: callable
+        Called without arguments in the executor to create a calculator
+        for each displacement.  For process pools it must be picklable.
+    logfile: file object, str or None
+        Where progress and estimated time left are written.
+        Use '-' for stdout.  Default is no output.
+    max_pending: int
+        Maximum number of displacements locked in the cache and
+        submitted to the executor at a time.
+
+    As in the serial case, a displacement is skipped if it is already
+    in the cache or locked by another process.  Returns the number of
+    calculated displacements.  If a calculation fails, the remaining
+    displacements are cancelled and their locked cache entries removed.
+    """
+    # The executor gets a copy without the calculator, which may not be
+    # picklable and must not be shared between workers anyway
+    worker = copy.copy(displacements)
+    worker.calc = None
+    worker.atoms = displacements.atoms.copy()
+
+    ntasks = len(tasks)
+    tasks = iter(tasks)
+    pending = {}
+    ndone = 0
+    nskipped = 0
+    t0 = time.time()
+
+    try:
+        with ExitStack() as stack:
+            stack.callback(close, worker)
+            if logfile is not None:
+                logfile = stack.enter_context(IOContext()).openfile(logfile)
+            while True:
+                # Lock and submit displacements until enough are pending
+                for disp, atoms in tasks:
+                    handle = stack.enter_context(
+                        displacements.cache.lock(disp.name))
+                    if handle is None:
+                        nskipped += 1
+                        continue
+                    future = executor.submit(calculate_displacement, worker,
+                                             calculator_factory, atoms,
+                                             disp._replace(vib=worker))
+                    pending[future] = (disp, handle)
+                    if len(pending) >= max_pending:
+                        break
+
+                if not pending:
+                    break
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    disp, handle = pending[future]
+                    handle.save(future.result())
+                    del pending[future]
+                    ndone += 1
+                    if logfile is not None:
+                        # Displacements locked by other processes are not
+                        # counted, so the estimate is an upper bound
+                        nleft = ntasks - nskipped - ndone
+                        elapsed = time.time() - t0
+                        eta = elapsed / ndone * nleft
+                        logfile.write(f'{disp.name:>10s} {ndone:5d} done '
+                                      f'{nleft:5d} left  '
+                                      f'elapsed {elapsed:9.1f} s  '
+                                      f'ETA {eta:9.1f} s\n')
+                        logfile.flush()
+    finally:
+        # Only left after an error.  The locks are released by now, so
+        # the empty cache entries can be removed.
+        for future, (disp, handle) in pending.items():
+            future.cancel()
+            try:
+                del displacements.cache[disp.name]
+            except KeyError:
+                pass
+
+    return ndone
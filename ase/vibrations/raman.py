@@ -42,6 +42,18 @@ class RamanCalculatorBase(IOContext):
 
         self.comm = comm
 
+    def __getstate__(self):
+        # Open files cannot be copied or pickled, e.g. when the
+        # displacements are calculated with an executor
+        state = self.__dict__.copy()
+        state.pop('_lazy_cache', None)
+        state['txt'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.txt = self.openfile(None, self.comm)
+
 
 class StaticRamanCalculatorBase(RamanCalculatorBase):
     """Base class for Raman intensities derived from
@@ -57,6 +69,14 @@ class StaticRamanCalculatorBase(RamanCalculatorBase):
     def _new_exobj(self):
         return self.exobj(**self.exkwargs)
 
+    def run(self, use_symmetry=False, *args, **kwargs):
+        if use_symmetry:
+            # Only forces and dipoles are derived by symmetry
+            raise ValueError('use_symmetry is not supported for Raman '
+                             'calculations, the polarizabilities of '
+                             'derived displacements would be missing')
+        return super().run(False, *args, **kwargs)
+
     def calculate(self, atoms, disp):
         returnvalue = super().calculate(atoms, disp)
         disp.calculate_and_save_static_polarizability(atoms)
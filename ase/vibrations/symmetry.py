@@ -0,0 +1,170 @@
+"""Symmetry reduction of finite displacement calculations.
+
+Two displacements are equivalent if a symmetry operation of the structure
+maps one displaced structure onto the other.  Only one displacement of each
+set of equivalent displacements needs to be calculated; the results for the
+others are obtained by rotating and permuting the calculated forces.
+"""
+import numpy as np
+
+from ase.utils import atoms_to_spglib_cell
+
+
+class DisplacementSymmetry:
+    """Symmetry operations of a structure for finite displacements.
+
+    Requires spglib.
+
+    atoms: Atoms object
+        The structure whose symmetry is used, i.e. the unit cell for
+        phonon calculations.
+    supercell: tuple of three ints
+        Repetitions of atoms in the structure where the atoms are displaced.
+        Symmetry operations which do not leave the supercell invariant are
+        discarded.
+    offset: int
+        Index of the cell in the supercell where the atoms are displaced.
+    symprec: float
+        Tolerance passed on to spglib.
+
+    Along non-periodic directions only operations mapping the structure
+    onto itself without wrapping atoms are used, such that the symmetry
+    also holds for calculators treating those directions as open.
+    """
+
+    def __init__(self, atoms, supercell=(1, 1, 1), offset=0, symprec=1e-5):
+        import spglib
+        from scipy.spatial import cKDTree
+
+        dataset = spglib.get_symmetry_dataset(atoms_to_spglib_cell(atoms),
+                                              symprec=symprec)
+        if dataset is None:
+            raise RuntimeError('spglib could not determine the symmetry')
+
+        self.natoms = len(atoms)
+        self.supercell = np.array(supercell)
+        self.ref_c = np.array(np.unravel_index(offset, supercell))
+
+        cell_cv = atoms.cell.array
+        scaled_ac = atoms.get_scaled_positions(wrap=False)
+        wrapped_ac = scaled_ac - np.floor(scaled_ac)
+        wrapped_ac[wrapped_ac >= 1.0] = 0.0
+        tree = cKDTree(wrapped_ac, boxsize=1.0)
+        nonpbc_c = ~atoms.pbc
+        N_c = self.supercell
+
+        rotations = []
+        rotations_vv = []
+        maps = []
+        shifts = []
+        for rot_cc, trans_c in zip(dataset['rotations'],
+                                   dataset['translations']):
+            # The supercell lattice must be mapped onto itself
+            rot_N = rot_cc * N_c[np.newaxis, :] / N_c[:, np.newaxis]
+            if not np.allclose(rot_N, np.round(rot_N)):
+                continue
+
+            new_ac = np.dot(scaled_ac, rot_cc.T) + trans_c
+            new_ac -= np.floor(new_ac)
+            new_ac[new_ac >= 1.0] = 0.0
+            map_a = tree.query(new_ac)[1]
+            shift_ac = np.round(np.dot(scaled_ac, rot_cc.T) + trans_c -
+                                scaled_ac[map_a]).astype(int)
+            if (shift_ac[:, nonpbc_c] != shift_ac[0, nonpbc_c]).any():
+                continue
+
+            rotations.append(rot_cc)
+            rotations_vv.append(np.linalg.solve(cell_cv,
+                                                np.dot(rot_cc.T, cell_cv)).T)
+            maps.append(map_a)
+            shifts.append(shift_ac)
+
+        #: Rotations in scaled coordinates
+        self.rotations = np.array(rotations)
+        #: Rotations in cartesian coordinates
+        self.rotations_vv = np.array(rotations_vv)
+        #: Atom a is mapped onto atom maps[k, a] by operation k
+        self.maps = np.array(maps)
+        #: Lattice vector the image of atom a is shifted from atom maps[k, a]
+        self.shifts = np.array(shifts)
+
+    def __len__(self):
+        return len(self.rotations)
+
+    def reduce(self, displacements):
+        """Find the displacements which are equivalent by symmetry.
+
+        displacements: iterable
+            Displacements with attributes a (atom index), i (cartesian
+            direction), sign and ndisp, as in ase.vibrations.Displacement.
+
+        Returns the list of irreducible displacements, which have to be
+        calculated, and a list of (disp, source, k) tuples where the result
+        for disp is obtained from the result for the irreducible
+        displacement source with the symmetry operation k, see transform().
+        """
+        irreducible = []
+        derived = []
+        for disp in displacements:
+            if disp.sign == 0:
+                irreducible.append(disp)
+                continue
+            v_v = disp.sign * disp.ndisp * np.eye(3)[disp.i]
+            for source in irreducible:
+                if source.sign == 0:
+                    continue
+                w_v = source.sign * source.ndisp * np.eye(3)[source.i]
+                (k_k,) = np.nonzero(self.maps[:, source.a] == disp.a)
+                error_k = abs(np.dot(self.rotations_vv[k_k], w_v) - v_v)
+                match_k = k_k[error_k.max(axis=1) < 1e-6]
+                if len(match_k):
+                    derived.append((disp, source, match_k[0]))
+                    break
+            else:
+                irreducible.append(disp)
+        return irreducible, derived
+
+    def supercell_map(self, k, a):
+        """Return the mapping of the atoms in the supercell by operation k,
+        combined with the lattice translation which keeps the image of
+        atom a of the reference cell in the reference cell."""
+        rot_cc = self.rotations[k]
+        N_c = self.supercell
+        t_c = self.ref_c - np.dot(rot_cc, self.ref_c) - self.shifts[k, a]
+        m_Nc = np.indices(N_c).reshape(3, -1).T
+        new_Nac = (np.dot(m_Nc, rot_cc.T)[:, np.newaxis, :] +
+                   self.shifts[k][np.newaxis] + t_c) % N_c
+        cell_N = np.ravel_multi_index(new_Nac.reshape(-1, 3).T, N_c)
+        return cell_N * self.natoms + np.tile(self.maps[k], len(m_Nc))
+
+    def transform(self, result, k, a):
+        """Transform the result of a displacement of atom a in the reference
+        cell with the symmetry operation k.
+
+        Forces are rotated and permuted, and dipole moments rotated."""
+        R_vv = self.rotations_vv[k]
+        new = {}
+        for key, value in result.items():
+            if key == 'forces':
+                forces = np.empty_like(value)
+                forces[self.supercell_map(k, a)] = np.dot(value, R_vv.T)
+                new[key] = forces
+            elif key == 'dipole':
+                new[key] = np.dot(R_vv, value)
+            else:
+                raise ValueError(f'Cannot transform {key} by symmetry')
+        return new
+
+    def save_derived(self, cache, disp, source, k):
+        """Save the result for disp, obtained by transforming the cached
+        result of the displacement source with operation k, unless disp is
+        already in the cache.
+
+        Nothing is done if the result of source is not available yet, such
+        that the process calculating source can save it later."""
+        result = cache.get(source.name)
+        if result is None:
+            return
+        with cache.lock(disp.name) as handle:
+            if handle is not None:
+                handle.save(self.transform(result, k, source.a))
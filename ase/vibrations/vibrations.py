@@ -169,7 +169,8 @@ class Vibrations(AtomicDisplacements):
     def name(self):
         return str(self.cache.directory)
 
-    def run(self):
+    def run(self, use_symmetry=False, symprec=1e-5, executor=None,
+            calculator_factory=None, logfile=None):
         """Run the vibration calculations.
 
         This will calculate the forces for 6 displacements per atom +/-x,
@@ -187,6 +188,25 @@ class Vibrations(AtomicDisplacements):
         If the program you want to use does not have a calculator in ASE, use
         ``iterdisplace`` to get all displaced structures and calculate the
         forces on your own.
+
+        use_symmetry: bool
+            Use the symmetry of the structure, found with spglib, to only
+            calculate displacements which are not equivalent by symmetry.
+            The results of the other displacements are obtained by
+            rotating and permuting the calculated forces and dipoles.
+        symprec: float
+            Tolerance used by spglib to find the symmetry.
+        executor: concurrent.futures.Executor
+            If given, the displacements are calculated by this executor,
+            e.g. a ProcessPoolExecutor, and the results are saved in the
+            cache as they finish.
+        calculator_factory: callable
+            Used with executor.  Called without arguments to create a new
+            calculator for each displacement, e.g. ``EMT`` or a
+            ``functools.partial`` of a calculator class.
+        logfile: file object or str
+            Used with executor.  Progress and estimated time left are
+            written here.  Use '-' for stdout.
         """
 
         if not self.cache.writable:
@@ -197,15 +217,37 @@ class Vibrations(AtomicDisplacements):
 
         self._check_old_pickles()
 
-        for disp, atoms in self.iterdisplace(inplace=True):
-            with self.cache.lock(disp.name) as handle:
-                if handle is None:
+        derived = []
+        if use_symmetry:
+            from ase.vibrations.symmetry import DisplacementSymmetry
+            symmetry = DisplacementSymmetry(self.atoms, symprec=symprec)
+            _, derived = symmetry.reduce(self.displacements())
+        skip = set(disp.name for disp, source, k in derived)
+
+        if executor is not None:
+            from ase.vibrations.executor import run_displacements
+            if calculator_factory is None:
+                raise ValueError('Provide calculator_factory to run with '
+                                 'an executor')
+            tasks = [(disp, atoms) for disp, atoms in self.iterdisplace()
+                     if disp.name not in skip]
+            run_displacements(self, tasks, executor, calculator_factory,
+                              logfile)
+        else:
+            for disp, atoms in self.iterdisplace(inplace=True):
+                if disp.name in skip:
                     continue
+                with self.cache.lock(disp.name) as handle:
+                    if handle is None:
+                        continue
+
+                    result = self.calculate(atoms, disp)
 
-                result = self.calculate(atoms, disp)
+                    if world.rank == 0:
+                        handle.save(result)
 
-                if world.rank == 0:
-                    handle.save(result)
+        for disp, source, k in derived:
+            symmetry.save_derived(self.cache, disp, source, k)
 
     def _check_old_pickles(self):
         from pathlib import Path